@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Async HLP Module
+
+This module contains the logic for:
+1.  Async versions of the HLP diagnostic task flow, which await the student's response instead of
+    blocking a thread, with a timeout per task.
+2.  A session manager that runs many in-progress diagnostic sessions on one event loop and can
+    cancel them individually.
+3.  A simulated student input source with configurable response latency.
+
+Responses come from an input source: an async callable input_source(student_id, task_name) that
+returns the student's answer for that task (see SimulatedStudentInput for the answer formats).
+Answers are applied with the same hlp_module.record_* functions as the blocking tasks, so both
+flows make identical LearnerProfile updates, events and badge awards.
+"""
+
+import asyncio
+import random
+import time
+from collections import namedtuple
+
+from hlp_module import (
+    LearnerProfile, PREDEFINED_INTERESTS, PREDEFINED_STRUGGLE_AREAS, _task_started,
+    record_visual_preference, record_textual_preference, record_student_interests, record_student_struggles,
+    record_story_weaver_result, record_mind_mapper_result, check_and_award_all_relevant_badges,
+)
+
+# Task name -> function applying that task's response to a profile
+_RECORDERS = {
+    "visual_preference_task_1": record_visual_preference,
+    "textual_preference_task_1": record_textual_preference,
+    "capture_interests": record_student_interests,
+    "capture_struggles": record_student_struggles,
+    "story_weaver": lambda profile, response: record_story_weaver_result(
+        profile, response["num_panels"], response["accuracy"], response["attempts"]),
+    "mind_mapper": lambda profile, response: record_mind_mapper_result(profile, response["ideas_generated"]),
+}
+
+# Same order as run_full_hlp_assessment
+HLP_TASK_SEQUENCE = (
+    "visual_preference_task_1", "textual_preference_task_1", "capture_interests", "capture_struggles",
+    "story_weaver", "mind_mapper",
+)
+
+# Same LOs as run_full_hlp_assessment's simulated completions
+SIMULATED_COMPLETED_LOS = ("MA4_N1a", "MA4_N1b", "EN4_C1a")
+
+# asyncio.timeout() exists from Python 3.11; older versions fall back to asyncio.wait_for
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+TASK_COMPLETED = "completed"
+TASK_TIMED_OUT = "timed_out"
+
+class AsyncAssessmentResult(namedtuple("AsyncAssessmentResult", ["profile", "task_outcomes", "task_results"])):
+    """A finished async assessment: the profile, {task_name: outcome} and {task_name: task result}."""
+    __slots__ = ()
+
+class SimulatedStudentInput:
+    """Answers diagnostic tasks like the simulations in hlp_module, after latency seconds.
+
+    Answer formats: preference tasks return the simulated choice string; capture_interests and
+    capture_struggles return lists; story_weaver returns {"num_panels", "accuracy", "attempts"};
+    mind_mapper returns {"ideas_generated"}.
+    """
+    def __init__(self, latency=0.0, rng=None):
+        self.latency = latency
+        self.rng = rng or random.Random()
+
+    async def __call__(self, student_id, task_name):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        rng = self.rng
+        if task_name == "visual_preference_task_1":
+            return rng.choice(["visual", "textual/auditory"])
+        if task_name == "textual_preference_task_1":
+            return rng.choice(["detailed_text", "summary_bullets"])
+        if task_name == "capture_interests":
+            return rng.sample(PREDEFINED_INTERESTS, k=min(3, len(PREDEFINED_INTERESTS)))
+        if task_name == "capture_struggles":
+            return rng.sample(PREDEFINED_STRUGGLE_AREAS, k=min(2, len(PREDEFINED_STRUGGLE_AREAS)))
+        if task_name == "story_weaver":
+            num_panels = rng.choice([3, 4, 5])
+            accuracy = rng.choice([0.6, 0.8, 1.0])
+            return {"num_panels": num_panels, "accuracy": accuracy, "attempts": rng.randint(1, 3) if accuracy < 1.0 else 1}
+        if task_name == "mind_mapper":
+            return {"ideas_generated": rng.randint(3, 8)}
+        raise ValueError(f"Unknown diagnostic task '{task_name}'")
+
+async def run_task_async(profile, task_name, input_source, timeout=None):
+    """Awaits the student's response to one task (up to timeout seconds) and applies it to the profile.
+
+    Raises asyncio.TimeoutError if no response arrives in time; the profile is then left unchanged.
+    """
+    recorder = _RECORDERS.get(task_name)
+    if recorder is None:
+        raise ValueError(f"Unknown diagnostic task '{task_name}'")
+    _task_started(profile, task_name)
+    if timeout is None:
+        response = await input_source(profile.student_id, task_name)
+    elif _asyncio_timeout is not None:
+        async with _asyncio_timeout(timeout):  # Unlike wait_for, does not wrap the awaitable in a new Task
+            response = await input_source(profile.student_id, task_name)
+    else:
+        response = await asyncio.wait_for(input_source(profile.student_id, task_name), timeout)
+    return recorder(profile, response)
+
+async def run_full_hlp_assessment_async(student_id, input_source, task_timeout=None, tasks=HLP_TASK_SEQUENCE,
+                                        completed_los=SIMULATED_COMPLETED_LOS, profile=None):
+    """Async counterpart of hlp_module.run_full_hlp_assessment.
+
+    A task that times out is recorded as TASK_TIMED_OUT and skipped, so one unanswered task does not
+    end the session. Cancelling the coroutine stops it at the current task; responses already
+    applied stay on the profile.
+    """
+    if profile is None:
+        profile = LearnerProfile(student_id)
+    task_outcomes = {}
+    task_results = {}
+    for task_name in tasks:
+        try:
+            task_results[task_name] = await run_task_async(profile, task_name, input_source, task_timeout)
+            task_outcomes[task_name] = TASK_COMPLETED
+        except asyncio.TimeoutError:
+            task_outcomes[task_name] = TASK_TIMED_OUT
+    for lo_id in completed_los:
+        profile.mark_lo_completed(lo_id)
+    check_and_award_all_relevant_badges(profile)
+    return AsyncAssessmentResult(profile, task_outcomes, task_results)
+
+class DiagnosticSessionManager:
+    """Runs concurrent async HLP sessions on the current event loop, keyed by student ID."""
+    def __init__(self, input_source, task_timeout=None):
+        self.input_source = input_source
+        self.task_timeout = task_timeout
+        self._sessions = {}
+        self.completed_count = 0
+        self.cancelled_count = 0
+        self.failed_count = 0
+        self.peak_active = 0
+
+    def start(self, student_id, **kwargs):
+        """Starts a session and returns its asyncio.Task (whose result is an AsyncAssessmentResult)."""
+        if student_id in self._sessions:
+            raise ValueError(f"A diagnostic session is already running for '{student_id}'")
+        task = asyncio.create_task(
+            run_full_hlp_assessment_async(student_id, self.input_source, self.task_timeout, **kwargs),
+            name=f"hlp-session-{student_id}",
+        )
+        self._sessions[student_id] = task
+        self.peak_active = max(self.peak_active, len(self._sessions))
+        task.add_done_callback(lambda finished, student_id=student_id: self._session_done(student_id, finished))
+        return task
+
+    def _session_done(self, student_id, task):
+        self._sessions.pop(student_id, None)
+        if task.cancelled():
+            self.cancelled_count += 1
+        elif task.exception() is not None:
+            self.failed_count += 1
+        else:
+            self.completed_count += 1
+
+    def cancel(self, student_id):
+        """Cancels a student's in-progress session. Returns False if none is running."""
+        task = self._sessions.get(student_id)
+        if task is None:
+            return False
+        return task.cancel()
+
+    def active_count(self):
+        return len(self._sessions)
+
+    async def wait_all(self):
+        """Waits for every running session; returns their results, exceptions or CancelledErrors."""
+        return await asyncio.gather(*self._sessions.values(), return_exceptions=True)
+
+    def stats(self):
+        return {
+            "active": len(self._sessions), "peak_active": self.peak_active, "completed": self.completed_count,
+            "cancelled": self.cancelled_count, "failed": self.failed_count,
+        }
+
+if __name__ == "__main__":
+    async def demo():
+        print("--- DALA Async HLP Demo ---")
+        manager = DiagnosticSessionManager(SimulatedStudentInput(latency=0.01, rng=random.Random(7)), task_timeout=1.0)
+        start = time.perf_counter()
+        for i in range(2000):
+            manager.start(f"student_{i:04d}")
+        manager.cancel("student_0000")
+        results = await manager.wait_all()
+        finished = [result for result in results if isinstance(result, AsyncAssessmentResult)]
+        print(f"{len(finished)} sessions finished in {time.perf_counter() - start:.2f}s; stats: {manager.stats()}")
+
+        slow_input = SimulatedStudentInput(latency=0.2)
+        result = await run_full_hlp_assessment_async("student_slow", slow_input, task_timeout=0.05)
+        print(f"Outcomes with a 50ms timeout: {result.task_outcomes}")
+
+    asyncio.run(demo())
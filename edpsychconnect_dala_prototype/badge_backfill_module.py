@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Cohort Badge Backfill Module
+
+This module contains the logic for:
+1.  Loading a cohort of learner profiles into columns (completed-LO bitmaps, metric arrays,
+    interest/struggle counts), holding only the columns a badge rule actually reads.
+2.  Evaluating a declarative badge rule (see badge_rules_module) across every row with NumPy.
+3.  Streaming the profiles that newly earn a badge, chunk by chunk, so a backfill over a very
+    large cohort never holds more than one chunk of columns in memory.
+
+Loading reads each profile field once per chunk with C-level map() calls, however many rules use
+it, and CompactLearnerProfiles' completed-LO columns come straight from their completed_lo_mask
+bitsets. Profile objects are scattered through memory, so the cost is mostly cache misses:
+chunks are kept small so each chunk's profiles are read from memory once, for every rule, rather
+than once per rule as a loop over the compiled rules does (see benchmarks.py badge_backfill).
+
+Badges defined by hand-written check functions cannot be vectorised; their resolved check
+function is called per profile (outside the badge engine's stats), still streaming the same way.
+
+NumPy is required for the columnar path.
+"""
+
+import operator
+from collections import namedtuple
+from itertools import islice, repeat
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for cohort backfills
+    np = None
+
+from badge_rules_module import BadgeRuleError, compile_rule, compile_value_getter, validate_leaf
+from hlp_module import BADGE_DEFINITIONS, BADGE_ENGINE
+
+# Small enough that a chunk's profiles are still in CPU cache when its awards are streamed
+DEFAULT_CHUNK_SIZE = 2048
+
+# A column the loader extracts from every profile in a chunk.
+# kind is one of: "truthy", "number", "object", "count", "member", "predicate".
+ColumnSpec = namedtuple("ColumnSpec", ["kind", "field", "path", "argument"])
+
+_NUMERIC_COMPARISONS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+_COUNT_COMPARISONS = {
+    "count_eq": operator.eq, "count_ne": operator.ne,
+    "count_gt": operator.gt, "count_gte": operator.ge,
+    "count_lt": operator.lt, "count_lte": operator.le,
+}
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for columnar badge backfills (pip install numpy).")
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _compile_columnar_leaf(rule):
+    field_name, op, path = validate_leaf(rule)
+    default = rule.get("default")
+    expected = rule.get("value")
+
+    if op == "exists":
+        spec = ColumnSpec("truthy", field_name, path, default)
+        return [spec], lambda columns: columns[spec]
+
+    if op in _NUMERIC_COMPARISONS and _is_number(expected):
+        spec = ColumnSpec("number", field_name, path, default)
+        compare = _NUMERIC_COMPARISONS[op]
+        # Missing and non-numeric values load as NaN, which compares False like the scalar rule.
+        return [spec], lambda columns: compare(columns[spec], expected)
+
+    if op in ("eq", "ne"):
+        spec = ColumnSpec("object", field_name, path, default)
+        compare = operator.eq if op == "eq" else operator.ne
+        def evaluate(columns):
+            values = columns[spec]
+            return compare(values, expected).astype(bool) & (values != None)  # noqa: E711 (elementwise)
+        return [spec], evaluate
+
+    if op in _COUNT_COMPARISONS:
+        spec = ColumnSpec("count", field_name, path, None)
+        compare = _COUNT_COMPARISONS[op]
+        return [spec], lambda columns: compare(columns[spec], expected)
+
+    if op == "contains":
+        spec = ColumnSpec("member", field_name, path, expected)
+        return [spec], lambda columns: columns[spec]
+
+    if op in ("contains_all", "contains_any"):
+        specs = [ColumnSpec("member", field_name, path, item) for item in expected]
+        reduce = np.logical_and.reduce if op == "contains_all" else np.logical_or.reduce
+        return specs, lambda columns: reduce([columns[spec] for spec in specs])
+
+    # Anything else (e.g. ordering comparisons against strings) is evaluated row by row.
+    spec = ColumnSpec("predicate", field_name, path, compile_rule(rule))
+    return [spec], lambda columns: columns[spec]
+
+def _compile_columnar_node(rule):
+    if not isinstance(rule, dict):
+        raise BadgeRuleError(f"Rule must be an object, got {type(rule).__name__}: {rule!r}")
+    if "all" in rule or "any" in rule:
+        combinator = "all" if "all" in rule else "any"
+        compiled = [_compile_columnar_node(child) for child in rule[combinator]]
+        specs = [spec for child_specs, _ in compiled for spec in child_specs]
+        evaluators = [evaluate for _, evaluate in compiled]
+        reduce = np.logical_and.reduce if combinator == "all" else np.logical_or.reduce
+        return specs, lambda columns: reduce([evaluate(columns) for evaluate in evaluators])
+    if "not" in rule:
+        specs, inner = _compile_columnar_node(rule["not"])
+        return specs, lambda columns: ~inner(columns)
+    return _compile_columnar_leaf(rule)
+
+def compile_columnar_rule(rule):
+    """Compiles a declarative badge rule into (column_specs, evaluate).
+
+    evaluate(columns) takes a mapping of ColumnSpec -> NumPy array and returns a boolean row mask.
+    """
+    _require_numpy()
+    compile_rule(rule)  # Validates the rule with the same errors as the scalar compiler
+    specs, evaluate = _compile_columnar_node(rule)
+    return list(dict.fromkeys(specs)), evaluate
+
+class CohortColumns:
+    """Column-oriented view of a chunk of learner profiles."""
+    def __init__(self, profiles, columns):
+        self.profiles = profiles
+        self.columns = columns
+        self._earned_badges = None
+
+    def __len__(self):
+        return len(self.profiles)
+
+    @classmethod
+    def from_profiles(cls, profiles, column_specs):
+        """Extracts each requested column from the profiles.
+
+        Each profile field the columns read is fetched in one pass over the chunk, and the columns
+        are then built from those values with C-level map() calls where the rule allows.
+        Completed-LO counts and memberships of CompactLearnerProfiles sharing one
+        LearningObjectiveIndex are popcounts and bit tests on their completed_lo_mask.
+        """
+        _require_numpy()
+        profiles = list(profiles)
+        loader = _ColumnLoader(profiles, column_specs)
+        return cls(profiles, {spec: loader.column(spec) for spec in column_specs})
+
+    def badge_earned_mask(self, badge_id):
+        """Boolean column: which rows have already earned badge_id."""
+        if self._earned_badges is None:
+            earned_badges = list(map(_EARNED_BADGES, self.profiles))
+            has_any = np.fromiter(map(bool, earned_badges), dtype=bool, count=len(earned_badges))
+            self._earned_badges = (earned_badges, np.flatnonzero(has_any).tolist())
+        earned_badges, rows_with_badges = self._earned_badges
+        mask = np.zeros(len(self.profiles), dtype=bool)
+        mask[[row for row in rows_with_badges if badge_id in earned_badges[row]]] = True
+        return mask
+
+_EARNED_BADGES = operator.attrgetter("earned_badges")
+_NUMERIC_TYPES = frozenset({int, float, bool, type(None)})
+_MISSING = object()
+_EMPTY_DICT = {}
+
+def _uses_lo_bitmaps(spec):
+    return spec.field == "completed_los" and not spec.path and spec.kind in ("count", "member")
+
+class _ColumnLoader:
+    """Builds columns for one chunk from the profile fields they read, each fetched once."""
+    def __init__(self, profiles, column_specs):
+        self.profiles = profiles
+        self.count = len(profiles)
+        self._values = {}
+        self._lo_index = None
+        fields = {spec.field for spec in column_specs if spec.kind != "predicate"}
+        if "completed_los" in fields and all(map(_uses_lo_bitmaps, (spec for spec in column_specs if spec.field == "completed_los"))):
+            # Bitset profiles can answer every completed-LO column from completed_lo_mask
+            if all(hasattr(profile_class, "completed_lo_mask") for profile_class in set(map(type, profiles))):
+                lo_indexes = set(map(operator.attrgetter("lo_index"), profiles))
+                if len(lo_indexes) == 1:
+                    self._lo_index = lo_indexes.pop()
+                    fields.discard("completed_los")
+                    fields.add("completed_lo_mask")
+        # One pass per field: fetching several at once would allocate a tuple per profile
+        for field_name in sorted(fields):
+            self._values[(field_name, (), None)] = list(map(operator.attrgetter(field_name), profiles))
+
+    def _mappings(self, field_name):
+        """The field's values, with empty non-dict values (None, the empty read-only mapping compact
+        profiles share for fields never written) replaced by an empty dict: walking a path into
+        either gives the default, as in the scalar getter."""
+        key = (field_name, None, None)
+        values = self._values.get(key)
+        if values is None:
+            values = self.values(field_name, (), None)
+            if not set(map(type, values)) <= {dict}:
+                values = [value if type(value) is dict or value else _EMPTY_DICT for value in values]
+            self._values[key] = values
+        return values
+
+    def values(self, field_name, path, default):
+        """The profiles' values at field/path (default where a key is missing or not in a dictionary)."""
+        key = (field_name, path, default)
+        values = self._values.get(key)
+        if values is not None:
+            return values
+        fields = self._mappings(field_name)
+        try:
+            # Level by level with dict.get (C-level); a missing key before the last gives an empty dict
+            values = fields
+            for depth, path_key in enumerate(path, 1):
+                values = list(map(dict.get, values, repeat(path_key), repeat(default if depth == len(path) else _EMPTY_DICT)))
+        except TypeError:  # A value along the path that is not a dictionary: walk row by row
+            def walk(value):
+                for path_key in path:
+                    value = value.get(path_key, _MISSING) if isinstance(value, dict) else _MISSING
+                    if value is _MISSING:
+                        return default
+                return value
+            values = list(map(walk, fields))
+        self._values[key] = values
+        return values
+
+    def column(self, spec):
+        kind = spec.kind
+        count = self.count
+        if kind == "predicate":
+            return np.fromiter(map(bool, map(spec.argument, self.profiles)), dtype=bool, count=count)
+        if self._lo_index is not None and _uses_lo_bitmaps(spec):
+            masks = self._values[("completed_lo_mask", (), None)]
+            if kind == "count":
+                return np.fromiter(map(int.bit_count, masks), dtype=np.int64, count=count)
+            index = self._lo_index.get(spec.argument) if isinstance(spec.argument, str) else None
+            if index is None:  # No profile indexed by lo_index can have completed it
+                return np.zeros(count, dtype=bool)
+            return np.fromiter(map((1 << index).__and__, masks), dtype=bool, count=count)
+
+        default = spec.argument if kind in ("truthy", "number", "object") else None
+        values = self.values(spec.field, spec.path, default)
+        if kind == "truthy":
+            return np.fromiter(map(bool, values), dtype=bool, count=count)
+        if kind == "number":
+            if set(map(type, values)) <= _NUMERIC_TYPES:
+                return np.array(values, dtype=np.float64)  # None loads as NaN
+            nan = float("nan")
+            return np.fromiter(
+                (value if _is_number(value) else (float(value) if isinstance(value, bool) else nan) for value in values),
+                dtype=np.float64, count=count)
+        if kind == "count":
+            try:
+                return np.fromiter(map(len, values), dtype=np.int64, count=count)
+            except TypeError:  # Some value is None (or has no length)
+                return np.fromiter((len(value) if value else 0 for value in values), dtype=np.int64, count=count)
+        if kind == "member":
+            item = spec.argument
+            try:
+                return np.fromiter(map(operator.contains, values, repeat(item)), dtype=bool, count=count)
+            except TypeError:  # Some value is None (or not a container)
+                return np.fromiter((bool(value) and item in value for value in values), dtype=bool, count=count)
+        if kind == "object":
+            column = np.empty(count, dtype=object)
+            column[:] = values
+            return column
+        raise ValueError(f"Unknown column kind '{kind}'")
+
+def _chunks(profiles, chunk_size):
+    iterator = iter(profiles)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _resolve_rule(badge_id, rule):
+    if rule is not None:
+        return rule
+    badge_info = BADGE_DEFINITIONS.get(badge_id)
+    if badge_info is None:
+        raise KeyError(f"Badge ID '{badge_id}' not found in BADGE_DEFINITIONS.")
+    return badge_info.get("criteria")
+
+def backfill_badges(profiles, badge_ids, rules=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields (profile, badge_id) for every badge a profile meets the criteria for but has not yet earned.
+
+    profiles may be any iterable (e.g. a generator reading from storage); it is consumed one chunk
+    at a time, and the columns every rule needs are loaded once per chunk. Rules default to each
+    badge's declarative "criteria" in BADGE_DEFINITIONS; rules maps badge_id -> rule to override them.
+    Nothing is awarded; pass the results to add_badge (or use award_backfilled_badges) to apply them.
+    """
+    rules = rules or {}
+    columnar_rules = {}
+    row_checked_badges = []
+    for badge_id in badge_ids:
+        rule = _resolve_rule(badge_id, rules.get(badge_id))
+        if rule is None:
+            # Hand-written check function: nothing to vectorise, evaluate per profile. It is called
+            # directly rather than through BADGE_ENGINE.evaluate, so backfills leave the engine's stats alone.
+            check = BADGE_ENGINE.check_function(badge_id)
+            if check is not None:
+                row_checked_badges.append((badge_id, check))
+        else:
+            columnar_rules[badge_id] = compile_columnar_rule(rule)
+    column_specs = list(dict.fromkeys(spec for specs, _ in columnar_rules.values() for spec in specs))
+
+    for chunk in _chunks(profiles, chunk_size):
+        if columnar_rules:
+            cohort = CohortColumns.from_profiles(chunk, column_specs)
+            for badge_id, (_, evaluate) in columnar_rules.items():
+                newly_earned = evaluate(cohort.columns) & ~cohort.badge_earned_mask(badge_id)
+                yield from zip(map(chunk.__getitem__, np.flatnonzero(newly_earned).tolist()), repeat(badge_id))
+        for badge_id, check in row_checked_badges:
+            for profile in chunk:
+                if not profile.has_badge(badge_id) and check(profile):
+                    yield profile, badge_id
+
+def backfill_badge(profiles, badge_id, rule=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields every profile that meets one badge's criteria but has not yet earned it."""
+    rules = {badge_id: rule} if rule is not None else None
+    for profile, _ in backfill_badges(profiles, [badge_id], rules=rules, chunk_size=chunk_size):
+        yield profile
+
+def award_backfilled_badges(profiles, badge_ids, rules=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Runs backfill_badges and awards each match. Returns {badge_id: number_awarded}."""
+    awarded_counts = dict.fromkeys(badge_ids, 0)
+    for profile, badge_id in backfill_badges(profiles, badge_ids, rules=rules, chunk_size=chunk_size):
+        if profile.add_badge(badge_id):
+            awarded_counts[badge_id] += 1
+    return awarded_counts
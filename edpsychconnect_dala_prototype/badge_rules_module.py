@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Declarative Badge Rules Module
+
+This module contains the logic for:
+1.  Expressing badge criteria as data (JSON) instead of hand-written check functions.
+2.  Compiling those rules once, at load time, into plain Python closures.
+3.  Loading badge definitions with declarative criteria from a JSON file.
+
+A rule is either a combinator or a leaf:
+    {"all": [rule, ...]}, {"any": [rule, ...]}, {"not": rule}
+    {"field": "cognitive_metrics", "path": ["story_weaver", "attempts"], "op": "gt", "value": 1, "default": 0}
+
+"field" names a LearnerProfile attribute (one of PROFILE_RULE_FIELDS) and the optional "path" (a
+key or list of string keys, only on dictionary fields) walks nested dictionaries; a missing key,
+or a value along the way that is not a dictionary, gives the leaf's "default". Supported leaf operators are listed in
+LEAF_OPERATORS; count_* operators take an integer value, ordering operators a number or string.
+Rules are checked when compiled, so a typo fails at load time rather than on every badge check.
+Compiled predicates carry a reads_profile_fields attribute so the badge engine can index them
+like hand-written checks.
+"""
+
+import json
+import operator
+
+class BadgeRuleError(ValueError):
+    """Raised when a declarative badge rule or definition is malformed."""
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+_COUNT_COMPARISONS = {"count_" + name: compare for name, compare in _COMPARISONS.items()}
+
+_MEMBERSHIP_OPERATORS = ("contains", "contains_all", "contains_any")
+
+LEAF_OPERATORS = ("exists",) + tuple(_COMPARISONS) + tuple(_COUNT_COMPARISONS) + _MEMBERSHIP_OPERATORS
+
+# LearnerProfile / CompactLearnerProfile attributes a rule may read
+PROFILE_RULE_FIELDS = frozenset({
+    "student_id", "learning_preferences", "interests", "struggle_areas", "cognitive_metrics",
+    "cognitive_metric_history", "completed_los", "current_learning_objective_id", "earned_badges",
+})
+
+# The PROFILE_RULE_FIELDS that hold dictionaries, and so may be walked with a "path"
+_MAPPING_RULE_FIELDS = frozenset({"learning_preferences", "cognitive_metrics", "cognitive_metric_history", "earned_badges"})
+
+_ORDERING_OPERATORS = ("gt", "gte", "lt", "lte")
+
+_MISSING = object()
+
+def compile_value_getter(field_name, path, default):
+    """Builds a closure returning the profile value at field/path, or default if any key is missing."""
+    if not path:
+        def get_value(profile):
+            return getattr(profile, field_name)
+    elif len(path) == 1:
+        key = path[0]
+        def get_value(profile):
+            value = getattr(profile, field_name)
+            return value.get(key, default) if isinstance(value, dict) else default
+    elif len(path) == 2:
+        outer_key, inner_key = path
+        def get_value(profile):
+            value = getattr(profile, field_name)
+            inner = value.get(outer_key) if isinstance(value, dict) else None
+            if not isinstance(inner, dict):
+                return default
+            return inner.get(inner_key, default)
+    else:
+        path = tuple(path)
+        def get_value(profile):
+            value = getattr(profile, field_name)
+            for key in path:
+                value = value.get(key, _MISSING) if isinstance(value, dict) else _MISSING
+                if value is _MISSING:
+                    return default
+            return value
+    return get_value
+
+def validate_leaf(rule):
+    """Checks a rule leaf's field, operator, path and value. Returns (field_name, op, path as a tuple)."""
+    field_name = rule.get("field")
+    op = rule.get("op", "exists")
+    if not isinstance(field_name, str) or not field_name:
+        raise BadgeRuleError(f"Rule leaf needs a 'field' name: {rule!r}")
+    if field_name not in PROFILE_RULE_FIELDS:
+        raise BadgeRuleError(f"Unknown profile field '{field_name}'. Expected one of: {', '.join(sorted(PROFILE_RULE_FIELDS))}")
+    if op not in LEAF_OPERATORS:
+        raise BadgeRuleError(f"Unknown rule operator '{op}'. Expected one of: {', '.join(LEAF_OPERATORS)}")
+    if op != "exists" and "value" not in rule:
+        raise BadgeRuleError(f"Rule operator '{op}' needs a 'value': {rule!r}")
+
+    path = rule.get("path") or []
+    if isinstance(path, str):
+        path = [path]
+    elif not isinstance(path, list) or not all(isinstance(key, str) for key in path):
+        raise BadgeRuleError(f"Rule 'path' must be a key or a list of string keys: {rule!r}")
+    if path and field_name not in _MAPPING_RULE_FIELDS:
+        raise BadgeRuleError(f"Profile field '{field_name}' is not a dictionary, so a rule on it cannot have a 'path': {rule!r}")
+    expected = rule.get("value")
+    if op in _COUNT_COMPARISONS and (not isinstance(expected, int) or isinstance(expected, bool)):
+        raise BadgeRuleError(f"Rule operator '{op}' needs an integer 'value': {rule!r}")
+    if op in _ORDERING_OPERATORS and (isinstance(expected, bool) or not isinstance(expected, (int, float, str))):
+        raise BadgeRuleError(f"Rule operator '{op}' needs a number or string 'value': {rule!r}")
+    return field_name, op, tuple(path)
+
+def _compile_leaf(rule):
+    field_name, op, path = validate_leaf(rule)
+    get_value = compile_value_getter(field_name, path, rule.get("default"))
+    expected = rule.get("value")
+
+    if op == "exists":
+        def predicate(profile):
+            return bool(get_value(profile))
+    elif op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        def predicate(profile):
+            value = get_value(profile)
+            if value is None:
+                return False
+            try:
+                return compare(value, expected)
+            except TypeError:
+                return False
+    elif op in _COUNT_COMPARISONS:
+        compare = _COUNT_COMPARISONS[op]
+        def predicate(profile):
+            value = get_value(profile)
+            return compare(len(value) if value else 0, expected)
+    elif op == "contains":
+        def predicate(profile):
+            value = get_value(profile)
+            return bool(value) and expected in value
+    else:
+        if not isinstance(expected, list) or not expected:
+            raise BadgeRuleError(f"Rule operator '{op}' needs a non-empty list 'value': {rule!r}")
+        expected_items = tuple(expected)
+        if op == "contains_all":
+            def predicate(profile):
+                value = get_value(profile)
+                return bool(value) and all(item in value for item in expected_items)
+        else:
+            def predicate(profile):
+                value = get_value(profile)
+                return bool(value) and any(item in value for item in expected_items)
+
+    return predicate, {field_name}
+
+def _compile_node(rule):
+    """Recursively compiles a rule into (predicate, set_of_fields_read)."""
+    if not isinstance(rule, dict):
+        raise BadgeRuleError(f"Rule must be an object, got {type(rule).__name__}: {rule!r}")
+
+    if "all" in rule or "any" in rule:
+        combinator = "all" if "all" in rule else "any"
+        children = rule[combinator]
+        if not isinstance(children, list) or not children:
+            raise BadgeRuleError(f"'{combinator}' needs a non-empty list of rules: {rule!r}")
+        compiled = [_compile_node(child) for child in children]
+        predicates = tuple(predicate for predicate, _ in compiled)
+        fields_read = set().union(*(fields for _, fields in compiled))
+        if len(predicates) == 1:
+            return predicates[0], fields_read
+        if combinator == "all":
+            def predicate(profile):
+                for child in predicates:
+                    if not child(profile):
+                        return False
+                return True
+        else:
+            def predicate(profile):
+                for child in predicates:
+                    if child(profile):
+                        return True
+                return False
+        return predicate, fields_read
+
+    if "not" in rule:
+        inner, fields_read = _compile_node(rule["not"])
+        def predicate(profile):
+            return not inner(profile)
+        return predicate, fields_read
+
+    return _compile_leaf(rule)
+
+def compile_rule(rule):
+    """Compiles a declarative badge rule into a predicate taking a learner profile.
+
+    The returned function has a reads_profile_fields attribute listing the profile fields it reads.
+    """
+    predicate, fields_read = _compile_node(rule)
+    predicate.reads_profile_fields = frozenset(fields_read)
+    predicate.rule = rule
+    return predicate
+
+def validate_badge_definition(definition):
+    """Checks a badge definition with declarative criteria. Returns the definition."""
+    for key in ("id", "name", "criteria"):
+        if key not in definition:
+            raise BadgeRuleError(f"Badge definition is missing '{key}': {definition!r}")
+    try:
+        compile_rule(definition["criteria"])
+    except BadgeRuleError as e:
+        raise BadgeRuleError(f"Badge '{definition['id']}': {e}") from e
+    return definition
+
+def load_badge_definitions(filepath):
+    """Loads badge definitions with declarative criteria from a JSON file.
+
+    The file holds a list of definitions (or {"badges": [...]}) shaped like BADGE_DEFINITIONS entries,
+    with a "criteria" rule in place of "criteria_check_function". Returns a dict keyed by badge ID.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("badges", [])
+    definitions = {}
+    for definition in data:
+        validate_badge_definition(definition)
+        if definition["id"] in definitions:
+            raise BadgeRuleError(f"Duplicate badge ID '{definition['id']}' in {filepath}")
+        definitions[definition["id"]] = definition
+    return definitions
+
+if __name__ == "__main__":
+    print("--- DALA Declarative Badge Rules Demo ---")
+
+    class _DemoProfile:
+        completed_los = {"Y4MD_LO1", "Y4MD_LO2"}
+        cognitive_metrics = {"story_weaver": {"attempts": 2}}
+        interests = ["Robotics"]
+
+    demo_rule = {
+        "all": [
+            {"field": "completed_los", "op": "count_gte", "value": 2},
+            {"field": "cognitive_metrics", "path": ["story_weaver", "attempts"], "op": "gt", "value": 1, "default": 0},
+            {"field": "interests", "op": "contains_any", "value": ["Robotics", "Space Exploration"]}
+        ]
+    }
+    demo_check = compile_rule(demo_rule)
+    print(f"Rule reads fields: {sorted(demo_check.reads_profile_fields)}")
+    print(f"Rule met for demo profile: {demo_check(_DemoProfile())}")
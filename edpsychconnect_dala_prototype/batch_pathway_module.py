@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Batch Pathway Module
+
+This module contains the logic for:
+1.  Generating pathways for a whole class or year group in one call, from one store snapshot.
+2.  Computing every student's available LOs at once: a students x LOs completion matrix against the
+    curriculum's prerequisite matrix, in a single NumPy matrix product.
+3.  Sharing content selection between students: students with the same preference signature (their
+    ordered content types, and whether the LO gets hardest-first enrichment) get the same content
+    for an LO, so it is selected once per signature rather than once per student.
+
+generate_pathways() gives each student exactly the pathway PathwayGenerator would give them with a
+shuffle seeded by student and catalog version (dcw_apg_module.pathway_rng), and emits the same
+events. Without NumPy, availability falls back to the prerequisite graph's per-student bitsets.
+"""
+
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # Availability falls back to per-student bitset checks
+    np = None
+
+import events_module
+from events_module import LOProcessedEvent, PathwayGeneratedEvent
+from dcw_apg_module import ALL_CONTENT_TYPES, MASTERY_PRIORITY, pathway_rng, preferred_content_types, select_varied_content
+from performance_feedback_module import MASTERED
+
+# PrerequisiteGraph -> (lo_index width, LO columns, prerequisite columns, prerequisite matrix, prerequisite counts)
+_prerequisite_matrices = weakref.WeakKeyDictionary()
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for vectorized eligibility (pip install numpy).")
+
+def _mask_bits(masks, width):
+    """Unpacks int bitsets into a len(masks) x width uint8 matrix of 0/1 (bit i in column i)."""
+    nbytes = (width + 7) // 8
+    packed = np.frombuffer(b"".join(mask.to_bytes(nbytes, "little") for mask in masks), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(masks), nbytes), axis=1, count=width, bitorder="little")
+
+def _prerequisite_matrix(graph, lo_ids):
+    """The graph's direct prerequisites as an LOs x prerequisites matrix, built once per graph and lo_index width."""
+    width = len(graph.lo_index)
+    cached = _prerequisite_matrices.get(graph)
+    if cached is not None and cached[0] == width:
+        return cached
+    index_of = graph.lo_index.get
+    lo_columns = np.array([index_of(lo_id) for lo_id in lo_ids], dtype=np.intp)
+    direct_masks = [graph.prerequisite_mask(lo_id, transitive=False) for lo_id in lo_ids]
+    union = 0
+    for mask in direct_masks:
+        union |= mask
+    # Only LOs that are some LO's prerequisite need a column
+    prerequisite_columns = np.flatnonzero(_mask_bits([union], width)[0])
+    matrix = _mask_bits(direct_masks, width)[:, prerequisite_columns].astype(np.float32)
+    cached = (width, lo_columns, prerequisite_columns, matrix.T.copy(), matrix.sum(axis=1))
+    _prerequisite_matrices[graph] = cached
+    return cached
+
+def available_lo_matrix(graph, lo_ids, completed_masks):
+    """Boolean students x LOs matrix: lo_ids[j] is available (not completed, every prerequisite completed) to student i.
+
+    completed_masks are the students' completed-LO bitsets over graph.lo_index. An LO's prerequisites
+    are all completed when the count of completed ones (completion @ prerequisites) equals its
+    prerequisite count.
+    """
+    _require_numpy()
+    width, lo_columns, prerequisite_columns, prerequisites, prerequisite_counts = _prerequisite_matrix(graph, lo_ids)
+    completion = _mask_bits(completed_masks, width)
+    completed_prerequisites = completion[:, prerequisite_columns].astype(np.float32) @ prerequisites
+    return (completed_prerequisites == prerequisite_counts) & (completion[:, lo_columns] == 0)
+
+def _available_los(graph, learning_objectives, completed_masks):
+    """Each student's available LOs, in curriculum order."""
+    if np is None:
+        is_available = graph.is_available
+        return [[lo for lo in learning_objectives if is_available(lo["id"], mask)] for mask in completed_masks]
+    available = available_lo_matrix(graph, [lo["id"] for lo in learning_objectives], completed_masks)
+    return [[learning_objectives[j] for j in np.flatnonzero(row)] for row in available]
+
+def generate_pathways(learner_profiles, content_store, performance_tracker=None, max_los=3, max_activities_per_lo=2):
+    """Generates a pathway for every profile; returns a list of pathways in profile order.
+
+    Each pathway is a list of (lo_data_dict, list_of_content_item_dicts) tuples, the same as
+    PathwayGenerator.generate_pathway_with_prerequisites(rng=pathway_rng(student_id, version))
+    returns for that student. content_store may be a VersionedContentStore; one snapshot is used
+    for the whole batch.
+    """
+    sink = events_module.event_sink
+    learner_profiles = list(learner_profiles)
+    content_store = content_store.snapshot()
+    learning_objectives = content_store.get_learning_objectives()
+    if not learning_objectives:
+        if sink.enabled:
+            for learner_profile in learner_profiles:
+                sink.emit(PathwayGeneratedEvent(learner_profile.student_id, ()))
+        return [[] for _ in learner_profiles]
+
+    graph = content_store.prerequisite_graph
+    catalog_version = content_store.version
+    content_index = content_store.content_index
+    available_by_student = _available_los(graph, learning_objectives, [graph.completed_mask(profile) for profile in learner_profiles])
+    selections = {}  # (lo_id, preferred content types, hardest_first) -> selected content
+    pathways = []
+    for learner_profile, potential_next_los in zip(learner_profiles, available_by_student):
+        student_id = learner_profile.student_id
+        pathway_rng(student_id, catalog_version).shuffle(potential_next_los)
+        if performance_tracker is None:
+            mastery = None
+            type_accuracy = None
+        else:
+            mastery = {lo["id"]: performance_tracker.lo_mastery_status(student_id, lo["id"]) for lo in potential_next_los}
+            potential_next_los.sort(key=lambda lo: MASTERY_PRIORITY[mastery[lo["id"]]])
+            type_accuracy = performance_tracker.content_type_accuracy(student_id, ALL_CONTENT_TYPES)
+        preferred_types = tuple(preferred_content_types(learner_profile.learning_preferences, type_accuracy))
+
+        pathway = []
+        for lo_data in potential_next_los[:max_los]:
+            lo_id = lo_data["id"]
+            hardest_first = mastery is not None and mastery[lo_id] == MASTERED
+            key = (lo_id, preferred_types, hardest_first)
+            selection = selections.get(key)
+            if selection is None:
+                selection = selections[key] = select_varied_content(content_index, preferred_types, lo_id, hardest_first, max_activities_per_lo)
+            pathway.append((lo_data, list(selection)))
+            if sink.enabled:
+                sink.emit(LOProcessedEvent(student_id, lo_id, tuple(item["content_id"] for item in selection)))
+        if sink.enabled:
+            sink.emit(PathwayGeneratedEvent(student_id, tuple(lo_data["id"] for lo_data, _ in pathway)))
+        pathways.append(pathway)
+    return pathways
+
+if __name__ == "__main__":
+    from curriculum_content_module import CurriculumContentStore, CURRICULUM_SLICE, LEARNING_CONTENT_SET
+    from hlp_module import CompactLearnerProfile
+
+    print("--- DALA Batch Pathway Demo ---")
+    store = CurriculumContentStore(CURRICULUM_SLICE, LEARNING_CONTENT_SET)
+    class_profiles = []
+    for i, completed in enumerate([(), ("Y4MD_LO1",), ("Y4MD_LO1", "Y4MD_LO2"), ("Y4MD_LO1", "Y4MD_LO2", "Y4MD_LO3")]):
+        profile = CompactLearnerProfile.for_store(f"student_batch_{i:03d}", store)
+        if i % 2:
+            profile.update_preference("visual_task_1", "visual")
+        for lo_id in completed:
+            profile.mark_lo_completed(lo_id)
+        class_profiles.append(profile)
+    for profile, pathway in zip(class_profiles, generate_pathways(class_profiles, store, max_los=2)):
+        steps = ", ".join(f"{lo['id']} [{', '.join(item['content_id'] for item in content)}]" for lo, content in pathway)
+        print(f"{profile.student_id} (completed {sorted(profile.completed_los) or 'none'}): {steps or 'no LOs available'}")
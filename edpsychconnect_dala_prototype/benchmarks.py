@@ -0,0 +1,1008 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Performance Benchmarks
+
+Micro-benchmarks for the hot paths of the prototype modules.
+
+Usage:
+    python benchmarks.py                 # run every benchmark
+    python benchmarks.py badge_checks    # run selected benchmarks by name
+"""
+
+import argparse
+import contextlib
+import gc
+import inspect
+import io
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import hlp_module
+from hlp_module import LearnerProfile, CompactLearnerProfile, BADGE_DEFINITIONS, BADGE_ENGINE, check_and_award_all_relevant_badges, PREDEFINED_INTERESTS, PREDEFINED_STRUGGLE_AREAS
+from badge_rules_module import compile_rule, load_badge_definitions
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def _quiet():
+    """Silences the prototype modules' progress prints while building fixtures."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def _make_sample_profiles(count, seed=42, profile_class=LearnerProfile):
+    """Builds varied learner profiles without running the diagnostic tasks or badge checks."""
+    rng = random.Random(seed)
+    lo_ids = ["MA4_N1a", "MA4_N1b", "EN4_C1a", "Y4MD_LO1", "Y4MD_LO2", "Y4MD_LO3", "Y4MD_LO4"]
+    profiles = []
+    with _quiet():
+        for i in range(count):
+            profile = profile_class(f"bench_student_{i:07d}")
+            if rng.random() < 0.7:
+                profile.update_preference("visual_preference_task_1", rng.choice(["visual", "non-visual"]))
+            if rng.random() < 0.7:
+                profile.update_preference("textual_preference_task_1", rng.choice(["detailed_text", "concise_text"]))
+            for interest in rng.sample(PREDEFINED_INTERESTS, k=rng.randint(0, 3)):
+                profile.add_interest(interest)
+            for area in rng.sample(PREDEFINED_STRUGGLE_AREAS, k=rng.randint(0, 2)):
+                profile.add_struggle_area(area)
+            if rng.random() < 0.8:
+                profile.add_cognitive_metric("story_weaver", "attempts", rng.randint(1, 3))
+            for lo_id in rng.sample(lo_ids, k=rng.randint(0, len(lo_ids))):
+                profile._add_completed_lo(lo_id)
+            profiles.append(profile)
+    return profiles
+
+def _report(label, seconds, operations, unit="op"):
+    per_op_ns = seconds / operations * 1e9 if operations else 0.0
+    rate = operations / seconds if seconds else float("inf")
+    print(f"  {label:<48} {per_op_ns:10.1f} ns/{unit}  {rate:14,.0f} {unit}s/sec")
+
+# --- Badge criteria checks ---
+def benchmark_badge_checks(profile_count=2000, repeats=5):
+    """Per-check cost: reflection lookup vs engine-resolved functions vs compiled declarative rules."""
+    print(f"\n[badge_checks] {profile_count} profiles x {len(BADGE_DEFINITIONS)} badges x {repeats} repeats")
+    profiles = _make_sample_profiles(profile_count)
+    badge_ids = list(BADGE_DEFINITIONS)
+    module = sys.modules[hlp_module.__name__]
+
+    def reflection_check(profile, badge_id, curriculum_store=None):
+        # The per-call lookup award_badge_if_criteria_met used before the badge engine existed.
+        check_function = getattr(module, BADGE_DEFINITIONS[badge_id]["criteria_check_function"])
+        sig = inspect.signature(check_function)
+        if "curriculum_store" in sig.parameters and curriculum_store is not None:
+            return check_function(profile, curriculum_store=curriculum_store)
+        return check_function(profile)
+
+    rule_definitions = load_badge_definitions(os.path.join(DATA_DIR, "badge_rules.json"))
+    compiled_rules = {badge_id: compile_rule(definition["criteria"]) for badge_id, definition in rule_definitions.items()}
+    resolved_functions = {badge_id: getattr(module, BADGE_DEFINITIONS[badge_id]["criteria_check_function"]) for badge_id in badge_ids}
+
+    mismatches = sum(
+        1 for profile in profiles for badge_id in badge_ids
+        if bool(compiled_rules[badge_id](profile)) != bool(resolved_functions[badge_id](profile))
+    )
+    print(f"  compiled rules agree with hand-written checks: {'yes' if not mismatches else f'NO ({mismatches} mismatches)'}")
+
+    checks = profile_count * len(badge_ids) * repeats
+    variants = [
+        ("reflection (getattr + inspect.signature)", lambda p, b: reflection_check(p, b)),
+        ("engine-resolved hand-written function", lambda p, b: BADGE_ENGINE.evaluate(p, b)),
+        ("direct hand-written function", lambda p, b: resolved_functions[b](p)),
+        ("compiled declarative rule", lambda p, b: compiled_rules[b](p)),
+    ]
+    for label, check in variants:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for profile in profiles:
+                for badge_id in badge_ids:
+                    check(profile, badge_id)
+        _report(label, time.perf_counter() - start, checks, unit="check")
+
+    # Incremental checks after a single-field mutation: how many evaluations the field index saves
+    with _quiet():
+        for profile in profiles:
+            check_and_award_all_relevant_badges(profile)  # Settles the fixtures' unknown changes
+        BADGE_ENGINE.reset_stats()
+        for i, profile in enumerate(profiles):
+            profile.mark_lo_completed(f"BENCH_LO{i % 7}")
+    stats = BADGE_ENGINE.stats()
+    print(f"  {'incremental checks: run / skipped by index / already awarded':<48} "
+          f"{stats['evaluations_run']:,} / {stats['evaluations_skipped']:,} / {stats['evaluations_already_awarded']:,}")
+
+# --- Cohort badge backfill ---
+def benchmark_badge_backfill(profile_count=200_000, reflection_sample=20_000):
+    """Looping per-profile criteria checks vs a columnar NumPy pass over every rule in badge_rules.json."""
+    from badge_backfill_module import DEFAULT_CHUNK_SIZE, backfill_badges, compile_columnar_rule, CohortColumns
+
+    rule_definitions = load_badge_definitions(os.path.join(DATA_DIR, "badge_rules.json"))
+    rules = {badge_id: definition["criteria"] for badge_id, definition in rule_definitions.items()}
+    compiled_rules = {badge_id: compile_rule(rule) for badge_id, rule in rules.items()}
+    compiled_columnar = [compile_columnar_rule(rule) for rule in rules.values()]
+    column_specs = list(dict.fromkeys(spec for specs, _ in compiled_columnar for spec in specs))
+    module = sys.modules[hlp_module.__name__]
+
+    def reflection_check(profile, badge_id):
+        check_function = getattr(module, BADGE_DEFINITIONS[badge_id]["criteria_check_function"])
+        inspect.signature(check_function)
+        return check_function(profile)
+
+    for profile_class in (LearnerProfile, CompactLearnerProfile):
+        print(f"\n[badge_backfill] {profile_count:,} {profile_class.__name__}s")
+        profiles = _make_sample_profiles(profile_count, profile_class=profile_class)
+        gc.collect()
+        gc.freeze()  # Long-lived fixtures: keep full collections from rescanning them mid-measurement
+
+        if profile_class is LearnerProfile:
+            # The old path is slow enough that it is timed on a sample and reported as a rate.
+            sample = profiles[:reflection_sample]
+            start = time.perf_counter()
+            for badge_id in rules:
+                for p in sample:
+                    if not p.has_badge(badge_id):
+                        reflection_check(p, badge_id)
+            reflection_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        looped = [(p.student_id, badge_id) for badge_id, check in compiled_rules.items() for p in profiles
+                  if not p.has_badge(badge_id) and check(p)]
+        looped_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar = [(p.student_id, badge_id) for p, badge_id in backfill_badges(profiles, list(rules), rules=rules)]
+        columnar_seconds = time.perf_counter() - start
+
+        load_seconds = evaluate_seconds = 0.0
+        for chunk_start in range(0, profile_count, DEFAULT_CHUNK_SIZE):
+            start = time.perf_counter()
+            cohort = CohortColumns.from_profiles(profiles[chunk_start:chunk_start + DEFAULT_CHUNK_SIZE], column_specs)
+            load_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            for _, evaluate in compiled_columnar:
+                evaluate(cohort.columns)
+            evaluate_seconds += time.perf_counter() - start
+
+        agreement = "yes" if sorted(columnar) == sorted(looped) else "NO"
+        print(f"  {len(rules)} badges, {len(columnar):,} new awards, columnar agrees with per-profile loop: {agreement}")
+        if profile_class is LearnerProfile:
+            print(f"  {'per-profile loop, reflection lookup (sampled)':<48} {profile_count / reflection_rate:6.2f}s  {reflection_rate:12,.0f} profiles/sec")
+        for label, seconds in (("per-profile loop, compiled rules", looped_seconds),
+                               ("columnar backfill (load + evaluate + stream)", columnar_seconds),
+                               (f"  of which: loading columns ({DEFAULT_CHUNK_SIZE:,}-row chunks)", load_seconds),
+                               ("  of which: evaluating all rules on columns", evaluate_seconds)):
+            print(f"  {label:<48} {seconds:6.2f}s  {profile_count / seconds:12,.0f} profiles/sec")
+        print(f"  {'columnar speedup over the compiled loop':<48} {looped_seconds / columnar_seconds:6.2f}x")
+        del profiles, cohort
+        gc.unfreeze()
+
+# --- Learner profile memory ---
+def benchmark_profile_memory(sizes=(10_000, 100_000, 1_000_000)):
+    """Traced bytes per profile for LearnerProfile vs CompactLearnerProfile holding identical data."""
+    print(f"\n[profile_memory] bytes per profile (tracemalloc), badges awarded after population")
+    for count in sizes:
+        results = {}
+        for profile_class in (LearnerProfile, CompactLearnerProfile):
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            profiles = _make_sample_profiles(count, profile_class=profile_class)
+            for profile in profiles:
+                BADGE_ENGINE.check_profile(profile)
+            results[profile_class.__name__] = (tracemalloc.get_traced_memory()[0] - baseline) / count
+            tracemalloc.stop()
+            del profiles
+        regular, compact = results["LearnerProfile"], results["CompactLearnerProfile"]
+        print(f"  {count:>9,} profiles: LearnerProfile {regular:7.0f} B  CompactLearnerProfile {compact:7.0f} B  "
+              f"({100 * (1 - compact / regular):.0f}% smaller)")
+
+# --- SQLite profile repository ---
+def benchmark_profile_repository(profile_count=100_000, class_size=30, reader_threads=4):
+    """save_many and bulk load-by-class throughput against an on-disk SQLite database."""
+    from profile_repository_module import ProfileRepository
+
+    print(f"\n[profile_repository] {profile_count:,} profiles, classes of {class_size}")
+    profiles = _make_sample_profiles(profile_count)
+    for profile in profiles:
+        BADGE_ENGINE.check_profile(profile)
+    class_count = (profile_count + class_size - 1) // class_size
+
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            ProfileRepository(os.path.join(temp_dir, "profiles.db"), pool_size=reader_threads) as repository:
+        start = time.perf_counter()
+        for class_index in range(class_count):
+            repository.save_many(profiles[class_index * class_size:(class_index + 1) * class_size], class_id=f"class_{class_index}")
+        _report("save_many, one call per class (insert)", time.perf_counter() - start, profile_count, unit="profile")
+
+        start = time.perf_counter()
+        repository.save_many(profiles, batch_size=1000)
+        _report("save_many, whole cohort (update, 1000/txn)", time.perf_counter() - start, profile_count, unit="profile")
+
+        start = time.perf_counter()
+        loaded_count = sum(len(repository.load_class(f"class_{class_index}")) for class_index in range(class_count))
+        _report("load_class, single thread", time.perf_counter() - start, loaded_count, unit="profile")
+
+        loaded_counts = []
+        def load_classes(thread_index):
+            loaded_counts.append(sum(len(repository.load_class(f"class_{class_index}"))
+                                     for class_index in range(thread_index, class_count, reader_threads)))
+        threads = [threading.Thread(target=load_classes, args=(i,)) for i in range(reader_threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        _report(f"load_class, {reader_threads} threads sharing the pool", time.perf_counter() - start, sum(loaded_counts), unit="profile")
+
+# --- Profile serialization ---
+def benchmark_profile_serialization(profile_count=20_000):
+    """Binary codec vs the json.dumps(profile.to_dict()) path used by generate_interface.py."""
+    import json
+    from curriculum_content_module import DEFAULT_LO_INDEX
+    from profile_serialization_module import encode_profile, decode_profile
+
+    print(f"\n[profile_serialization] {profile_count:,} profiles, badges awarded")
+    profiles = _make_sample_profiles(profile_count)
+    compact_profiles = _make_sample_profiles(profile_count, profile_class=CompactLearnerProfile)
+    for profile in profiles + compact_profiles:
+        BADGE_ENGINE.check_profile(profile)
+
+    def run(label, profiles, encode, decode):
+        start = time.perf_counter()
+        encoded = [encode(profile) for profile in profiles]
+        encode_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for data in encoded:
+            decode(data)
+        decode_seconds = time.perf_counter() - start
+        average_bytes = sum(map(len, encoded)) / len(encoded)
+        _report(f"{label} encode", encode_seconds, len(profiles), unit="profile")
+        _report(f"{label} decode", decode_seconds, len(profiles), unit="profile")
+        print(f"  {label + ' size':<48} {average_bytes:10.1f} bytes/profile")
+
+    run("json.dumps(to_dict())", profiles,
+        lambda profile: json.dumps(profile.to_dict()), lambda data: LearnerProfile.from_dict(json.loads(data)))
+    run("binary, LO string refs", profiles, encode_profile, decode_profile)
+    run("binary, LO index varints", profiles,
+        lambda profile: encode_profile(profile, lo_index=DEFAULT_LO_INDEX),
+        lambda data: decode_profile(data, lo_index=DEFAULT_LO_INDEX))
+    run("binary, CompactLearnerProfile + LO index", compact_profiles,
+        lambda profile: encode_profile(profile, lo_index=DEFAULT_LO_INDEX),
+        lambda data: decode_profile(data, profile_class=CompactLearnerProfile, lo_index=DEFAULT_LO_INDEX))
+
+# --- Delta persistence ---
+def benchmark_profile_delta_writes(profile_count=50_000, updates_per_profile=3):
+    """Tiny post-task updates persisted as whole-profile rewrites (save_many) vs patches (save_changes)."""
+    import json
+    from profile_repository_module import ProfileRepository
+
+    print(f"\n[profile_delta_writes] {profile_count:,} profiles, {updates_per_profile} rounds of one metric update each")
+    profiles = _make_sample_profiles(profile_count)
+    for profile in profiles:
+        BADGE_ENGINE.check_profile(profile)
+
+    for label, save in (("save_many (full rows)", "full"), ("save_changes (patches)", "delta")):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database_path = os.path.join(temp_dir, "profiles.db")
+            with ProfileRepository(database_path) as repository:
+                repository.save_many(profiles)
+                written_bytes = 0
+                seconds = 0.0
+                for round_index in range(updates_per_profile):
+                    for profile in profiles:
+                        profile.add_cognitive_metric("mind_mapper", "ideas_generated", round_index)
+                    if save == "full":
+                        written_bytes += sum(len(json.dumps(profile.to_dict(), separators=(",", ":"))) for profile in profiles)
+                    else:
+                        written_bytes += sum(len(json.dumps(profile.pending_patch(), separators=(",", ":"))) for profile in profiles)
+                    start = time.perf_counter()
+                    if save == "full":
+                        repository.save_many(profiles)
+                    else:
+                        repository.save_changes(profiles)
+                    seconds += time.perf_counter() - start
+                writes = profile_count * updates_per_profile
+                _report(label, seconds, writes, unit="write")
+                print(f"  {'  payload written':<48} {written_bytes / writes:10.1f} bytes/write")
+                if save == "delta":
+                    start = time.perf_counter()
+                    repository.load_many(profile.student_id for profile in profiles[:10_000])
+                    _report("  load_many with pending patches", time.perf_counter() - start, 10_000, unit="profile")
+                    start = time.perf_counter()
+                    repository.compact()
+                    _report("  compact()", time.perf_counter() - start, profile_count, unit="profile")
+
+# --- Interaction log replay ---
+def benchmark_interaction_replay(student_count=5_000, interactions_per_student=200, snapshot_interval=50):
+    """Append throughput, then cohort rebuild by full replay vs latest snapshot + tail."""
+    from interaction_log_module import InteractionLog, TASK_RESULT, LO_COMPLETED, PREFERENCE_UPDATED, BADGE_AWARDED
+
+    total = student_count * interactions_per_student
+    print(f"\n[interaction_replay] {student_count:,} students x {interactions_per_student} interactions, snapshot every {snapshot_interval}")
+    rng = random.Random(42)
+    lo_ids = ["MA4_N1a", "MA4_N1b", "EN4_C1a", "Y4MD_LO1", "Y4MD_LO2", "Y4MD_LO3", "Y4MD_LO4"]
+    metric_keys = [("story_weaver", "accuracy"), ("story_weaver", "attempts"), ("mind_mapper", "ideas_generated")]
+    kinds = [TASK_RESULT] * 6 + [LO_COMPLETED, PREFERENCE_UPDATED, BADGE_AWARDED]
+    planned = []
+    for _ in range(interactions_per_student):
+        for student_index in range(student_count):
+            kind = rng.choice(kinds)
+            if kind == TASK_RESULT:
+                planned.append((student_index, kind, rng.choice(metric_keys), rng.random()))
+            elif kind == LO_COMPLETED:
+                planned.append((student_index, kind, None, rng.choice(lo_ids)))
+            elif kind == PREFERENCE_UPDATED:
+                planned.append((student_index, kind, "visual_preference_task_1", rng.choice(["visual", "non-visual"])))
+            else:
+                planned.append((student_index, kind, rng.choice(list(BADGE_DEFINITIONS)), "2025-01-01T00:00:00Z"))
+    student_ids = [f"bench_student_{i:07d}" for i in range(student_count)]
+
+    interaction_log = InteractionLog(snapshot_interval=snapshot_interval)
+    start = time.perf_counter()
+    for student_index, kind, key, value in planned:
+        interaction_log.append(student_ids[student_index], kind, key, value, timestamp=0.0)
+    _report("append (with periodic snapshots)", time.perf_counter() - start, total, unit="interaction")
+
+    start = time.perf_counter()
+    rebuilt_count = sum(1 for _ in interaction_log.rebuild_all(use_snapshot=False))
+    seconds = time.perf_counter() - start
+    _report("rebuild_all, full replay", seconds, total, unit="interaction")
+    _report("rebuild_all, full replay", seconds, rebuilt_count, unit="profile")
+
+    start = time.perf_counter()
+    rebuilt_count = sum(1 for _ in interaction_log.rebuild_all(use_snapshot=True))
+    _report("rebuild_all, snapshot + tail", time.perf_counter() - start, rebuilt_count, unit="profile")
+
+# --- Cohort HLP assessment ---
+def benchmark_cohort_assessment(student_count=50_000, worker_counts=(1, 2, 4, 8)):
+    """Cohort assessment throughput by worker count; also checks the results are identical."""
+    from cohort_assessment_module import iter_cohort_assessment
+
+    print(f"\n[cohort_assessment] {student_count:,} students, {os.cpu_count()} CPU(s) available")
+    student_ids = [f"bench_student_{i:07d}" for i in range(student_count)]
+    reference = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = [profile.to_dict() for batch in iter_cohort_assessment(student_ids, workers=workers, cohort_seed=1,
+                                                                          assessed_at="2025-09-01T09:00:00Z")
+                   for profile in batch]
+        _report(f"{workers} worker(s)", time.perf_counter() - start, student_count, unit="student")
+        for profile_dict in results:
+            profile_dict["completed_los"].sort()
+        if reference is None:
+            reference = results
+        elif results != reference:
+            print(f"  WARNING: results with {workers} workers differ from {worker_counts[0]} worker(s)")
+
+# --- Async diagnostic sessions ---
+def benchmark_async_sessions(session_counts=(1_000, 10_000), latency=0.05):
+    """Concurrent async HLP sessions on one event loop, each task answered after `latency` seconds."""
+    import asyncio
+    from async_hlp_module import DiagnosticSessionManager, SimulatedStudentInput, HLP_TASK_SEQUENCE
+
+    print(f"\n[async_sessions] {len(HLP_TASK_SEQUENCE)} tasks per session, {latency * 1000:.0f} ms simulated answer latency")
+
+    async def run_sessions(session_count):
+        manager = DiagnosticSessionManager(SimulatedStudentInput(latency=latency, rng=random.Random(1)), task_timeout=5.0)
+        start = time.perf_counter()
+        for i in range(session_count):
+            manager.start(f"bench_student_{i:07d}")
+        await manager.wait_all()
+        return time.perf_counter() - start, manager.stats()
+
+    for session_count in session_counts:
+        seconds, stats = asyncio.run(run_sessions(session_count))
+        minimum_seconds = latency * len(HLP_TASK_SEQUENCE)
+        _report(f"{session_count:,} concurrent sessions", seconds, session_count, unit="session")
+        print(f"  {'  wall time vs one session alone':<48} {seconds:10.2f} s vs {minimum_seconds:.2f} s  "
+              f"(peak active {stats['peak_active']:,}, completed {stats['completed']:,})")
+
+# --- Performance feedback ingestion ---
+def benchmark_performance_ingestion(event_count=1_000_000, student_count=10_000, lo_count=40):
+    """Single-core ingestion rate of activity results into decayed (student, LO) / (student, type) aggregates."""
+    from performance_feedback_module import ActivityResult, PerformanceTracker
+
+    print(f"\n[performance_ingestion] {event_count:,} activity results, {student_count:,} students x {lo_count} LOs")
+    rng = random.Random(42)
+    content_types = ["video", "interactive_quiz", "game", "text_explanation", "worksheet_pdf"]
+    student_ids = [f"bench_student_{i:07d}" for i in range(student_count)]
+    lo_ids = [f"LO_{i:03d}" for i in range(lo_count)]
+    events = [
+        ActivityResult(rng.choice(student_ids), rng.choice(lo_ids), rng.choice(content_types), rng.random(),
+                       rng.uniform(30, 600), rng.randint(1, 3), 1_700_000_000 + i * 0.01 - rng.random())
+        for i in range(event_count)
+    ]
+    tracker = PerformanceTracker()
+    start = time.perf_counter()
+    tracker.ingest_many(events)
+    _report("ingest_many", time.perf_counter() - start, event_count, unit="event")
+
+    start = time.perf_counter()
+    for student_id, lo_id, *_ in events[:200_000]:
+        tracker.lo_mastery_status(student_id, lo_id)
+    _report("lo_mastery_status", time.perf_counter() - start, 200_000, unit="lookup")
+    print(f"  {'  aggregates held':<48} {len(tracker):10,} (student, LO) keys")
+
+def _make_synthetic_curriculum(lo_count, content_per_lo, seed=42, subject="Mathematics", year_group="Year 4", topic="Synthetic"):
+    """Builds (curriculum_data, content_data) shaped like the files in data/, with a layered prerequisite graph."""
+    rng = random.Random(seed)
+    prefix = f"{subject[:3].upper()}{year_group.split()[-1]}_{topic[:4].upper()}"
+    lo_ids = [f"{prefix}_LO{i:05d}" for i in range(lo_count)]
+    words = ["multiply", "divide", "times", "tables", "facts", "mental", "written", "method", "place", "value",
+             "factor", "pairs", "array", "grid", "column", "remainder", "estimate", "check", "reason", "solve"]
+    learning_objectives = [
+        {"id": lo_id, "description": f"Objective {i}: {' '.join(rng.sample(words, 5))}", "keywords": rng.sample(words, 3),
+         "prerequisites": rng.sample(lo_ids[max(0, i - 50):i], min(i, rng.randint(0, 2)))}
+        for i, lo_id in enumerate(lo_ids)
+    ]
+    content_types = ["video", "interactive_quiz", "game", "text_explanation", "worksheet_pdf"]
+    preferences = ["visual", "kinesthetic", "auditory", "textual", "interactive", "detailed_text", "summary_bullets"]
+    content = [
+        {"content_id": f"{lo_id}_C{j:02d}", "title": f"{' '.join(rng.sample(words, 4)).title()} {j}", "type": rng.choice(content_types),
+         "learning_objectives_covered": [lo_id], "target_preferences": rng.sample(preferences, 2),
+         "difficulty": rng.choice(["easy", "medium", "hard"]), "url_path": f"/content/{lo_id}_{j}"}
+        for lo_id in lo_ids for j in range(content_per_lo)
+    ]
+    curriculum = {"subject": subject, "year_group": year_group, "topic": topic, "learning_objectives": learning_objectives}
+    return curriculum, content
+
+def _write_synthetic_shards(directory, subjects, year_groups, lo_count, content_per_lo, seed=42):
+    """Writes one <shard>_curriculum.json / <shard>_content.json pair per subject and year group."""
+    import json
+    for s, subject in enumerate(subjects):
+        for y, year_group in enumerate(year_groups):
+            curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo, seed + s * 100 + y, subject, year_group)
+            shard_id = f"{subject.lower()}_{year_group.lower().replace(' ', '')}"
+            with open(os.path.join(directory, f"{shard_id}_curriculum.json"), "w") as f:
+                json.dump(curriculum, f)
+            with open(os.path.join(directory, f"{shard_id}_content.json"), "w") as f:
+                json.dump(content, f)
+
+def benchmark_curriculum_catalog(subject_count=8, year_group_count=6, lo_count=200, content_per_lo=5, requests=5_000):
+    """Discovery cost, first-load cost and hit rate of the lazy catalog under a budget of a quarter of the shards."""
+    from curriculum_catalog_module import CurriculumCatalog
+    from curriculum_content_module import LearningObjectiveIndex
+
+    subjects = [f"Subject{i}" for i in range(subject_count)]
+    year_groups = [f"Year {i + 1}" for i in range(year_group_count)]
+    shard_count = subject_count * year_group_count
+    print(f"\n[curriculum_catalog] {shard_count} shards x {lo_count} LOs x {content_per_lo} content items, {requests:,} skewed requests")
+    with tempfile.TemporaryDirectory() as directory:
+        _write_synthetic_shards(directory, subjects, year_groups, lo_count, content_per_lo)
+        total_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        start = time.perf_counter()
+        catalog = CurriculumCatalog(directory, memory_budget_bytes=total_bytes // 4, lo_index=LearningObjectiveIndex())
+        _report("discover (header peek)", time.perf_counter() - start, shard_count, unit="shard")
+
+        eager_start = time.perf_counter()
+        for shard in catalog.shards():
+            catalog._load(shard)
+        eager_seconds = time.perf_counter() - eager_start
+        _report("eager load of every shard", eager_seconds, shard_count, unit="shard")
+        catalog.reset_stats()
+
+        rng = random.Random(42)
+        pairs = catalog.subjects()
+        weights = [1 / (rank + 1) for rank in range(len(pairs))]  # Zipf-like: a few classes are busy
+        start = time.perf_counter()
+        for subject, year_group in rng.choices(pairs, weights, k=requests):
+            catalog.get_slice(subject, year_group)
+        _report("get_slice (lazy + LRU)", time.perf_counter() - start, requests, unit="request")
+        stats = catalog.stats()
+        print(f"  {'  hit rate / loads / evictions':<48} {stats['hit_rate']:9.1%} / {stats['loads']} / {stats['evictions']}")
+        print(f"  {'  resident vs total JSON bytes':<48} {stats['loaded_bytes'] / 1e6:9.1f} / {total_bytes / 1e6:.1f} MB")
+
+def benchmark_content_selection(lo_count=20, content_per_lo=5_000, selections=20_000):
+    """Per-LO content selection and multi-filter queries against a library with thousands of items per LO."""
+    from curriculum_content_module import CurriculumContentStore
+    from dcw_apg_module import PathwayGenerator
+
+    print(f"\n[content_selection] {lo_count} LOs x {content_per_lo:,} content items")
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    start = time.perf_counter()
+    store = CurriculumContentStore(curriculum, content)
+    store.content_index  # Built lazily on first query
+    _report("store build + content index", time.perf_counter() - start, len(content), unit="item")
+    lo_ids = [lo["id"] for lo in curriculum["learning_objectives"]]
+    profile = LearnerProfile("bench_student")
+    profile.update_preference("visual_task_1", "visual")
+    generator = PathwayGenerator(profile, store)
+    rng = random.Random(42)
+    picks = [rng.choice(lo_ids) for _ in range(selections)]
+
+    start = time.perf_counter()
+    for lo_id in picks:
+        generator._select_varied_content_for_lo(lo_id, max_activities_per_lo=3)
+    _report("indexed selection (3 activities)", time.perf_counter() - start, selections, unit="selection")
+
+    scan_count = selections // 100
+    start = time.perf_counter()
+    for lo_id in picks[:scan_count]:
+        generator._select_varied_content_for_lo(lo_id, store.get_content_for_lo(lo_id), 3)
+    _report("selection from an explicit content list", time.perf_counter() - start, scan_count, unit="selection")
+
+    start = time.perf_counter()
+    for lo_id in picks:
+        store.query_content(lo_id=lo_id, content_type="video", max_difficulty="medium", preference="visual", limit=10)
+    _report("query_content (4 filters, limit 10)", time.perf_counter() - start, selections, unit="query")
+
+def benchmark_prerequisite_graph(lo_count=5_000, checks=200_000):
+    """Compiling a national-curriculum-sized prerequisite graph, then eligibility and chain queries."""
+    from curriculum_content_module import LearningObjectiveIndex, PrerequisiteGraph
+
+    print(f"\n[prerequisite_graph] {lo_count:,} LOs")
+    curriculum, _ = _make_synthetic_curriculum(lo_count, 0)
+    learning_objectives = curriculum["learning_objectives"]
+    lo_index = LearningObjectiveIndex()
+    start = time.perf_counter()
+    graph = PrerequisiteGraph(learning_objectives, lo_index)
+    _report("compile (validate, order, closures)", time.perf_counter() - start, lo_count, unit="LO")
+
+    rng = random.Random(42)
+    lo_ids = graph.topological_order
+    profile = CompactLearnerProfile("bench_student", lo_index=lo_index)
+    for lo_id in lo_ids[:lo_count // 2]:
+        profile.completed_lo_mask |= 1 << lo_index.index_of(lo_id)
+    picks = [rng.choice(lo_ids) for _ in range(checks)]
+    prerequisites_by_id = {lo["id"]: lo["prerequisites"] for lo in learning_objectives}
+
+    start = time.perf_counter()
+    for lo_id in picks:
+        all(profile.has_completed_lo(prereq_id) for prereq_id in prerequisites_by_id[lo_id])
+    _report("eligibility by walking prerequisite lists", time.perf_counter() - start, checks, unit="check")
+
+    completed_mask = graph.completed_mask(profile)
+    start = time.perf_counter()
+    for lo_id in picks:
+        graph.is_eligible(lo_id, completed_mask)
+    _report("is_eligible (bitset)", time.perf_counter() - start, checks, unit="check")
+
+    start = time.perf_counter()
+    for lo_id in picks[:10_000]:
+        graph.remaining_mask(lo_id, completed_mask)
+    _report("remaining prerequisite mask", time.perf_counter() - start, 10_000, unit="query")
+    chain_lengths = [len(graph.prerequisite_chain(lo_id)) for lo_id in picks[:1_000]]
+    print(f"  {'  mean transitive prerequisites per LO':<48} {sum(chain_lengths) / len(chain_lengths):10.1f}")
+
+def _memory_kib():
+    """The process's resident and anonymous (private heap) memory in KiB (Linux /proc; zeros elsewhere)."""
+    sizes = {"Rss:": 0, "Anonymous:": 0}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                fields = line.split()
+                if fields and fields[0] in sizes:
+                    sizes[fields[0]] = int(fields[1])
+    except OSError:
+        pass
+    return sizes["Rss:"], sizes["Anonymous:"]
+
+def _catalog_worker_start(kind, curriculum_path, content_path, image_path, lo_ids):
+    """Worker-process cold start: loads the catalog one way, serves a few pathways' worth of lookups."""
+    import json
+    from curriculum_content_module import CurriculumContentStore
+    from catalog_image_module import ImageBackedContentStore
+
+    rss_before, anonymous_before = _memory_kib()
+    start = time.perf_counter()
+    if kind == "json":
+        with open(curriculum_path) as f:
+            curriculum = json.load(f)
+        with open(content_path) as f:
+            content = json.load(f)
+        store = CurriculumContentStore(curriculum, content)
+    else:
+        store = ImageBackedContentStore.open(image_path)
+    for lo_id in lo_ids:
+        store.get_content_for_lo(lo_id)
+    seconds = time.perf_counter() - start
+    rss_after, anonymous_after = _memory_kib()
+    return seconds, rss_after - rss_before, anonymous_after - anonymous_before
+
+def benchmark_catalog_image(lo_count=5_000, content_per_lo=20, workers=4):
+    """Worker cold start and memory: JSON parse + dict store versus an mmap'd compiled catalog image."""
+    import json
+    import multiprocessing
+    from curriculum_content_module import CurriculumContentStore
+    from catalog_image_module import ImageBackedContentStore, compile_catalog_image
+
+    print(f"\n[catalog_image] {lo_count:,} LOs x {content_per_lo} content items, {workers} worker processes")
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    rng = random.Random(42)
+    lo_ids = [rng.choice(curriculum["learning_objectives"])["id"] for _ in range(100)]
+    with tempfile.TemporaryDirectory() as directory:
+        curriculum_path = os.path.join(directory, "bench_curriculum.json")
+        content_path = os.path.join(directory, "bench_content.json")
+        image_path = os.path.join(directory, "bench.dalacat")
+        with open(curriculum_path, "w") as f:
+            json.dump(curriculum, f)
+        with open(content_path, "w") as f:
+            json.dump(content, f)
+        start = time.perf_counter()
+        image_size = compile_catalog_image(curriculum, content, image_path)
+        _report("compile image", time.perf_counter() - start, len(content), unit="item")
+        json_size = os.path.getsize(curriculum_path) + os.path.getsize(content_path)
+        print(f"  {'  JSON vs image bytes':<48} {json_size / 1e6:9.1f} / {image_size / 1e6:.1f} MB")
+
+        context = multiprocessing.get_context("spawn")
+        for kind in ("json", "image"):
+            with context.Pool(workers) as pool:
+                results = pool.starmap(_catalog_worker_start, [(kind, curriculum_path, content_path, image_path, lo_ids)] * workers)
+            mean_seconds = sum(result[0] for result in results) / workers
+            mean_rss_mib = sum(result[1] for result in results) / workers / 1024
+            mean_private_mib = sum(result[2] for result in results) / workers / 1024
+            print(f"  {kind + ' worker cold start (mean)':<48} {mean_seconds * 1000:9.1f} ms, +{mean_rss_mib:.1f} MiB RSS "
+                  f"(+{mean_private_mib:.1f} MiB private) per worker")
+
+        json_store = CurriculumContentStore(curriculum, content)
+        image_store = ImageBackedContentStore.open(image_path)
+        content_ids = [rng.choice(content)["content_id"] for _ in range(100_000)]
+        for label, store in (("get_content_by_id (dict)", json_store), ("get_content_by_id (image)", image_store)):
+            start = time.perf_counter()
+            for content_id in content_ids:
+                store.get_content_by_id(content_id)
+            _report(label, time.perf_counter() - start, len(content_ids), unit="lookup")
+        image_store.close()
+
+def benchmark_curriculum_search(item_count=100_000, lo_count=2_000, vocabulary_size=5_000, queries=500):
+    """BM25 index build, query latency and incremental adds on a library with a Zipf-distributed vocabulary."""
+    from curriculum_search_module import build_search_index
+
+    print(f"\n[curriculum_search] {item_count:,} content items + {lo_count:,} LOs, {vocabulary_size:,}-word vocabulary")
+    rng = random.Random(42)
+    vocabulary = [f"w{rank}" for rank in range(vocabulary_size)]
+    cumulative_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary_size)))
+
+    def text(words):
+        return " ".join(rng.choices(vocabulary, cum_weights=cumulative_weights, k=words))
+
+    learning_objectives = [{"id": f"LO{i:05d}", "description": text(20), "keywords": [text(2) for _ in range(3)]} for i in range(lo_count)]
+    content = [{"content_id": f"C{i:06d}", "title": text(6)} for i in range(item_count)]
+    start = time.perf_counter()
+    index = build_search_index(learning_objectives, content)
+    _report("build index", time.perf_counter() - start, lo_count + item_count, unit="document")
+
+    for label, words in (("2-word query (mid-frequency words)", 2), ("3-word query", 3)):
+        query_texts = [" ".join(rng.sample(vocabulary[10:2_000], words)) for _ in range(queries)]
+        latencies = []
+        for query in query_texts:
+            start = time.perf_counter()
+            index.search(query, limit=10)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"  {label:<48} p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms")
+    common = [" ".join(vocabulary[:3])] * 20
+    start = time.perf_counter()
+    for query in common:
+        index.search(query, limit=10)
+    print(f"  {'3 most common words (worst case)':<48} {(time.perf_counter() - start) / len(common) * 1000:9.2f} ms/query")
+
+    start = time.perf_counter()
+    for i in range(10_000):
+        index.add_content({"content_id": f"NEW{i:05d}", "title": text(6)})
+    _report("incremental add_content", time.perf_counter() - start, 10_000, unit="item")
+
+def benchmark_versioned_reload(lo_count=500, content_per_lo=20, readers=4, duration=2.0, reload_interval=0.1):
+    """Pathway generation throughput while reloads publish new snapshots, and reload-to-publish latency."""
+    from curriculum_content_module import CurriculumContentStore
+    from dcw_apg_module import PathwayGenerator
+    from versioned_store_module import VersionedContentStore
+
+    print(f"\n[versioned_reload] {lo_count} LOs x {content_per_lo} content items, {readers} reader threads, reload every {reload_interval * 1000:.0f} ms")
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+
+    def tagged_content(generation):
+        # Every item carries its generation, so a pathway mixing snapshots is detectable
+        return [dict(item, url_path=f"{item['url_path']}?v={generation}") for item in content]
+
+    versioned_store = VersionedContentStore(CurriculumContentStore(curriculum, tagged_content(0)))
+    lo_ids = [lo["id"] for lo in curriculum["learning_objectives"]]
+    rng = random.Random(42)
+    profiles = []
+    for i in range(50):
+        profile = LearnerProfile(f"bench_student_{i}")
+        profile.completed_los = set(rng.sample(lo_ids, lo_count // 4))
+        profiles.append(profile)
+
+    def run_readers(reload_during):
+        stop = threading.Event()
+        counts = [0] * readers
+        mixed = [0]
+        versions_seen = set()
+
+        def reader(slot):
+            local_rng = random.Random(slot)
+            while not stop.is_set():
+                generator = PathwayGenerator(local_rng.choice(profiles), versioned_store)
+                pathway = generator.generate_pathway_with_prerequisites(max_los=5, max_activities_per_lo=3)
+                generations = {item["url_path"].rsplit("?v=", 1)[1] for _, items in pathway for item in items}
+                if len(generations) > 1:
+                    mixed[0] += 1
+                versions_seen.update(generations)
+                counts[slot] += 1
+
+        threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+        reload_latencies = []
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        generation = 0
+        while time.perf_counter() - start < duration:
+            time.sleep(reload_interval)
+            if reload_during:
+                generation += 1
+                reload_data = tagged_content(generation)
+                reload_start = time.perf_counter()
+                versioned_store.reload(curriculum, reload_data)
+                reload_latencies.append(time.perf_counter() - reload_start)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return sum(counts), time.perf_counter() - start, mixed[0], len(versions_seen), reload_latencies
+
+    with _quiet():
+        pathways, elapsed, _, _, _ = run_readers(reload_during=False)
+    _report("pathways, no reloads", elapsed, pathways, unit="pathway")
+    with _quiet():
+        pathways, elapsed, mixed, versions_seen, reload_latencies = run_readers(reload_during=True)
+    _report("pathways, during reloads", elapsed, pathways, unit="pathway")
+    reload_latencies.sort()
+    print(f"  {'reload (build + index + publish)':<48} p50 {reload_latencies[len(reload_latencies) // 2] * 1000:6.2f} ms, max {reload_latencies[-1] * 1000:6.2f} ms over {len(reload_latencies)} reloads")
+    print(f"  {'pathways mixing two snapshots':<48} {mixed} (versions seen by readers: {versions_seen})")
+
+def _peak_rss_kib():
+    """The process's peak resident memory in KiB (VmHWM: unlike ru_maxrss, not inherited across exec; 0 off Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def _content_loader_worker(kind, curriculum_path, content_path):
+    """Loads a store one way in a fresh process; returns (seconds, peak RSS growth in KiB)."""
+    import json
+    from curriculum_content_module import CurriculumContentStore
+
+    peak_before = _peak_rss_kib()
+    start = time.perf_counter()
+    if kind == "json.load":
+        with open(curriculum_path) as f:
+            curriculum = json.load(f)
+        with open(content_path) as f:
+            content = json.load(f)
+        store = CurriculumContentStore(curriculum, content)
+    elif kind == "from_json_files":
+        store = CurriculumContentStore.from_json_files(curriculum_path, content_path)
+    else:
+        store = CurriculumContentStore.from_jsonl(curriculum_path, content_path)
+    seconds = time.perf_counter() - start
+    assert store.content_library
+    return seconds, _peak_rss_kib() - peak_before
+
+def benchmark_content_loader(lo_count=5_000, content_per_lo=40):
+    """Building a store from files: whole-document json.load versus the streaming, validating loaders."""
+    import json
+    import multiprocessing
+
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    print(f"\n[content_loader] {lo_count:,} LOs x {content_per_lo} content items ({len(content):,} items), each load in a fresh process")
+    with tempfile.TemporaryDirectory() as directory:
+        curriculum_path = os.path.join(directory, "bench_curriculum.json")
+        content_path = os.path.join(directory, "bench_content.json")
+        jsonl_path = os.path.join(directory, "bench_content.jsonl")
+        with open(curriculum_path, "w") as f:
+            json.dump(curriculum, f, indent=4)
+        with open(content_path, "w") as f:
+            json.dump(content, f, indent=4)  # As save_to_json writes it
+        with open(jsonl_path, "w") as f:
+            for item in content:
+                f.write(json.dumps(item) + "\n")
+        print(f"  {'content file (indent=4 JSON / JSONL)':<48} {os.path.getsize(content_path) / 1e6:9.1f} / {os.path.getsize(jsonl_path) / 1e6:.1f} MB")
+        context = multiprocessing.get_context("spawn")
+        for kind, path in (("json.load", content_path), ("from_json_files", content_path), ("from_jsonl", jsonl_path)):
+            with context.Pool(1) as pool:
+                seconds, peak_kib = pool.apply(_content_loader_worker, (kind, curriculum_path, path))
+            print(f"  {kind:<48} {seconds * 1000:9.1f} ms, peak RSS +{peak_kib / 1024:.1f} MiB")
+
+def benchmark_catalog_export(lo_count=5_000, content_per_lo=40):
+    """File size, write time and load time: save_to_json (indent=4) versus compact, atomic, checksummed exports."""
+    from curriculum_content_module import CurriculumContentStore
+
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    store = CurriculumContentStore(curriculum, content)
+    print(f"\n[catalog_export] {lo_count:,} LOs x {content_per_lo} content items ({len(content):,} items)")
+    with tempfile.TemporaryDirectory() as directory:
+        curriculum_path = os.path.join(directory, "bench_curriculum.json")
+        content_path = os.path.join(directory, "bench_content.json")
+        start = time.perf_counter()
+        with _quiet():
+            store.save_to_json(curriculum_path, content_path)
+        seconds = time.perf_counter() - start
+        baseline_bytes = os.path.getsize(curriculum_path) + os.path.getsize(content_path)
+        print(f"  {'save_to_json (indent=4)':<36} {baseline_bytes / 1e6:8.1f} MB  write {seconds * 1000:7.0f} ms")
+        for content_format, suffix, compresslevel in (("json", "", None), ("jsonl", "", None), ("json", ".gz", 6), ("json", ".gz", None),
+                                                      ("jsonl", ".gz", 6), ("json", ".xz", None)):
+            label = f"export {content_format}{suffix}" + (f" (level {compresslevel})" if compresslevel is not None else "")
+            curriculum_path = os.path.join(directory, f"export_curriculum.json{suffix}")
+            content_path = os.path.join(directory, f"export_content.{content_format}{suffix}")
+            start = time.perf_counter()
+            store.export(curriculum_path, content_path, content_format=content_format, compresslevel=compresslevel)
+            write_seconds = time.perf_counter() - start
+            size = os.path.getsize(curriculum_path) + os.path.getsize(content_path)
+            load = CurriculumContentStore.from_json_files if content_format == "json" else CurriculumContentStore.from_jsonl
+            start = time.perf_counter()
+            load(curriculum_path, content_path)
+            load_seconds = time.perf_counter() - start
+            print(f"  {label:<36} {size / 1e6:8.1f} MB  write {write_seconds * 1000:7.0f} ms  load + verify {load_seconds * 1000:6.0f} ms"
+                  f"  ({baseline_bytes / size:.1f}x smaller)")
+
+def benchmark_pathway_cache(lo_count=500, content_per_lo=20, students=1_000, renders=20_000, change_rate=0.1):
+    """Page renders of generate_initial_pathway with and without the pathway cache, students occasionally completing LOs."""
+    import events_module
+    from events_module import FanOutEventSink
+    from curriculum_content_module import CurriculumContentStore
+    from dcw_apg_module import PathwayGenerator
+    from pathway_cache_module import PathwayCache
+
+    print(f"\n[pathway_cache] {lo_count} LOs x {content_per_lo} content items, {students:,} students, "
+          f"{renders:,} renders, {change_rate:.0%} preceded by a completed LO")
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    store = CurriculumContentStore(curriculum, content)
+    store.content_index
+    lo_ids = [lo["id"] for lo in curriculum["learning_objectives"]]
+
+    def workload(seed):
+        rng = random.Random(seed)
+        profiles = []
+        for i in range(students):
+            profile = CompactLearnerProfile.for_store(f"bench_student_{i}", store)
+            profile.completed_lo_mask = store.lo_index.mask_for(rng.sample(lo_ids, lo_count // 4))
+            profile.update_preference("visual_task_1", rng.choice(["visual", "other"]))
+            profiles.append(profile)
+        # Most renders come from a minority of active students
+        return profiles, [(rng.choice(profiles[:students // 5] if rng.random() < 0.8 else profiles), rng.random() < change_rate, rng.choice(lo_ids))
+                          for _ in range(renders)]
+
+    for label, cache in (("uncached", None), ("cached", PathwayCache(max_entries=students, ttl_seconds=300))):
+        profiles, requests = workload(42)
+        previous_sink = events_module.set_event_sink(FanOutEventSink(cache) if cache is not None else None)
+        elapsed = 0.0
+        with _quiet():
+            for profile, completes_lo, lo_id in requests:
+                if completes_lo:
+                    profile.mark_lo_completed(lo_id)
+                start = time.perf_counter()
+                PathwayGenerator(profile, store, pathway_cache=cache).generate_initial_pathway(target_lo_count=3, max_activities_per_lo=2)
+                elapsed += time.perf_counter() - start
+        events_module.set_event_sink(previous_sink)
+        _report(f"generate_initial_pathway ({label})", elapsed, renders, unit="render")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"  {'  hit rate / invalidations / entries':<48} {stats['hit_rate']:8.1%} / {stats['invalidations']:,} / {stats['entries']:,}")
+
+def benchmark_batch_pathways(lo_count=200, content_per_lo=10, class_sizes=(30, 300, 3_000), repeats=5):
+    """Pathways for a whole class: one PathwayGenerator per student versus generate_pathways()."""
+    import batch_pathway_module
+    from batch_pathway_module import generate_pathways
+    from curriculum_content_module import CurriculumContentStore
+    from dcw_apg_module import PathwayGenerator, pathway_rng
+    from performance_feedback_module import PerformanceTracker
+
+    print(f"\n[batch_pathways] {lo_count} LOs x {content_per_lo} content items, classes of {', '.join(f'{size:,}' for size in class_sizes)}")
+    curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+    store = CurriculumContentStore(curriculum, content)
+    store.content_index
+    lo_ids = [lo["id"] for lo in curriculum["learning_objectives"]]
+    rng = random.Random(42)
+    tracker = PerformanceTracker()
+    profiles = []
+    for i in range(max(class_sizes)):
+        profile = CompactLearnerProfile.for_store(f"bench_student_{i}", store)
+        # A class works through the curriculum roughly together
+        profile.completed_lo_mask = store.lo_index.mask_for(lo_ids[:rng.randint(lo_count // 4, lo_count // 2)])
+        profile.update_preference("visual_task_1", rng.choice(["visual", "other"]))
+        profile.update_preference("textual_task_1", rng.choice(["detailed_text", "other"]))
+        for _ in range(3):
+            tracker.ingest(profile.student_id, rng.choice(lo_ids), rng.choice(["video", "game"]), rng.random(), 60, timestamp=0)
+        profiles.append(profile)
+
+    version = store.version
+    for size in class_sizes:
+        class_profiles = profiles[:size]
+        for label, performance_tracker in (("", None), (", with tracker", tracker)):
+            with _quiet():
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    for profile in class_profiles:
+                        PathwayGenerator(profile, store, performance_tracker).generate_pathway_with_prerequisites(rng=pathway_rng(profile.student_id, version))
+                per_student = time.perf_counter() - start
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    generate_pathways(class_profiles, store, performance_tracker)
+                batched = time.perf_counter() - start
+            _report(f"{size:,} students, per-student generators{label}", per_student, size * repeats, unit="student")
+            _report(f"{size:,} students, generate_pathways{label}", batched, size * repeats, unit="student")
+        if batch_pathway_module.np is not None:
+            masks = [store.prerequisite_graph.completed_mask(profile) for profile in class_profiles]
+            start = time.perf_counter()
+            for _ in range(repeats):
+                batch_pathway_module.available_lo_matrix(store.prerequisite_graph, lo_ids, masks)
+            _report(f"{size:,} students, available_lo_matrix only", time.perf_counter() - start, size * repeats, unit="student")
+
+def benchmark_topic_planner(lo_counts=(1_000, 5_000, 20_000), content_per_lo=4, repeats=5):
+    """plan_topic_pathway over large topics: LO order alone per tie-break, and with content selected for every LO."""
+    from curriculum_content_module import CurriculumContentStore
+    from dcw_apg_module import PathwayGenerator, TIE_BREAK_CURRICULUM, TIE_BREAK_MASTERY, TIE_BREAK_RANDOM, TIE_BREAK_UNLOCKS
+    from performance_feedback_module import PerformanceTracker
+
+    for lo_count in lo_counts:
+        print(f"\n[topic_planner] {lo_count:,} LOs x {content_per_lo} content items, a quarter completed")
+        curriculum, content = _make_synthetic_curriculum(lo_count, content_per_lo)
+        store = CurriculumContentStore(curriculum, content)
+        store.content_index
+        lo_ids = [lo["id"] for lo in curriculum["learning_objectives"]]
+        rng = random.Random(42)
+        profile = CompactLearnerProfile.for_store("bench_student_0", store)
+        profile.completed_lo_mask = store.lo_index.mask_for(lo_ids[:lo_count // 4])
+        tracker = PerformanceTracker()
+        for lo_id in rng.sample(lo_ids, lo_count // 10):
+            tracker.ingest(profile.student_id, lo_id, "video", rng.random(), 60, timestamp=0)
+        generator = PathwayGenerator(profile, store, tracker)
+        start = time.perf_counter()
+        with _quiet():
+            generator.generate_pathway_with_prerequisites(max_los=lo_count)
+        _report("generate_pathway_with_prerequisites (ready LOs only)", time.perf_counter() - start, 1, unit="call")
+        for tie_break in (TIE_BREAK_CURRICULUM, TIE_BREAK_MASTERY, TIE_BREAK_RANDOM, TIE_BREAK_UNLOCKS):
+            start = time.perf_counter()
+            with _quiet():
+                for _ in range(repeats):
+                    plan = generator.plan_topic_pathway(tie_break, max_activities_per_lo=0, rng=random.Random(0))
+            _report(f"plan_topic_pathway ({tie_break}, {len(plan):,} LOs, no content)", time.perf_counter() - start, repeats, unit="plan")
+        start = time.perf_counter()
+        with _quiet():
+            generator.plan_topic_pathway(max_activities_per_lo=2)
+        _report("plan_topic_pathway (curriculum, 2 activities per LO)", time.perf_counter() - start, 1, unit="plan")
+
+BENCHMARKS = {
+    "badge_checks": benchmark_badge_checks,
+    "badge_backfill": benchmark_badge_backfill,
+    "profile_memory": benchmark_profile_memory,
+    "profile_repository": benchmark_profile_repository,
+    "profile_serialization": benchmark_profile_serialization,
+    "profile_delta_writes": benchmark_profile_delta_writes,
+    "interaction_replay": benchmark_interaction_replay,
+    "cohort_assessment": benchmark_cohort_assessment,
+    "async_sessions": benchmark_async_sessions,
+    "performance_ingestion": benchmark_performance_ingestion,
+    "curriculum_catalog": benchmark_curriculum_catalog,
+    "content_selection": benchmark_content_selection,
+    "prerequisite_graph": benchmark_prerequisite_graph,
+    "catalog_image": benchmark_catalog_image,
+    "curriculum_search": benchmark_curriculum_search,
+    "versioned_reload": benchmark_versioned_reload,
+    "content_loader": benchmark_content_loader,
+    "catalog_export": benchmark_catalog_export,
+    "pathway_cache": benchmark_pathway_cache,
+    "batch_pathways": benchmark_batch_pathways,
+    "topic_planner": benchmark_topic_planner,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run DALA prototype performance benchmarks.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Catalog Image Module
+
+This module contains the logic for:
+1.  Compiling curriculum/content JSON into a read-only binary catalog image (compile_catalog_image).
+2.  Opening an image with mmap (CatalogImage) and looking up LOs, content items and an LO's content
+    without parsing the rest of the catalog.
+3.  ImageBackedContentStore, a CurriculumContentStore served from an image, for worker processes.
+
+Every process that opens the same image maps the same file, so the encoded records are held once
+in the OS page cache instead of once per worker as Python dicts, and opening it costs a header read
+rather than a JSON parse. Records are marshal-encoded inside the image (marshal decodes about twice
+as fast as JSON and, unlike pickle, cannot run code) and are decoded one at a time when looked up,
+straight from a memoryview of the mapping. Decoded values are ordinary per-process objects, and
+the derived indexes (prerequisite graph, content index, search index) are still built in each
+process on first use; only the prerequisite graph is validated when the image is compiled.
+
+Image layout (format version 1), little-endian, after the 7-byte magic b"DALACAT", a version byte,
+the marshal version of the records and 7 padding bytes:
+    meta_offset, meta_length                          u64, u64 (JSON: curriculum fields, prerequisites)
+    3 table descriptors (LOs, content, LO -> content IDs), each:
+        records_offset, record_count, slots_offset, slot_count     u64 x 4
+    record entry    offset u64, key_length u32, value_length u32 (UTF-8 key then marshal value at offset)
+    slots           u32 record number + 1 (0 = empty); open addressing on zlib.crc32(key), linear probing
+Records keep source order, so iterating a table follows curriculum / library order.
+"""
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+
+from content_export_module import AtomicWriter, JSON_FORMAT, JSONL_FORMAT
+from content_loader_module import iter_json_array, iter_jsonl, load_catalog
+from curriculum_content_module import CurriculumContentStore, LearningObjectiveIndex, PrerequisiteGraph, DEFAULT_LO_INDEX, DIFFICULTY_ORDER
+
+MAGIC = b"DALACAT"
+FORMAT_VERSION = 1
+
+# A shard's image sits beside its JSON files as <shard>.dalacat (see curriculum_catalog_module)
+IMAGE_SUFFIX = ".dalacat"
+
+_HEADER = struct.Struct("<7sBB7xQQ")
+_MARSHAL_VERSION = 4
+_TABLE = struct.Struct("<QQQQ")
+_RECORD = struct.Struct("<QII")
+_SLOT = struct.Struct("<I")
+_TABLE_COUNT = 3  # LOs, content, LO -> content IDs
+
+class CatalogImageError(ValueError):
+    """Raised when a catalog image is malformed or uses an unknown format version."""
+
+# --- Compiling ---
+def _pack_table(out, entries):
+    """Appends one table's records, record entries and hash slots to out; returns its descriptor."""
+    records = []
+    for key, value in entries:
+        key_bytes = key.encode("utf-8")
+        value_bytes = marshal.dumps(value, _MARSHAL_VERSION)
+        records.append((len(out), key_bytes, len(value_bytes)))
+        out += key_bytes
+        out += value_bytes
+    slot_count = 1
+    while slot_count < 2 * len(records):
+        slot_count <<= 1
+    slots = [0] * slot_count
+    mask = slot_count - 1
+    for number, (_, key_bytes, _) in enumerate(records):
+        slot = zlib.crc32(key_bytes) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = number + 1
+    out += bytes(-len(out) % 8)
+    records_offset = len(out)
+    for offset, key_bytes, value_length in records:
+        out += _RECORD.pack(offset, len(key_bytes), value_length)
+    slots_offset = len(out)
+    out += struct.pack(f"<{slot_count}I", *slots)
+    return (records_offset, len(records), slots_offset, slot_count)
+
+def build_catalog_image(curriculum_data, content_data):
+    """Returns the image bytes for a curriculum slice and its content.
+
+    Raises PrerequisiteGraphError if the prerequisites are invalid, as CurriculumContentStore would.
+    """
+    learning_objectives = curriculum_data.get("learning_objectives", [])
+    PrerequisiteGraph(learning_objectives, LearningObjectiveIndex())  # Validation only
+    content_library = {item["content_id"]: item for item in content_data}
+    lo_to_content = {}
+    for item in content_data:
+        for lo_id in item["learning_objectives_covered"]:
+            lo_to_content.setdefault(lo_id, []).append(item["content_id"])
+    meta = {
+        "curriculum": {key: value for key, value in curriculum_data.items() if key != "learning_objectives"},
+        "prerequisites": [[lo["id"], lo.get("prerequisites") or []] for lo in learning_objectives],
+    }
+    out = bytearray(_HEADER.size + _TABLE_COUNT * _TABLE.size)
+    meta_offset = len(out)
+    out += json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    meta_length = len(out) - meta_offset
+    tables = [
+        _pack_table(out, ((lo["id"], lo) for lo in learning_objectives)),
+        _pack_table(out, content_library.items()),
+        _pack_table(out, lo_to_content.items()),
+    ]
+    _HEADER.pack_into(out, 0, MAGIC, FORMAT_VERSION, _MARSHAL_VERSION, meta_offset, meta_length)
+    for number, table in enumerate(tables):
+        _TABLE.pack_into(out, _HEADER.size + number * _TABLE.size, *table)
+    return bytes(out)
+
+def compile_catalog_image(curriculum_data, content_data, image_path):
+    """Writes the image for a curriculum slice to image_path (atomically). Returns its size in bytes."""
+    return _write_image(build_catalog_image(curriculum_data, content_data), image_path)
+
+def _write_image(image, image_path):
+    # Images are mmapped when opened, so they are never compressed, whatever the suffix
+    with AtomicWriter(image_path, compress=False) as f:
+        f.write(image)
+    return len(image)
+
+def compile_catalog_image_from_files(curriculum_path, content_path, image_path, content_format=JSON_FORMAT):
+    """compile_catalog_image for a <shard>_curriculum.json / <shard>_content.json pair.
+
+    The files are read as CurriculumContentStore.from_json_files() (or, for JSONL_FORMAT content,
+    from_jsonl()) reads them: records are validated, .gz/.xz files are decompressed and a recorded
+    content checksum is verified, so an image never holds records the JSON path would reject.
+    Raises content_loader_module.ContentValidationError listing every problem found.
+    """
+    iter_records = iter_jsonl if content_format == JSONL_FORMAT else iter_json_array
+    def build(curriculum_data, content_items):
+        return build_catalog_image(curriculum_data, list(content_items))
+    image = load_catalog(curriculum_path, content_path, iter_records, build, DIFFICULTY_ORDER)
+    return _write_image(image, image_path)
+
+# --- Reading ---
+class _ImageTable(Mapping):
+    """Read-only mapping over one image table; values are decoded from the image on each lookup."""
+    def __init__(self, image, descriptor):
+        self._image = image
+        self._records_offset, self._record_count, self._slots_offset, slot_count = descriptor
+        self._slot_mask = slot_count - 1
+
+    def _record(self, number):
+        return _RECORD.unpack_from(self._image._view, self._records_offset + number * _RECORD.size)
+
+    def _find(self, key):
+        """Returns (value_offset, value_length) for key, or None."""
+        key_bytes = key.encode("utf-8")
+        view = self._image._view
+        slot = zlib.crc32(key_bytes) & self._slot_mask
+        while True:
+            number = _SLOT.unpack_from(view, self._slots_offset + 4 * slot)[0]
+            if not number:
+                return None
+            offset, key_length, value_length = self._record(number - 1)
+            if key_length == len(key_bytes) and view[offset:offset + key_length] == key_bytes:
+                return offset + key_length, value_length
+            slot = (slot + 1) & self._slot_mask
+
+    def __getitem__(self, key):
+        location = self._find(key) if isinstance(key, str) else None
+        if location is None:
+            raise KeyError(key)
+        offset, length = location
+        return marshal.loads(self._image._view[offset:offset + length])
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __len__(self):
+        return self._record_count
+
+    def __iter__(self):
+        view = self._image._view
+        for number in range(self._record_count):
+            offset, key_length, _ = self._record(number)
+            yield str(view[offset:offset + key_length], "utf-8")
+
+    def values(self):
+        """Decodes every value, in record (source) order."""
+        view = self._image._view
+        for number in range(self._record_count):
+            offset, key_length, value_length = self._record(number)
+            yield marshal.loads(view[offset + key_length:offset + key_length + value_length])
+
+class CatalogImage:
+    """A compiled catalog image opened read-only with mmap; lookups read records through a memoryview."""
+    def __init__(self, image_path):
+        self.path = image_path
+        with open(image_path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._buffer)  # Slicing a memoryview does not copy
+        try:
+            self._read_header()
+        except (struct.error, ValueError) as e:
+            self.close()
+            raise CatalogImageError(f"Corrupt catalog image {image_path}: {e}") from e
+
+    def _read_header(self):
+        buffer = self._buffer
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise CatalogImageError(f"{self.path} is not a DALA catalog image")
+        _, version, marshal_version, meta_offset, meta_length = _HEADER.unpack_from(buffer, 0)
+        if version != FORMAT_VERSION:
+            raise CatalogImageError(f"Unsupported catalog image format version {version} (newest known: {FORMAT_VERSION})")
+        if marshal_version > marshal.version:
+            raise CatalogImageError(f"Catalog image records use marshal version {marshal_version}; recompile it for this Python")
+        descriptors = [_TABLE.unpack_from(buffer, _HEADER.size + number * _TABLE.size) for number in range(_TABLE_COUNT)]
+        for records_offset, record_count, slots_offset, slot_count in descriptors:
+            if slot_count & (slot_count - 1) or records_offset + record_count * _RECORD.size > len(buffer) \
+                    or slots_offset + 4 * slot_count > len(buffer):
+                raise CatalogImageError(f"Truncated catalog image {self.path}")
+        self.meta = json.loads(buffer[meta_offset:meta_offset + meta_length])
+        self.learning_objectives, self.content, self.lo_content_ids = (_ImageTable(self, descriptor) for descriptor in descriptors)
+
+    def close(self):
+        self._view.release()
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ImageBackedContentStore(CurriculumContentStore):
+    """A CurriculumContentStore served from a CatalogImage.
+
+    content_library, lo_details_map and lo_to_content_map are read-only mappings over the image. The
+    LO list, prerequisite graph, content index and search index are built in-process on first use.
+    """
+    def __init__(self, image, lo_index=None):
+        self.image = image
+        self.content_library = image.content
+        self.lo_details_map = image.learning_objectives
+        self.lo_to_content_map = image.lo_content_ids
+        self._learning_objectives = None
+        self._prerequisite_graph = None
+        self._content_index = None
+        self._search_index = None
+        self._version = None
+        self._frozen = True
+        self.lo_index = lo_index if lo_index is not None else DEFAULT_LO_INDEX
+        # Registered in curriculum order, as CurriculumContentStore does, so LO bitsets line up across processes
+        for lo_id, _ in image.meta["prerequisites"]:
+            self.lo_index.index_of(lo_id)
+
+    @classmethod
+    def open(cls, image_path, lo_index=None):
+        return cls(CatalogImage(image_path), lo_index)
+
+    @property
+    def version(self):
+        """A digest of the image file (the same image gives the same version in every process)."""
+        if self._version is None:
+            self._version = hashlib.sha256(self.image._buffer).hexdigest()[:16]
+        return self._version
+
+    @property
+    def curriculum(self):
+        return dict(self.image.meta["curriculum"], learning_objectives=self.get_learning_objectives())
+
+    @property
+    def prerequisite_graph(self):
+        if self._prerequisite_graph is None:
+            learning_objectives = [{"id": lo_id, "prerequisites": prerequisites} for lo_id, prerequisites in self.image.meta["prerequisites"]]
+            self._prerequisite_graph = PrerequisiteGraph(learning_objectives, self.lo_index)
+        return self._prerequisite_graph
+
+    def get_learning_objectives(self):
+        if self._learning_objectives is None:
+            self._learning_objectives = list(self.lo_details_map.values())
+        return self._learning_objectives
+
+    def get_lo_by_id(self, lo_id):
+        return self.lo_details_map.get(lo_id)
+
+    def get_content_for_lo(self, lo_id):
+        items = (self.content_library.get(content_id) for content_id in self.lo_to_content_map.get(lo_id, ()))
+        return [item for item in items if item is not None]
+
+    def add_content(self, item):
+        raise TypeError("Catalog images are read-only; add content to the JSON and recompile the image")
+
+    def with_content_changes(self, added=(), removed_content_ids=(), version=None):
+        raise TypeError("Catalog images are read-only; add content to the JSON and recompile the image")
+
+    def close(self):
+        self.image.close()
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from curriculum_content_module import CURRICULUM_SLICE, LEARNING_CONTENT_SET
+
+    print("--- DALA Catalog Image Demo ---")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, "year4_maths_multi_div.dalacat")
+        size = compile_catalog_image(CURRICULUM_SLICE, LEARNING_CONTENT_SET, image_path)
+        print(f"Compiled {image_path} ({size} bytes)")
+        start = time.perf_counter()
+        store = ImageBackedContentStore.open(image_path)
+        print(f"Opened in {(time.perf_counter() - start) * 1000:.2f} ms")
+        print(f"Y4MD_LO4: {store.get_lo_by_id('Y4MD_LO4')['description'][:60]}...")
+        print(f"Content for Y4MD_LO2: {[item['title'] for item in store.get_content_for_lo('Y4MD_LO2')]}")
+        print(f"Prerequisite chain for Y4MD_LO4: {store.prerequisite_graph.prerequisite_chain('Y4MD_LO4')}")
+        print(f"Visual content up to medium: {[item['content_id'] for item in store.query_content(max_difficulty='medium', preference='visual')]}")
+        store.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Cohort Assessment Module
+
+This module contains the logic for:
+1.  Running the full HLP assessment for a whole cohort (e.g. a school at the start of term),
+    fanned out over a process pool.
+2.  Deterministic per-student seeding, so a cohort run gives identical profiles for any worker count.
+3.  Streaming the finished profiles to a sink in batches (e.g. ProfileRepository.save_many) and
+    reporting throughput.
+
+Each student's tasks draw from random.Random(student_seed(cohort_seed, student_id)) and every badge
+award and metric history entry in the run is stamped with the same assessed_at time (see
+hlp_module.set_badge_clock and set_metric_clock), so results depend only on the cohort seed, the
+student IDs and assessed_at. Profiles reach the sink in
+student_ids order whatever the worker count.
+
+Worker processes install a NullEventSink; a single-worker run installs one (and the pinned clocks)
+only while each batch is assessed, so code consuming the batches sees its own sink and clocks. With the "spawn" or "forkserver" start methods they also
+start from the module-level BADGE_DEFINITIONS, so badges added with register_badge_definitions in
+the parent are only seen by forked workers.
+"""
+
+import datetime
+import multiprocessing
+import os
+import random
+import time
+from collections import namedtuple
+
+import events_module
+import hlp_module
+from hlp_module import run_full_hlp_assessment
+
+class CohortRunReport(namedtuple("CohortRunReport", ["students", "workers", "seconds", "batches"])):
+    """Summary of a cohort run."""
+    __slots__ = ()
+
+    @property
+    def students_per_second(self):
+        return self.students / self.seconds if self.seconds else float("inf")
+
+    def describe(self):
+        return (f"Assessed {self.students:,} students with {self.workers} worker(s) in {self.seconds:.2f}s "
+                f"({self.students_per_second:,.0f} students/sec, {self.batches} batches)")
+
+def student_seed(cohort_seed, student_id):
+    """The RNG seed for one student's assessment; independent of scheduling and worker count."""
+    return f"{cohort_seed}:{student_id}"
+
+def assess_student(student_id, cohort_seed=0):
+    """Runs one student's full HLP assessment with their deterministic RNG."""
+    return run_full_hlp_assessment(student_id, rng=random.Random(student_seed(cohort_seed, student_id)))
+
+def _install_clocks(assessed_at):
+    """Pins badge award and metric history timestamps to assessed_at; returns the previous clocks."""
+    assessed_at_seconds = datetime.datetime.fromisoformat(assessed_at.rstrip("Z")).replace(
+        tzinfo=datetime.timezone.utc).timestamp()
+    return (hlp_module.set_badge_clock(lambda: assessed_at),
+            hlp_module.set_metric_clock(lambda: assessed_at_seconds))
+
+def _restore_clocks(previous_clocks):
+    badge_clock, metric_clock = previous_clocks
+    hlp_module.set_badge_clock(badge_clock)
+    hlp_module.set_metric_clock(metric_clock)
+
+def _init_worker(assessed_at):
+    events_module.set_event_sink(None)
+    _install_clocks(assessed_at)
+
+def _assess_batch(batch):
+    student_ids, cohort_seed = batch
+    return [assess_student(student_id, cohort_seed) for student_id in student_ids]
+
+def _assess_batch_in_process(batch, assessed_at):
+    """Assesses one batch in this process the way a worker would, restoring the sink and clocks afterwards."""
+    previous_sink = events_module.set_event_sink(None)
+    previous_clocks = _install_clocks(assessed_at)
+    try:
+        return _assess_batch(batch)
+    finally:
+        _restore_clocks(previous_clocks)
+        events_module.set_event_sink(previous_sink)
+
+def iter_cohort_assessment(student_ids, workers=None, cohort_seed=0, assessed_at=None, batch_size=256, mp_context=None):
+    """Yields batches (lists) of assessed profiles in student_ids order.
+
+    workers=None uses os.cpu_count(); workers=1 runs in this process. assessed_at (an ISO timestamp
+    ending in "Z") stamps every badge award and metric history entry; it defaults to the time the run starts.
+    """
+    if assessed_at is None:
+        assessed_at = hlp_module.utc_timestamp()
+    workers = workers or os.cpu_count() or 1
+    student_ids = list(student_ids)
+    batches = [(student_ids[start:start + batch_size], cohort_seed) for start in range(0, len(student_ids), batch_size)]
+
+    if workers == 1:
+        # Pinned per batch, not across yields: between batches the consumer runs with its own sink and clocks
+        for batch in batches:
+            yield _assess_batch_in_process(batch, assessed_at)
+        return
+
+    context = mp_context or multiprocessing.get_context()
+    with context.Pool(workers, initializer=_init_worker, initargs=(assessed_at,)) as pool:
+        # imap keeps results in submission order, so the sink sees the same sequence for any worker count
+        yield from pool.imap(_assess_batch, batches)
+
+def run_cohort_assessment(student_ids, profile_sink=None, workers=None, cohort_seed=0, assessed_at=None, batch_size=256):
+    """Assesses every student and passes each batch of profiles to profile_sink(profiles).
+
+    Returns a CohortRunReport. Without a sink the profiles are discarded; use iter_cohort_assessment
+    to consume them directly.
+    """
+    workers = workers or os.cpu_count() or 1
+    student_count = batch_count = 0
+    start = time.perf_counter()
+    for profiles in iter_cohort_assessment(student_ids, workers, cohort_seed, assessed_at, batch_size):
+        if profile_sink is not None:
+            profile_sink(profiles)
+        student_count += len(profiles)
+        batch_count += 1
+    return CohortRunReport(student_count, workers, time.perf_counter() - start, batch_count)
+
+if __name__ == "__main__":
+    from profile_repository_module import ProfileRepository
+
+    print("--- DALA Cohort Assessment Demo ---")
+    student_ids = [f"school_a_{i:05d}" for i in range(2000)]
+    assessed_at = "2025-09-01T09:00:00Z"
+    results = {}
+    for workers in (1, 4):
+        with ProfileRepository(":memory:") as repository:
+            report = run_cohort_assessment(student_ids, repository.save_many, workers=workers, cohort_seed=2025, assessed_at=assessed_at)
+            print(report.describe())
+            results[workers] = [profile.to_dict() for profile in repository.load_many(student_ids[:200]).values()]
+    print(f"Identical profiles for 1 and 4 workers: {results[1] == results[4]}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Content Export Module
+
+This module contains the logic for:
+1.  Exporting a curriculum and its content library as compact JSON (or JSON Lines), optionally
+    gzip- or lzma-compressed (chosen by the file suffix: .gz or .xz).
+2.  Writing each file atomically (AtomicWriter): to a unique temporary file in the same directory,
+    fsynced, then renamed over the target and the directory fsynced, so a crash leaves the previous
+    export in place rather than a truncated file.
+3.  Recording a SHA-256 checksum of the (uncompressed) content file in the curriculum file, which
+    CurriculumContentStore.from_json_files() / from_jsonl() verify on load.
+
+The content file is written before the curriculum file, so the checksum also ties the pair
+together: a crash between the two renames leaves a new content file next to the old curriculum,
+and the load reports the mismatch instead of serving content against the wrong curriculum.
+Content is written one item per line, so load errors point at the item's own line.
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import tempfile
+
+# Curriculum field holding "sha256:<hex digest>" of the content file's uncompressed bytes
+CHECKSUM_FIELD = "content_checksum"
+
+# Compression -> (open function, file suffix)
+COMPRESSIONS = {"gzip": (gzip.open, ".gz"), "lzma": (lzma.open, ".xz")}
+
+JSON_FORMAT = "json"
+JSONL_FORMAT = "jsonl"
+
+_COMPACT_SEPARATORS = (",", ":")
+
+def compression_for_path(path):
+    """The compression a path's suffix selects ("gzip", "lzma" or None)."""
+    for compression, (_, suffix) in COMPRESSIONS.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+def open_binary(path):
+    """Opens path for binary reading, decompressing according to its suffix."""
+    compression = compression_for_path(path)
+    if compression is None:
+        return open(path, "rb")
+    return COMPRESSIONS[compression][0](path, "rb")
+
+# Applied to temporary files, which mkstemp creates owner-only, so exports get the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _fsync_directory(directory):
+    """Makes a rename in directory durable (POSIX only; Windows cannot open directories for fsync)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class AtomicWriter:
+    """Context manager writing bytes to a temporary file that is renamed over path on success.
+
+    The temporary file is unique to the writer (tempfile.mkstemp in path's directory), so threads
+    and processes exporting to the same path do not interfere; the last rename wins. Output is
+    compressed by the target's suffix unless compress is False.
+    """
+    def __init__(self, path, compresslevel=None, compress=True):
+        self.path = path
+        self.temp_path = None
+        self._compresslevel = compresslevel
+        self._compression = compression_for_path(path) if compress else None
+        self._raw = None
+        self._file = None
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, self.temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+        try:
+            self._raw = os.fdopen(fd, "wb")
+            os.chmod(self.temp_path, 0o666 & ~_UMASK)
+            if self._compression == "gzip":
+                level = 9 if self._compresslevel is None else self._compresslevel
+                self._file = gzip.GzipFile(filename=self.path, mode="wb", compresslevel=level, fileobj=self._raw)
+            elif self._compression == "lzma":
+                self._file = lzma.LZMAFile(self._raw, "wb", preset=self._compresslevel)
+            else:
+                self._file = self._raw
+        except BaseException:
+            if self._raw is None:
+                os.close(fd)
+            else:
+                self._raw.close()
+            os.unlink(self.temp_path)
+            raise
+        return self._file
+
+    def __exit__(self, exc_type, exc, traceback):
+        replaced = False
+        try:
+            try:
+                if self._file is not self._raw:
+                    self._file.close()
+                if exc_type is None:
+                    self._raw.flush()
+                    os.fsync(self._raw.fileno())
+            finally:
+                self._raw.close()
+            if exc_type is None:
+                os.replace(self.temp_path, self.path)
+                replaced = True
+        finally:
+            if not replaced:
+                os.unlink(self.temp_path)
+        _fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        return False
+
+def _batches(lines, size=512):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def export_catalog(curriculum_data, content_items, curriculum_path, content_path, content_format=JSON_FORMAT, compresslevel=None):
+    """Atomically writes a curriculum and its content items as compact, checksummed JSON files.
+
+    content_format is JSON_FORMAT (an array, one item per line) or JSONL_FORMAT. Each path's suffix
+    selects its compression (.gz: gzip, .xz: lzma); compresslevel is the gzip level (default 9) or
+    lzma preset (default 6). Returns the content checksum recorded in the curriculum file.
+    """
+    if content_format not in (JSON_FORMAT, JSONL_FORMAT):
+        raise ValueError(f"Unknown content format {content_format!r} (expected {JSON_FORMAT!r} or {JSONL_FORMAT!r})")
+    encode = json.JSONEncoder(ensure_ascii=False, separators=_COMPACT_SEPARATORS).encode
+    digest = hashlib.sha256()
+    with AtomicWriter(content_path, compresslevel) as f:
+        def write(text):
+            data = text.encode("utf-8")
+            digest.update(data)
+            f.write(data)
+
+        lines = map(encode, content_items)
+        if content_format == JSON_FORMAT:
+            write("[\n")
+            separator = ""
+            for batch in _batches(lines):
+                write(separator + ",\n".join(batch))
+                separator = ",\n"
+            write("\n]\n")
+        else:
+            for batch in _batches(lines):
+                write("\n".join(batch) + "\n")
+    checksum = f"sha256:{digest.hexdigest()}"
+    # The checksum goes first so header peeks (curriculum_catalog_module) still find the other fields early
+    curriculum_export = {CHECKSUM_FIELD: checksum}
+    curriculum_export.update((key, value) for key, value in curriculum_data.items() if key != CHECKSUM_FIELD)
+    with AtomicWriter(curriculum_path, compresslevel) as f:
+        f.write(json.dumps(curriculum_export, ensure_ascii=False, separators=_COMPACT_SEPARATORS).encode("utf-8"))
+    return checksum
+
+if __name__ == "__main__":
+    import tempfile
+    from curriculum_content_module import CurriculumContentStore, CURRICULUM_SLICE, LEARNING_CONTENT_SET
+
+    print("--- DALA Content Export Demo ---")
+    store = CurriculumContentStore(CURRICULUM_SLICE, LEARNING_CONTENT_SET)
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in ("", ".gz", ".xz"):
+            curriculum_path = os.path.join(directory, f"year4_maths_multi_div_curriculum.json{suffix}")
+            content_path = os.path.join(directory, f"year4_maths_multi_div_content.json{suffix}")
+            checksum = store.export(curriculum_path, content_path)
+            loaded = CurriculumContentStore.from_json_files(curriculum_path, content_path)
+            size = os.path.getsize(curriculum_path) + os.path.getsize(content_path)
+            print(f"{compression_for_path(content_path) or 'uncompressed':<12} {size:6,} bytes, {checksum[:19]}..., "
+                  f"reloaded version matches: {loaded.version == store.version}")
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Content Loader Module
+
+This module contains the logic for:
+1.  Streaming the records of a large JSON array (as written by CurriculumContentStore.save_to_json)
+    or JSON Lines file one at a time, with the line number each record starts on.
+2.  Validating curriculum LOs and content records as they are read: required fields and their
+    types, known difficulties, duplicate IDs, and content tagged with LOs missing from the curriculum.
+
+CurriculumContentStore.from_json_files() and from_jsonl() build stores this way (load_catalog). The
+file is read in fixed-size chunks, so a million-item library never holds its raw text in memory,
+only the parsed records. Files may be gzip/lzma-compressed (.gz/.xz), and a content checksum
+recorded by content_export_module is verified against the bytes read. Every problem found is reported together in one ContentValidationError; each names its
+file and line. A JSON syntax error ends a JSON array file (nothing after it can be located
+reliably), whereas a bad line in a JSON Lines file is reported and skipped.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import re
+import zlib
+from collections import deque, namedtuple
+from itertools import islice
+
+from content_export_module import CHECKSUM_FIELD, open_binary
+
+CHUNK_SIZE = 1 << 16
+# JSON Lines are decoded this many lines at a time
+JSONL_BATCH_LINES = 256
+# A record not decodable within this many characters is reported instead of buffering the rest of the file
+MAX_RECORD_CHARS = 1 << 20
+
+# Field -> required type
+LO_REQUIRED_FIELDS = {"id": str, "description": str}
+LO_OPTIONAL_FIELDS = {"prerequisites": list, "keywords": list}
+CONTENT_REQUIRED_FIELDS = {
+    "content_id": str, "title": str, "type": str, "learning_objectives_covered": list,
+    "difficulty": str, "url_path": str,
+}
+CONTENT_OPTIONAL_FIELDS = {"target_preferences": list, "keywords": list}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Where an object ends and the next array element begins (or a "}," inside a nested object or string)
+_OBJECT_SEPARATOR = re.compile(r"\}[ \t\n\r]*,[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+class RecordProblem(namedtuple("RecordProblem", ["source", "line", "message"])):
+    """One problem found while loading: the file, the line the record starts on (None for the whole file), and what is wrong."""
+    __slots__ = ()
+
+    def __str__(self):
+        if self.line is None:
+            return f"{self.source}: {self.message}"
+        return f"{self.source}:{self.line}: {self.message}"
+
+class ContentValidationError(ValueError):
+    """Raised when curriculum or content files are malformed or inconsistent; .problems lists every RecordProblem."""
+    def __init__(self, problems):
+        self.problems = problems
+        shown = "; ".join(str(problem) for problem in problems[:5])
+        more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+        super().__init__(f"Invalid curriculum/content data: {shown}{more}")
+
+class _JsonReader:
+    """Reads JSON values one at a time from a text file, a chunk at a time, tracking line numbers."""
+    def __init__(self, f, source, chunk_size=CHUNK_SIZE):
+        self.source = source
+        self.line = 1
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._try_runs = True  # False after a run fails to decode, until the next chunk is read
+
+    def _advance(self, end):
+        self.line += self._buffer.count("\n", self._pos, end)
+        self._pos = end
+
+    def _fill(self):
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._try_runs = True
+        return True
+
+    def error(self, message, pos=None):
+        line = self.line if pos is None else self.line + self._buffer.count("\n", self._pos, pos)
+        return ContentValidationError([RecordProblem(self.source, line, message)])
+
+    def peek(self):
+        """Skips whitespace and returns the next character ("" at the end of the file)."""
+        while True:
+            self._advance(_WHITESPACE.match(self._buffer, self._pos).end())
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, characters):
+        """Consumes the next character, which must be one of characters; returns it."""
+        character = self.peek()
+        if not character or character not in characters:
+            found = repr(character) if character else "end of file"
+            raise self.error(f"invalid JSON: expected {' or '.join(repr(c) for c in characters)}, found {found}")
+        self._advance(self._pos + 1)
+        return character
+
+    def value(self):
+        """Decodes the next JSON value; returns (line it starts on, value)."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A value ending at the end of the buffer may continue in the next chunk (e.g. a number)
+                if end < len(self._buffer) or self._eof:
+                    break
+            except json.JSONDecodeError as e:
+                if self._eof or len(self._buffer) - self._pos > MAX_RECORD_CHARS:
+                    raise self.error(f"invalid JSON: {e.msg}", e.pos) from None
+            self._fill()
+        line = self.line
+        self._advance(end)
+        return line, value
+
+    def _object_run(self):
+        """Decodes the buffered run of complete objects ahead in one call; returns [(line, value)] or None.
+
+        One json.loads call per run instead of one decode per record is about twice as fast, and
+        shares key strings between records (the decoder memoizes keys only within a call). The run
+        ends at the last "}," in the buffer. Every element of a valid run is an object, so each
+        element boundary is a "},"; if the run decodes to as many objects as it has "}," matches,
+        none of them was inside a nested object or a string, so they give each record's line.
+        Otherwise, records are decoded one at a time until the next chunk is read.
+        """
+        buffer = self._buffer
+        start = self._pos
+        separators = list(_OBJECT_SEPARATOR.finditer(buffer, start))
+        if len(separators) < 2:
+            return None
+        try:
+            values = json.loads("[" + buffer[start:separators[-1].start() + 1] + "]")
+        except json.JSONDecodeError:
+            values = None
+        if values is None or len(values) != len(separators) or not all(type(value) is dict for value in values):
+            self._try_runs = False
+            return None
+        run = []
+        line = self.line
+        for value, separator in zip(values, separators):
+            run.append((line, value))
+            next_start = separator.end()
+            line += buffer.count("\n", start, next_start)
+            start = next_start
+        self._advance(start)
+        return run
+
+    def array_items(self):
+        """Yields (line, value) for each element of the array starting at the next character."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._advance(self._pos + 1)
+            return
+        while True:
+            if self.peek() == "{" and self._try_runs:
+                run = self._object_run()
+                if run is not None:
+                    yield from run
+                    continue
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+    def expect_end(self):
+        if self.peek():
+            raise self.error("invalid JSON: unexpected data after the top-level value")
+
+def iter_json_array(f, source="<stream>", problems=None):
+    """Yields (line, record) for each element of the top-level JSON array in text file f.
+
+    A syntax error ends the iteration: it is appended to problems when a list is given, else raised
+    as ContentValidationError.
+    """
+    reader = _JsonReader(f, source)
+    try:
+        yield from reader.array_items()
+        reader.expect_end()
+    except ContentValidationError as e:
+        if problems is None:
+            raise
+        problems.extend(e.problems)
+
+def iter_jsonl(f, source="<stream>", problems=None):
+    """Yields (line, record) for each non-blank line of JSON Lines file f.
+
+    Lines that are not valid JSON are appended to problems and skipped when a list is given, else
+    raised as ContentValidationError.
+    """
+    numbered_lines = ((line_number, text) for line_number, text in enumerate(f, 1) if text and not text.isspace())
+    while True:
+        try:
+            batch = list(islice(numbered_lines, JSONL_BATCH_LINES))
+        except ContentValidationError as e:  # Corrupt compressed data
+            if problems is None:
+                raise
+            problems.extend(e.problems)
+            return
+        if not batch:
+            return
+        # Decoding a batch in one call is faster and shares key strings; a bad line falls back to one at a time
+        try:
+            records = json.loads("[" + ",".join(text for _, text in batch) + "]")
+        except json.JSONDecodeError:
+            records = None
+        if records is not None and len(records) == len(batch):
+            yield from zip((line_number for line_number, _ in batch), records)
+            continue
+        for line_number, text in batch:
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                problem = RecordProblem(source, line_number, f"invalid JSON: {e.msg}")
+                if problems is None:
+                    raise ContentValidationError([problem]) from None
+                problems.append(problem)
+                continue
+            yield line_number, record
+
+def read_curriculum(f, source="<stream>"):
+    """Reads a curriculum JSON object, streaming its learning_objectives array.
+
+    Returns (curriculum_data, lo_lines) where lo_lines[i] is the line learning objective i starts on.
+    """
+    reader = _JsonReader(f, source)
+    curriculum_data = {}
+    lo_lines = []
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            _, key = reader.value()
+            reader.expect(":")
+            if key == "learning_objectives" and reader.peek() == "[":
+                learning_objectives = []
+                for line, lo in reader.array_items():
+                    lo_lines.append(line)
+                    learning_objectives.append(lo)
+                curriculum_data[key] = learning_objectives
+            else:
+                curriculum_data[key] = reader.value()[1]
+            if reader.expect(",}") == "}":
+                break
+    reader.expect_end()
+    return curriculum_data, lo_lines
+
+def _field_problems(record, required_fields, optional_fields):
+    if not isinstance(record, dict):
+        return [f"expected a JSON object, found {type(record).__name__}"]
+    messages = []
+    for field, expected_type in required_fields.items():
+        if field not in record:
+            messages.append(f"missing required field {field!r}")
+        elif record[field] is None:
+            messages.append(f"field {field!r} should be {expected_type.__name__}, found null")
+    for fields in (required_fields, optional_fields):
+        for field, expected_type in fields.items():
+            value = record.get(field)
+            if value is not None and not isinstance(value, expected_type):
+                messages.append(f"field {field!r} should be {expected_type.__name__}, found {type(value).__name__}")
+    return messages
+
+class CatalogValidator:
+    """Validates a curriculum and then content records against it, collecting every RecordProblem.
+
+    difficulties is the set of accepted difficulty values (compared lower-cased); None accepts any.
+    """
+    def __init__(self, difficulties=None):
+        self.difficulties = difficulties
+        self.problems = []
+        self.lo_ids = set()
+        self.content_ids = set()
+
+    def check_curriculum(self, curriculum_data, lo_lines, source):
+        """Checks the LOs of curriculum_data (duplicate IDs and prerequisites are left to PrerequisiteGraph)."""
+        learning_objectives = curriculum_data.get("learning_objectives")
+        if not isinstance(learning_objectives, list):
+            self.problems.append(RecordProblem(source, 1, "curriculum has no 'learning_objectives' array"))
+            return
+        for line, lo in zip(lo_lines, learning_objectives):
+            messages = _field_problems(lo, LO_REQUIRED_FIELDS, LO_OPTIONAL_FIELDS)
+            if messages:
+                label = f"learning objective {lo.get('id')!r}: " if isinstance(lo, dict) and isinstance(lo.get("id"), str) else ""
+                self.problems.extend(RecordProblem(source, line, label + message) for message in messages)
+            else:
+                self.lo_ids.add(lo["id"])
+
+    def valid_content(self, records, source):
+        """Yields the records (from iter_json_array / iter_jsonl) that pass validation."""
+        problems = self.problems
+        lo_ids = self.lo_ids
+        content_ids = self.content_ids
+        difficulties = self.difficulties
+        for line, item in records:
+            messages = _field_problems(item, CONTENT_REQUIRED_FIELDS, CONTENT_OPTIONAL_FIELDS)
+            if not messages:
+                content_id = item["content_id"]
+                if content_id in content_ids:
+                    messages.append("duplicate content_id")
+                covered = item["learning_objectives_covered"]
+                if not covered:
+                    messages.append("covers no learning objectives")
+                for lo_id in covered:
+                    if not isinstance(lo_id, str):
+                        messages.append(f"learning objective IDs should be str, found {'null' if lo_id is None else type(lo_id).__name__}")
+                    elif lo_id not in lo_ids:
+                        messages.append(f"learning objective {lo_id!r} is not in the curriculum")
+                if difficulties is not None and item["difficulty"].lower() not in difficulties:
+                    messages.append(f"unknown difficulty {item['difficulty']!r}")
+            if messages:
+                label = f"content {item['content_id']!r}: " if isinstance(item, dict) and isinstance(item.get("content_id"), str) else ""
+                problems.extend(RecordProblem(source, line, label + message) for message in messages)
+                continue
+            content_ids.add(content_id)
+            yield item
+
+    def raise_if_invalid(self):
+        if self.problems:
+            raise ContentValidationError(self.problems)
+
+class ChecksumReader(io.RawIOBase):
+    """Binary reader over a file (decompressed according to its suffix) that hashes the bytes it returns."""
+    def __init__(self, path):
+        self.path = path
+        self.corrupt = False
+        self._file = open_binary(path)
+        self._digest = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def _read(self, size):
+        try:
+            return self._file.read(size)
+        except (EOFError, gzip.BadGzipFile, zlib.error, lzma.LZMAError) as e:
+            self.corrupt = True
+            raise ContentValidationError([RecordProblem(self.path, None, f"compressed data is truncated or corrupt ({e})")]) from None
+
+    def readinto(self, buffer):
+        data = self._read(len(buffer))
+        buffer[:len(data)] = data
+        self._digest.update(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+    def checksum(self):
+        """"sha256:<hex digest>" of the whole file (reading whatever has not been read yet); None if it is corrupt."""
+        if self.corrupt:
+            return None
+        while True:
+            try:
+                data = self._read(CHUNK_SIZE)
+            except ContentValidationError:
+                return None
+            if not data:
+                return f"sha256:{self._digest.hexdigest()}"
+            self._digest.update(data)
+
+def load_catalog(curriculum_path, content_path, iter_records, build, difficulties=None):
+    """Reads and validates a curriculum file and a content file; returns build(curriculum_data, content_items).
+
+    iter_records is iter_json_array or iter_jsonl (for the content file). content_items is a
+    generator of validated records, consumed by build. If the curriculum records a content checksum
+    (see content_export_module), the content file's bytes must match it. Raises
+    ContentValidationError listing every problem found.
+    """
+    validator = CatalogValidator(difficulties)
+    with io.TextIOWrapper(ChecksumReader(curriculum_path), encoding="utf-8") as f:
+        curriculum_data, lo_lines = read_curriculum(f, curriculum_path)
+    expected_checksum = curriculum_data.pop(CHECKSUM_FIELD, None)
+    validator.check_curriculum(curriculum_data, lo_lines, curriculum_path)
+    content_file = ChecksumReader(content_path)
+    with io.TextIOWrapper(content_file, encoding="utf-8") as f:
+        content = validator.valid_content(iter_records(f, content_path, validator.problems), content_path)
+        if validator.problems:
+            # The curriculum is unusable; still read the content so every problem is reported at once
+            deque(content, maxlen=0)
+            result = None
+        else:
+            result = build(curriculum_data, content)
+        checksum = content_file.checksum()
+        if checksum is None:
+            if not any(problem.source == content_path and problem.line is None for problem in validator.problems):
+                validator.problems.append(RecordProblem(content_path, None, "compressed data is truncated or corrupt"))
+        elif expected_checksum is not None and checksum != expected_checksum:
+            validator.problems.append(RecordProblem(
+                content_path, None, f"content checksum does not match {curriculum_path} (truncated, or from a different export)"
+            ))
+    validator.raise_if_invalid()
+    return result
+
+if __name__ == "__main__":
+    import io
+
+    print("--- DALA Content Loader Demo ---")
+    content_json = """[
+    {"content_id": "C1", "title": "Times Tables Game", "type": "game", "learning_objectives_covered": ["LO1"],
+     "difficulty": "easy", "url_path": "/c1"},
+    {"content_id": "C2", "title": "Missing type", "learning_objectives_covered": ["LO9"],
+     "difficulty": "tricky", "url_path": "/c2"},
+    {"content_id": "C1", "title": "Duplicate", "type": "video", "learning_objectives_covered": ["LO1"],
+     "difficulty": "hard", "url_path": "/c1b"}
+]"""
+    curriculum_data, lo_lines = read_curriculum(io.StringIO('{"subject": "Maths",\n "learning_objectives": [\n  {"id": "LO1", "description": "Recall facts"}\n]}'), "curriculum.json")
+    validator = CatalogValidator(difficulties={"easy", "medium", "hard"})
+    validator.check_curriculum(curriculum_data, lo_lines, "curriculum.json")
+    valid = list(validator.valid_content(iter_json_array(io.StringIO(content_json), "content.json", validator.problems), "content.json"))
+    print(f"Valid records: {[item['content_id'] for item in valid]}")
+    for problem in validator.problems:
+        print(f"  {problem}")
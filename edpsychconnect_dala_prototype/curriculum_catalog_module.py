@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Curriculum Catalog Module
+
+This module contains the logic for:
+1.  Discovering sharded curriculum/content JSON files (pairs named <shard>_curriculum.json and
+    <shard>_content.json, like the files in data/) across every subject and year group.
+2.  Loading a shard into a CurriculumContentStore the first time it is requested, outside the
+    catalog lock and at most once however many threads request it together.
+3.  Evicting the least recently used shards when loaded shards exceed a memory budget.
+4.  Load, hit/miss and eviction counters.
+5.  Opening a shard from its compiled catalog image (<shard>.dalacat, see catalog_image_module)
+    instead of its JSON when the image is at least as new as the JSON files.
+
+Discovery only reads the head of each curriculum file to learn its subject, year group and topic;
+content files (the bulk of the data) are not read until the shard is requested. A shard's memory
+cost is estimated from the size of its two JSON files. All stores share one LearningObjectiveIndex,
+so LO bitsets in learner profiles stay valid when a shard is evicted and later reloaded.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+from curriculum_content_module import CurriculumContentStore, DEFAULT_LO_INDEX
+from catalog_image_module import ImageBackedContentStore, IMAGE_SUFFIX, compile_catalog_image_from_files
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+CURRICULUM_SUFFIX = "_curriculum.json"
+CONTENT_SUFFIX = "_content.json"
+
+# How much of a curriculum file discovery reads looking for its header fields
+_HEADER_READ_BYTES = 4096
+_HEADER_FIELD_PATTERN = re.compile(r'"(subject|year_group|topic)"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+class CurriculumShard(namedtuple("CurriculumShard", ["shard_id", "subject", "year_group", "topic", "curriculum_path", "content_path", "size_bytes"])):
+    """A discovered curriculum/content file pair. size_bytes is the combined size of both files."""
+    __slots__ = ()
+
+def _read_header(curriculum_path):
+    """Returns {"subject", "year_group", "topic"} from the start of a curriculum file.
+
+    Falls back to parsing the whole file when the fields are not near the top.
+    """
+    with open(curriculum_path, encoding="utf-8") as f:
+        head = f.read(_HEADER_READ_BYTES)
+    header = {field: json.loads(value) for field, value in _HEADER_FIELD_PATTERN.findall(head)}
+    if len(header) < 3:
+        with open(curriculum_path, encoding="utf-8") as f:
+            curriculum = json.load(f)
+        header = {field: curriculum.get(field) for field in ("subject", "year_group", "topic")}
+    return header
+
+class CurriculumCatalog:
+    """Lazily loaded, LRU-evicted CurriculumContentStores for every discovered shard.
+
+    memory_budget_bytes bounds the combined file size of the loaded shards (None: no limit). The
+    most recently requested shard is always kept, even if it alone exceeds the budget.
+    """
+    def __init__(self, data_dirs=(DATA_DIR,), memory_budget_bytes=64 * 1024 * 1024, lo_index=None):
+        self.data_dirs = [data_dirs] if isinstance(data_dirs, str) else list(data_dirs)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.lo_index = lo_index if lo_index is not None else DEFAULT_LO_INDEX
+        self._shards = {}
+        self._loaded = OrderedDict()  # shard_id -> (CurriculumContentStore, size_bytes), least recently used first
+        self._loaded_bytes = 0
+        self._loading = {}  # shard_id -> Future of the store, while one thread loads it
+        self._lock = threading.RLock()
+        self.reset_stats()
+        self.discover()
+
+    # --- Discovery ---
+    def discover(self):
+        """Rescans the data directories for shards. Returns the number found.
+
+        Already loaded stores are kept until evicted; call evict() to pick up a changed shard.
+        """
+        shards = {}
+        for data_dir in self.data_dirs:
+            try:
+                file_names = sorted(os.listdir(data_dir))
+            except FileNotFoundError:
+                continue
+            for file_name in file_names:
+                if not file_name.endswith(CURRICULUM_SUFFIX):
+                    continue
+                shard_id = file_name[:-len(CURRICULUM_SUFFIX)]
+                curriculum_path = os.path.join(data_dir, file_name)
+                content_path = os.path.join(data_dir, shard_id + CONTENT_SUFFIX)
+                if not os.path.exists(content_path):
+                    continue
+                header = _read_header(curriculum_path)
+                size_bytes = os.path.getsize(curriculum_path) + os.path.getsize(content_path)
+                shards[shard_id] = CurriculumShard(shard_id, header["subject"], header["year_group"], header["topic"],
+                                                   curriculum_path, content_path, size_bytes)
+        with self._lock:
+            self._shards = shards
+        return len(shards)
+
+    def shards(self, subject=None, year_group=None):
+        """Returns the discovered shards, optionally filtered by subject and/or year group."""
+        return [
+            shard for shard in self._shards.values()
+            if (subject is None or shard.subject == subject) and (year_group is None or shard.year_group == year_group)
+        ]
+
+    def subjects(self):
+        """Returns the sorted (subject, year_group) pairs available in the catalog."""
+        return sorted({(shard.subject, shard.year_group) for shard in self._shards.values()})
+
+    # --- Loading ---
+    def get_store(self, shard_id):
+        """Returns the CurriculumContentStore for a shard, loading it on first use.
+
+        The shard is loaded outside the catalog lock, so requests for other shards are not held up.
+        Concurrent requests for a shard that is being loaded wait for that load instead of starting
+        their own (they count as hits); if it fails, they all see its exception.
+        """
+        with self._lock:
+            entry = self._loaded.get(shard_id)
+            if entry is not None:
+                self.hits += 1
+                self._loaded.move_to_end(shard_id)
+                return entry[0]
+            pending = self._loading.get(shard_id)
+            if pending is None:
+                shard = self._shards.get(shard_id)
+                if shard is None:
+                    raise KeyError(f"Unknown curriculum shard '{shard_id}'")
+                self.misses += 1
+                pending = self._loading[shard_id] = Future()
+                is_loader = True
+            else:
+                self.hits += 1
+                is_loader = False
+        if not is_loader:
+            return pending.result()
+
+        try:
+            store = self._load(shard)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[shard_id]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[shard_id]
+            self._loaded[shard_id] = (store, shard.size_bytes)
+            self._loaded_bytes += shard.size_bytes
+            self._evict_to_budget()
+        pending.set_result(store)
+        return store
+
+    def get_slice(self, subject, year_group, topic=None):
+        """Returns the stores for every shard of a subject and year group (optionally one topic)."""
+        return [
+            self.get_store(shard.shard_id) for shard in self.shards(subject, year_group)
+            if topic is None or shard.topic == topic
+        ]
+
+    def _load(self, shard):
+        image_path = os.path.join(os.path.dirname(shard.curriculum_path), shard.shard_id + IMAGE_SUFFIX)
+        try:
+            image_is_current = os.path.getmtime(image_path) >= max(os.path.getmtime(shard.curriculum_path), os.path.getmtime(shard.content_path))
+        except OSError:
+            image_is_current = False
+        if image_is_current:
+            store = ImageBackedContentStore.open(image_path, lo_index=self.lo_index)
+        else:
+            store = CurriculumContentStore.from_json_files(shard.curriculum_path, shard.content_path, lo_index=self.lo_index)
+        with self._lock:
+            self.loads += 1
+            if image_is_current:
+                self.image_loads += 1
+            self.bytes_loaded += shard.size_bytes
+        return store
+
+    def _evict_to_budget(self):
+        if self.memory_budget_bytes is None:
+            return
+        while self._loaded_bytes > self.memory_budget_bytes and len(self._loaded) > 1:
+            _, (_, size_bytes) = self._loaded.popitem(last=False)
+            self._loaded_bytes -= size_bytes
+            self.evictions += 1
+
+    def evict(self, shard_id):
+        """Drops a loaded shard (it is reloaded on next use). Returns False if it was not loaded."""
+        with self._lock:
+            entry = self._loaded.pop(shard_id, None)
+            if entry is None:
+                return False
+            self._loaded_bytes -= entry[1]
+            self.evictions += 1
+            return True
+
+    def compile_images(self):
+        """Compiles a catalog image beside every discovered shard. Returns {shard_id: image size in bytes}."""
+        sizes = {}
+        for shard in self.shards():
+            image_path = os.path.join(os.path.dirname(shard.curriculum_path), shard.shard_id + IMAGE_SUFFIX)
+            sizes[shard.shard_id] = compile_catalog_image_from_files(shard.curriculum_path, shard.content_path, image_path)
+        return sizes
+
+    def loaded_shard_ids(self):
+        """Loaded shard IDs, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    # --- Counters ---
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "shards": len(self._shards), "loaded": len(self._loaded), "loaded_bytes": self._loaded_bytes,
+            "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / requests if requests else 0.0,
+            "loads": self.loads, "image_loads": self.image_loads, "evictions": self.evictions, "bytes_loaded": self.bytes_loaded,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.image_loads = 0
+        self.evictions = 0
+        self.bytes_loaded = 0
+
+if __name__ == "__main__":
+    print("--- DALA Curriculum Catalog Demo ---")
+    catalog = CurriculumCatalog()
+    print(f"Discovered shards: {[shard.shard_id for shard in catalog.shards()]}")
+    print(f"Subjects: {catalog.subjects()}")
+    for subject, year_group in catalog.subjects():
+        for store in catalog.get_slice(subject, year_group):
+            print(f"{subject} / {year_group}: {len(store.get_learning_objectives())} LOs, {len(store.content_library)} content items")
+    catalog.get_slice(*catalog.subjects()[0])
+    print(f"Stats: {catalog.stats()}")
@@ -9,10 +9,32 @@ This module will contain:
 1.  A representation of a small, digitized curriculum slice.
 2.  A small set of tagged learning content.
 3.  Logic to store and retrieve this information.
+4.  A compact integer index over Learning Objective IDs, used for LO bitsets in learner profiles.
+5.  Inverted indexes over the content library (LO, type, difficulty, target preference, keyword)
+    with a query API that intersects them and returns content in difficulty order.
+6.  A compiled, validated prerequisite graph (topological order and transitive-closure LO bitsets),
+    and planning a whole-topic LO sequence over it with a priority queue.
+7.  Ranked (BM25) full-text search over LO descriptions and keywords and content titles, kept up to
+    date as content is added (see curriculum_search_module).
+8.  Content version IDs and copy-on-write content changes, for the immutable snapshots published by
+    versioned_store_module.VersionedContentStore.
+9.  Building a store from curriculum/content JSON or JSON Lines files, streaming and validating the
+    content one record at a time (see content_loader_module), and exporting a store atomically as
+    compact, optionally compressed, checksummed files (see content_export_module).
 """
 
+import hashlib
+import heapq
 import json
 import os # Added for path joining in main
+import sys
+import threading
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+from curriculum_search_module import build_search_index
+from content_loader_module import iter_json_array, iter_jsonl, load_catalog
+from content_export_module import JSON_FORMAT, export_catalog
 
 # --- Digitized Curriculum Slice (with Prerequisites) ---
 
@@ -116,15 +138,529 @@ LEARNING_CONTENT_SET = [
     }
 ]
 
+# --- Learning Objective Index ---
+
+class LearningObjectiveIndex:
+    """Interns Learning Objective IDs as small integers so a set of LOs can be stored as a bitset.
+
+    Indices are assigned in registration order and never change, so a bitset built against an index
+    stays valid as more LOs are registered. Unknown IDs are registered on first use by index_of().
+    Registration is thread-safe (stores loaded concurrently share DEFAULT_LO_INDEX); lookups of
+    registered IDs take no lock.
+    """
+    def __init__(self, lo_ids=()):
+        self._index_by_id = {}
+        self._ids = []
+        self._lock = threading.Lock()
+        for lo_id in lo_ids:
+            self.index_of(lo_id)
+
+    def __getstate__(self):
+        return {"_ids": self._ids}
+
+    def __setstate__(self, state):
+        self._ids = state["_ids"]
+        self._index_by_id = {lo_id: index for index, lo_id in enumerate(self._ids)}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, lo_id):
+        return lo_id in self._index_by_id
+
+    def index_of(self, lo_id):
+        """Returns the index for lo_id, registering it if it is new."""
+        index = self._index_by_id.get(lo_id)
+        if index is None:
+            with self._lock:
+                index = self._index_by_id.get(lo_id)
+                if index is None:
+                    lo_id = sys.intern(lo_id)
+                    index = len(self._ids)
+                    # Appended before it is published, so lo_id_at(index) works for any reader that sees it
+                    self._ids.append(lo_id)
+                    self._index_by_id[lo_id] = index
+        return index
+
+    def get(self, lo_id):
+        """Returns the index for lo_id, or None if it has never been registered."""
+        return self._index_by_id.get(lo_id)
+
+    def lo_id_at(self, index):
+        return self._ids[index]
+
+    def mask_for(self, lo_ids):
+        """Returns the bitset (an int) with a bit set for each LO ID in lo_ids."""
+        mask = 0
+        for lo_id in lo_ids:
+            mask |= 1 << self.index_of(lo_id)
+        return mask
+
+    def ids_in(self, mask):
+        """Yields the LO IDs whose bits are set in mask, in index order."""
+        ids = self._ids
+        while mask:
+            lowest_bit = mask & -mask
+            yield ids[lowest_bit.bit_length() - 1]
+            mask ^= lowest_bit
+
+# Shared by stores and compact profiles that are not given an index of their own
+DEFAULT_LO_INDEX = LearningObjectiveIndex()
+
+# --- Content Index ---
+# Difficulty mapping for sorting content
+DIFFICULTY_ORDER = {"easy": 1, "medium": 2, "hard": 3, "default": 99}
+
+def difficulty_rank(item):
+    """Sort rank of a content item's difficulty (unknown difficulties sort last)."""
+    return DIFFICULTY_ORDER.get(item.get("difficulty", "default").lower(), DIFFICULTY_ORDER["default"])
+
+_NO_POSITIONS = ()
+
+class ContentIndex:
+    """Inverted indexes over content items by LO, type, target preference and keyword.
+
+    Items are numbered by position in (difficulty, library order), and every posting list holds
+    positions in ascending order. A query walks the shortest posting list that applies, checks the
+    others by set membership, and turns difficulty bounds into a bisect, so results come out already
+    sorted and cost grows with the matching items rather than the library. (LO, type) pairs, the
+    pathway generator's hot query, have posting lists of their own.
+
+    Keywords are an item's own "keywords" if it has them, else those of the LOs it covers; keyword
+    matching ignores case.
+    """
+    def __init__(self, content_items, lo_details_map=None):
+        items = list(content_items)
+        ranks = [difficulty_rank(item) for item in items]
+        order = sorted(range(len(items)), key=ranks.__getitem__)
+        self._items = [items[i] for i in order]
+        self._ranks = [ranks[i] for i in order]
+        self._rank_groups = []  # (rank, first position, end position), easiest first
+        for position, rank in enumerate(self._ranks):
+            if not self._rank_groups or self._rank_groups[-1][0] != rank:
+                self._rank_groups.append([rank, position, position])
+            self._rank_groups[-1][2] = position + 1
+        postings = defaultdict(list)
+        lo_details_map = lo_details_map or {}
+        lo_keyword_keys = {}
+
+        def keyword_keys_for_lo(lo_id):
+            keys = lo_keyword_keys.get(lo_id)
+            if keys is None:
+                lo_keywords = lo_details_map.get(lo_id, {}).get("keywords", ())
+                keys = lo_keyword_keys[lo_id] = tuple(dict.fromkeys(("keyword", keyword.lower()) for keyword in lo_keywords))
+            return keys
+
+        for position, item in enumerate(self._items):
+            content_type = item.get("type")
+            postings[("type", content_type)].append(position)
+            lo_ids = item.get("learning_objectives_covered", ())
+            if len(lo_ids) > 1:
+                lo_ids = list(dict.fromkeys(lo_ids))
+            for lo_id in lo_ids:
+                postings[("lo", lo_id)].append(position)
+                postings[("lo_type", (lo_id, content_type))].append(position)
+            for preference in dict.fromkeys(item.get("target_preferences", ())):
+                postings[("preference", preference)].append(position)
+            keywords = item.get("keywords")
+            if keywords is not None:
+                keyword_keys = dict.fromkeys(("keyword", keyword.lower()) for keyword in keywords)
+            elif len(lo_ids) == 1:
+                keyword_keys = keyword_keys_for_lo(lo_ids[0])
+            else:
+                keyword_keys = dict.fromkeys(key for lo_id in lo_ids for key in keyword_keys_for_lo(lo_id))
+            for key in keyword_keys:
+                postings[key].append(position)
+        self._postings = dict(postings)
+        self._posting_sets = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def _posting_set(self, key):
+        posting_set = self._posting_sets.get(key)
+        if posting_set is None:
+            posting_set = self._posting_sets[key] = frozenset(self._postings.get(key, _NO_POSITIONS))
+        return posting_set
+
+    def _positions(self, keys, min_rank, max_rank, hardest_first):
+        if keys:
+            keys.sort(key=lambda key: len(self._postings.get(key, _NO_POSITIONS)))
+            driver = self._postings.get(keys[0], _NO_POSITIONS)
+            filters = [self._posting_set(key) for key in keys[1:]]
+        else:
+            driver = range(len(self._items))
+            filters = []
+        for _, start, end in (reversed(self._rank_groups) if hardest_first else self._rank_groups):
+            rank = self._ranks[start]
+            if (min_rank is not None and rank < min_rank) or (max_rank is not None and rank > max_rank):
+                continue
+            for i in range(bisect_left(driver, start), bisect_left(driver, end)):
+                position = driver[i]
+                if all(position in posting_set for posting_set in filters):
+                    yield position
+
+    def query(self, lo_id=None, content_type=None, preference=None, keyword=None, min_difficulty=None,
+              max_difficulty=None, hardest_first=False, exclude=(), limit=None):
+        """Yields content items matching every given filter, easiest first (hardest first if asked).
+
+        Difficulties bound inclusively by name ("easy", "medium", "hard"); items of equal difficulty
+        keep library order. exclude is a collection of content IDs to skip.
+        """
+        keys = []
+        if lo_id is not None and content_type is not None:
+            keys.append(("lo_type", (lo_id, content_type)))
+        elif lo_id is not None:
+            keys.append(("lo", lo_id))
+        elif content_type is not None:
+            keys.append(("type", content_type))
+        if preference is not None:
+            keys.append(("preference", preference))
+        if keyword is not None:
+            keys.append(("keyword", keyword.lower()))
+        min_rank = None if min_difficulty is None else difficulty_rank({"difficulty": min_difficulty})
+        max_rank = None if max_difficulty is None else difficulty_rank({"difficulty": max_difficulty})
+        if limit is not None and limit <= 0:
+            return
+        found = 0
+        items = self._items
+        for position in self._positions(keys, min_rank, max_rank, hardest_first):
+            item = items[position]
+            if exclude and item["content_id"] in exclude:
+                continue
+            yield item
+            found += 1
+            if found == limit:
+                return
+
+    def first(self, **filters):
+        """The first item query(**filters) would yield, or None."""
+        return next(self.query(**filters), None)
+
+# --- Prerequisite Graph ---
+class PrerequisiteGraphError(ValueError):
+    """Raised when a curriculum's prerequisites form a cycle or reference unknown LOs."""
+    def __init__(self, problems):
+        self.problems = problems
+        shown = "; ".join(problems[:5])
+        more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+        super().__init__(f"Invalid prerequisite graph: {shown}{more}")
+
+class PrerequisiteGraph:
+    """The prerequisite relation of a curriculum, compiled to LO bitsets over a LearningObjectiveIndex.
+
+    Compiling validates the graph (duplicate IDs, cycles and, when strict, prerequisites that are
+    not LOs of this curriculum), computes a topological order, and builds each LO's direct and
+    transitive prerequisite masks. With the student's completed-LO bitset, eligibility and the
+    remaining prerequisite chain are then a couple of integer operations. With strict=False, unknown
+    prerequisites are kept as external requirements the student must still have completed.
+    """
+    def __init__(self, learning_objectives, lo_index=None, strict=True):
+        self.lo_index = lo_index if lo_index is not None else DEFAULT_LO_INDEX
+        problems = []
+        prerequisites_by_id = {}
+        for lo in learning_objectives:
+            if lo["id"] in prerequisites_by_id:
+                problems.append(f"duplicate LO ID '{lo['id']}'")
+            prerequisites_by_id[lo["id"]] = list(dict.fromkeys(lo.get("prerequisites") or ()))
+        self.external_prerequisites = {}  # lo_id -> prerequisite IDs that are not LOs of this curriculum
+        for lo_id, prerequisites in prerequisites_by_id.items():
+            missing = [prereq_id for prereq_id in prerequisites if prereq_id not in prerequisites_by_id]
+            if missing:
+                self.external_prerequisites[lo_id] = missing
+                if strict:
+                    problems.extend(f"'{lo_id}' requires unknown LO '{prereq_id}'" for prereq_id in missing)
+
+        # Kahn's algorithm, taking ready LOs in curriculum order
+        dependents = {lo_id: [] for lo_id in prerequisites_by_id}
+        waiting_on = {}
+        for lo_id, prerequisites in prerequisites_by_id.items():
+            internal = [prereq_id for prereq_id in prerequisites if prereq_id in dependents]
+            waiting_on[lo_id] = len(internal)
+            for prereq_id in internal:
+                dependents[prereq_id].append(lo_id)
+        ready = deque(lo_id for lo_id, count in waiting_on.items() if not count)
+        order = []
+        while ready:
+            lo_id = ready.popleft()
+            order.append(lo_id)
+            for dependent in dependents[lo_id]:
+                waiting_on[dependent] -= 1
+                if not waiting_on[dependent]:
+                    ready.append(dependent)
+        if len(order) < len(prerequisites_by_id):
+            unresolved = {lo_id for lo_id, count in waiting_on.items() if count}
+            problems.append(f"prerequisite cycle {' -> '.join(self._find_cycle(unresolved, prerequisites_by_id))}")
+        if problems:
+            raise PrerequisiteGraphError(problems)
+
+        self.topological_order = order
+        self._topological_rank = {lo_id: rank for rank, lo_id in enumerate(order)}
+        self._curriculum_rank = {lo_id: rank for rank, lo_id in enumerate(prerequisites_by_id)}
+        self._prerequisites_by_id = prerequisites_by_id
+        self._dependents = dependents
+        self._direct_masks = {}
+        self._closure_masks = {}
+        index_of = self.lo_index.index_of
+        for lo_id in order:
+            direct = closure = 0
+            for prereq_id in prerequisites_by_id[lo_id]:
+                bit = 1 << index_of(prereq_id)
+                direct |= bit
+                closure |= bit | self._closure_masks.get(prereq_id, 0)
+            self._direct_masks[lo_id] = direct
+            self._closure_masks[lo_id] = closure
+        self._bits = {lo_id: 1 << index_of(lo_id) for lo_id in prerequisites_by_id}
+
+    @staticmethod
+    def _find_cycle(unresolved, prerequisites_by_id):
+        """Follows prerequisites among LOs Kahn's algorithm could not order until one repeats."""
+        path = []
+        seen_at = {}
+        lo_id = min(unresolved)
+        while lo_id not in seen_at:
+            seen_at[lo_id] = len(path)
+            path.append(lo_id)
+            lo_id = next(prereq_id for prereq_id in prerequisites_by_id[lo_id] if prereq_id in unresolved)
+        return path[seen_at[lo_id]:] + [lo_id]
+
+    def __len__(self):
+        return len(self.topological_order)
+
+    def __contains__(self, lo_id):
+        return lo_id in self._bits
+
+    def completed_mask(self, learner_profile):
+        """The profile's completed LOs as a bitset over this graph's lo_index."""
+        if getattr(learner_profile, "lo_index", None) is self.lo_index:
+            return learner_profile.completed_lo_mask
+        get = self.lo_index.get
+        mask = 0
+        for lo_id in learner_profile.completed_los:
+            index = get(lo_id)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def is_eligible(self, lo_id, completed_mask):
+        """Whether every direct prerequisite of lo_id is in completed_mask (False for unknown LOs)."""
+        direct = self._direct_masks.get(lo_id)
+        return direct is not None and direct & completed_mask == direct
+
+    def is_available(self, lo_id, completed_mask):
+        """Eligible and not already completed."""
+        bit = self._bits.get(lo_id)
+        if bit is None or bit & completed_mask:
+            return False
+        direct = self._direct_masks[lo_id]
+        return direct & completed_mask == direct
+
+    def prerequisite_mask(self, lo_id, transitive=True):
+        """Bitset of lo_id's prerequisites (all of them, or only the direct ones)."""
+        return (self._closure_masks if transitive else self._direct_masks)[lo_id]
+
+    def remaining_mask(self, lo_id, completed_mask):
+        """Bitset of every prerequisite, direct or indirect, of lo_id not yet in completed_mask."""
+        return self._closure_masks[lo_id] & ~completed_mask
+
+    def prerequisite_chain(self, lo_id, completed_mask=0):
+        """lo_id's outstanding transitive prerequisites in topological order (external ones first)."""
+        rank = self._topological_rank
+        return sorted(self.lo_index.ids_in(self.remaining_mask(lo_id, completed_mask)), key=lambda prereq_id: rank.get(prereq_id, -1))
+
+    def available_los(self, completed_mask):
+        """LOs that are eligible and not yet completed, in topological order."""
+        return [lo_id for lo_id in self.topological_order if self.is_available(lo_id, completed_mask)]
+
+    def dependents(self, lo_id):
+        """LOs that list lo_id as a direct prerequisite, in curriculum order."""
+        return list(self._dependents[lo_id])
+
+    def plan_order(self, completed_mask=0, priority=None, target_lo_ids=None):
+        """Every LO not in completed_mask that can still be unlocked, in an order that respects prerequisites.
+
+        Kahn's algorithm over the uncompleted LOs with a priority queue: of the LOs whose
+        prerequisites are all completed or already planned, the one with the smallest priority(lo_id)
+        comes next (ties, and priority=None, in curriculum order). priority is called once per LO,
+        when it becomes ready. With target_lo_ids, only those LOs and the prerequisites still needed
+        to reach them are planned (prerequisites of completed LOs are not). LOs waiting on an
+        uncompleted external prerequisite are left out, as is everything that depends on them.
+        Raises PrerequisiteGraphError if a target is not an LO of this curriculum.
+        """
+        # Completion looked up in the mask's bytes: big-int operations would cost O(LOs) each
+        completed_bytes = completed_mask.to_bytes((completed_mask.bit_length() + 7) // 8, "little")
+        index_of = self.lo_index.get
+
+        def is_completed(lo_id):
+            index = index_of(lo_id)
+            return index is not None and index >> 3 < len(completed_bytes) and completed_bytes[index >> 3] >> (index & 7) & 1
+
+        prerequisites_by_id = self._prerequisites_by_id
+        if target_lo_ids is None:
+            candidates = [lo_id for lo_id in self.topological_order if not is_completed(lo_id)]
+        else:
+            stack = list(target_lo_ids)
+            unknown = [lo_id for lo_id in stack if lo_id not in self._bits]
+            if unknown:
+                raise PrerequisiteGraphError([f"target LO '{lo_id}' is not in this curriculum" for lo_id in unknown])
+            # The targets and, back to the nearest completed LOs, their prerequisites in this curriculum
+            scope = set()
+            while stack:
+                lo_id = stack.pop()
+                if lo_id not in scope and lo_id in prerequisites_by_id and not is_completed(lo_id):
+                    scope.add(lo_id)
+                    stack.extend(prerequisites_by_id[lo_id])
+            candidates = sorted(scope, key=self._topological_rank.__getitem__)
+        curriculum_rank = self._curriculum_rank
+        waiting_on = {}
+        ready = []
+        for lo_id in candidates:
+            count = 0
+            for prereq_id in prerequisites_by_id[lo_id]:
+                if not is_completed(prereq_id):
+                    count += 1
+            waiting_on[lo_id] = count
+            if not count:
+                ready.append((curriculum_rank[lo_id] if priority is None else priority(lo_id), curriculum_rank[lo_id], lo_id))
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            lo_id = heapq.heappop(ready)[2]
+            order.append(lo_id)
+            for dependent in self._dependents[lo_id]:
+                count = waiting_on.get(dependent)
+                if count is None:
+                    continue  # Completed, or outside the targets' prerequisites
+                waiting_on[dependent] = count = count - 1
+                if not count:
+                    rank = curriculum_rank[dependent]
+                    heapq.heappush(ready, (rank if priority is None else priority(dependent), rank, dependent))
+        return order
+
 # --- Storage and Retrieval Logic (Simplified) ---
 
 class CurriculumContentStore:
     """Manages the curriculum slice and learning content."""
-    def __init__(self, curriculum_data, content_data):
+    def __init__(self, curriculum_data, content_data, lo_index=None, strict_prerequisites=True, version=None):
         self.curriculum = curriculum_data
+        # content_data is read once, so it may be a generator (see from_json_files)
         self.content_library = {item["content_id"]: item for item in content_data}
-        self.lo_to_content_map = self._build_lo_to_content_map(content_data)
+        self.lo_to_content_map = self._build_lo_to_content_map(self.content_library.values())
         self.lo_details_map = {lo["id"]: lo for lo in curriculum_data.get("learning_objectives", [])}
+        self._content_index = None
+        self._search_index = None
+        self._version = version
+        self._frozen = False
+        # Integer index over this store's LO IDs (for LO bitsets); shared process-wide unless one is given
+        self.lo_index = lo_index if lo_index is not None else DEFAULT_LO_INDEX
+        for lo_id in self.lo_details_map:
+            self.lo_index.index_of(lo_id)
+        # Raises PrerequisiteGraphError for cycles (and, when strict, prerequisites outside this slice)
+        self.prerequisite_graph = PrerequisiteGraph(self.get_learning_objectives(), self.lo_index, strict=strict_prerequisites)
+
+    @classmethod
+    def from_json_files(cls, curriculum_path, content_path, **store_kwargs):
+        """Builds a store from a curriculum JSON file and a content JSON array file (as save_to_json writes).
+
+        Content records are streamed and validated one at a time; every problem found in either file
+        is raised together as a content_loader_module.ContentValidationError, with line numbers.
+        Files written by export() may be compressed (.gz/.xz), and their content checksum is verified.
+        """
+        return cls._from_files(curriculum_path, content_path, iter_json_array, store_kwargs)
+
+    @classmethod
+    def from_jsonl(cls, curriculum_path, content_path, **store_kwargs):
+        """As from_json_files(), with the content as JSON Lines (one content item per line)."""
+        return cls._from_files(curriculum_path, content_path, iter_jsonl, store_kwargs)
+
+    @classmethod
+    def _from_files(cls, curriculum_path, content_path, iter_records, store_kwargs):
+        def build(curriculum_data, content_items):
+            return cls(curriculum_data, content_items, **store_kwargs)
+        return load_catalog(curriculum_path, content_path, iter_records, build, DIFFICULTY_ORDER)
+
+    @property
+    def version(self):
+        """Version ID of this store's data: the one it was built with, else a digest of its content."""
+        if self._version is None:
+            canonical = json.dumps([self.curriculum, list(self.content_library.values())], sort_keys=True, separators=(",", ":"), default=str)
+            self._version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        return self._version
+
+    def snapshot(self):
+        """The store to read for one consistent operation (this store; see VersionedContentStore.snapshot)."""
+        return self
+
+    def freeze(self):
+        """Marks the store immutable; add_content then raises. Published snapshots are frozen."""
+        self._frozen = True
+
+    def with_content_changes(self, added=(), removed_content_ids=(), version=None):
+        """Returns a new store with content added/replaced and removed, leaving this one untouched.
+
+        The curriculum, LO details and prerequisite graph are shared with this store; the content
+        library and LO map are copied (references only); content and search indexes are rebuilt
+        lazily in the new store.
+        """
+        store = object.__new__(type(self))
+        store.__dict__.update(self.__dict__)
+        store.content_library = dict(self.content_library)
+        store.lo_to_content_map = {lo_id: list(content_ids) for lo_id, content_ids in self.lo_to_content_map.items()}
+        store._content_index = None
+        store._search_index = None
+        store._version = version
+        store._frozen = False
+        for content_id in removed_content_ids:
+            previous = store.content_library.pop(content_id, None)
+            if previous is not None:
+                for lo_id in previous["learning_objectives_covered"]:
+                    store.lo_to_content_map[lo_id].remove(content_id)
+        for item in added:
+            store.add_content(item)
+        return store
+
+    @property
+    def content_index(self):
+        """The ContentIndex over content_library, built on first use."""
+        if self._content_index is None:
+            self._content_index = ContentIndex(self.content_library.values(), self.lo_details_map)
+        return self._content_index
+
+    @property
+    def search_index(self):
+        """The SearchIndex over this store's LOs and content, built on first use."""
+        if self._search_index is None:
+            self._search_index = build_search_index(self.get_learning_objectives(), self.content_library.values())
+        return self._search_index
+
+    def search(self, query, kind=None, limit=10):
+        """Ranked search over LO descriptions/keywords and content titles.
+
+        Returns up to limit SearchHit(score, kind, item_id), best first; kind restricts results to
+        curriculum_search_module.LO_DOCUMENT or CONTENT_DOCUMENT.
+        """
+        return self.search_index.search(query, kind=kind, limit=limit)
+
+    def add_content(self, item):
+        """Adds (or replaces) a content item, keeping the LO map and search index up to date.
+
+        Only for stores that are not shared; use with_content_changes() for published snapshots.
+        """
+        if self._frozen:
+            raise TypeError("This store is a published snapshot; use with_content_changes() to derive a new version")
+        content_id = item["content_id"]
+        previous = self.content_library.get(content_id)
+        if previous is not None:
+            for lo_id in previous["learning_objectives_covered"]:
+                self.lo_to_content_map[lo_id].remove(content_id)
+        self.content_library[content_id] = item
+        for lo_id in item["learning_objectives_covered"]:
+            self.lo_to_content_map.setdefault(lo_id, []).append(content_id)
+        self._content_index = None  # Rebuilt on next query; positions depend on the whole library's order
+        self._version = None
+        if self._search_index is not None:
+            self._search_index.add_content(item)
 
     def _build_lo_to_content_map(self, content_data):
         """Helper to map learning objectives to content items."""
@@ -144,6 +680,10 @@ class CurriculumContentStore:
         """Retrieves details for a specific learning objective ID."""
         return self.lo_details_map.get(lo_id)
 
+    def get_lo_index(self, lo_id):
+        """Returns the integer bitset index for an LO ID (registering it if unknown)."""
+        return self.lo_index.index_of(lo_id)
+
     def get_content_by_id(self, content_id):
         """Retrieves a content item by its ID."""
         return self.content_library.get(content_id)
@@ -153,8 +693,24 @@ class CurriculumContentStore:
         content_ids = self.lo_to_content_map.get(lo_id, [])
         return [self.get_content_by_id(cid) for cid in content_ids if self.get_content_by_id(cid)]
 
+    def query_content(self, limit=None, **filters):
+        """Returns content matching every filter (see ContentIndex.query), easiest first.
+
+        e.g. query_content(lo_id="Y4MD_LO2", content_type="video", max_difficulty="medium", preference="visual")
+        """
+        return list(self.content_index.query(limit=limit, **filters))
+
+    def export(self, curriculum_filepath, content_filepath, content_format=JSON_FORMAT, compresslevel=None):
+        """Writes the curriculum and content atomically as compact, checksummed JSON (see content_export_module).
+
+        A .gz or .xz suffix compresses a file with gzip or lzma; content_format "jsonl" writes the
+        content as JSON Lines (load it with from_jsonl). Returns the content checksum.
+        """
+        return export_catalog(self.curriculum, self.content_library.values(), curriculum_filepath, content_filepath,
+                              content_format=content_format, compresslevel=compresslevel)
+
     def save_to_json(self, curriculum_filepath="curriculum_slice.json", content_filepath="learning_content.json"):
-        """Saves the curriculum and content data to JSON files."""
+        """Saves the curriculum and content data to pretty-printed JSON files (export() writes compact, atomic, checksummed files)."""
         try:
             with open(curriculum_filepath, "w", encoding="utf-8") as f_curr:
                 json.dump(self.curriculum, f_curr, indent=4)
@@ -190,8 +746,16 @@ if __name__ == "__main__":
         if lo_detail:
             print(f"\nDetails for LO {test_lo_id}: {lo_detail.get('description')}")
             print(f"Prerequisites for {test_lo_id}: {lo_detail.get('prerequisites')}")
+            print(f"Full prerequisite chain for {test_lo_id}: {store.prerequisite_graph.prerequisite_chain(test_lo_id)}")
         else:
             print(f"\nCould not find details for LO {test_lo_id}")
+        print(f"Topological order: {store.prerequisite_graph.topological_order}")
+
+    print("\n--- Testing Content Queries ---")
+    easy_visual = store.query_content(max_difficulty="medium", preference="visual")
+    print(f"Visual content up to medium difficulty: {[item['content_id'] for item in easy_visual]}")
+    logical_quiz = store.query_content(content_type="interactive_quiz", preference="logical", keyword="mental calculation")
+    print(f"Logical quizzes on mental calculation: {[item['content_id'] for item in logical_quiz]}")
 
     prototype_dir = "/home/ubuntu/edpsychconnect_dala_prototype/data"
     os.makedirs(prototype_dir, exist_ok=True)
@@ -9,160 +9,261 @@ This module contains the logic for:
 1.  Generating a learning pathway considering LO prerequisites.
 2.  Selecting content for these LOs based on learner profile preferences, difficulty progression,
     and offering a variety of activities.
+
+Pathway progress is reported as LOProcessedEvent / PathwayGeneratedEvent events (see events_module).
+
+Given a performance_feedback_module.PerformanceTracker, pathways also adapt to performance: LOs the
+student is struggling with (or partially understands) are offered first, content for a mastered LO
+is chosen hardest-first (enrichment), and content types the student performs best with are
+preferred after their stated preferences.
+
+The content store may also be a versioned_store_module.VersionedContentStore: each pathway is
+generated from the one snapshot current when generation started, even if a reload publishes a new
+version meanwhile.
+
+With a pathway_cache_module.PathwayCache, generate_initial_pathway() returns the cached pathway when
+the student's completed LOs, preferences, performance and the catalog version are unchanged. Cached
+pathways are generated with a shuffle seeded by student and catalog version (pathway_rng), so the
+same inputs always give the same pathway.
+
+To generate pathways for a whole class at once, see batch_pathway_module.generate_pathways().
+
+plan_topic_pathway() plans the student's whole remaining topic in one call: every uncompleted LO
+that can be unlocked, including those only unlocked by earlier steps of the plan, in prerequisite
+order with a choice of tie-breaking among LOs that are ready at the same time.
 """
 
 import random
+import events_module
+from events_module import LOProcessedEvent, PathwayGeneratedEvent, UnknownLearningObjectiveEvent
 from hlp_module import LearnerProfile
-from curriculum_content_module import CurriculumContentStore, CURRICULUM_SLICE, LEARNING_CONTENT_SET
+from curriculum_content_module import CurriculumContentStore, ContentIndex, DIFFICULTY_ORDER, CURRICULUM_SLICE, LEARNING_CONTENT_SET
+from performance_feedback_module import NOT_STARTED, STRUGGLING, PARTIAL_UNDERSTANDING, MASTERED
+from pathway_cache_module import pathway_key
+
+ALL_CONTENT_TYPES = ["video", "interactive_quiz", "game", "text_explanation", "worksheet_pdf"]
+# Order in which missing content types are added for variety
+VARIETY_TYPE_PRIORITY = ["game", "interactive_quiz", "video", "worksheet_pdf", "text_explanation"]
 
-# Difficulty mapping for sorting content
-DIFFICULTY_ORDER = {"easy": 1, "medium": 2, "hard": 3, "default": 99}
+# LOs needing remediation are revisited before new ones (lower sorts first)
+MASTERY_PRIORITY = {STRUGGLING: 0, PARTIAL_UNDERSTANDING: 1, NOT_STARTED: 2, MASTERED: 3}
+
+# Tie-breaking among LOs that become ready at the same point of a topic plan
+TIE_BREAK_CURRICULUM = "curriculum"  # Curriculum order
+TIE_BREAK_MASTERY = "mastery"  # MASTERY_PRIORITY, then curriculum order
+TIE_BREAK_RANDOM = "random"  # Shuffled with the given rng
+TIE_BREAK_UNLOCKS = "unlocks"  # LOs that are a prerequisite of the most other LOs first
+
+def pathway_rng(student_id, catalog_version):
+    """A random.Random seeded by student and catalog version (string seeds are stable across processes)."""
+    return random.Random(f"{student_id}|{catalog_version}")
+
+def preferred_content_types(learning_preferences, type_accuracy=None) -> list:
+    """Content types in the order a student should be offered them.
+
+    Stated preferences come first, then (given type_accuracy, content type -> accuracy from a
+    PerformanceTracker) the types the student has done best with, then every other type.
+    """
+    # Determine preferred content types based on learner profile
+    preferred_types_ordered_list = []
+    if learning_preferences.get("visual_task_1") == "visual":
+        preferred_types_ordered_list.extend(["video", "interactive_quiz", "game"])
+    if learning_preferences.get("textual_task_1") == "detailed_text":
+        preferred_types_ordered_list.extend(["text_explanation", "worksheet_pdf"])
+    # Add other types to ensure all are considered, with less preference
+    if type_accuracy is not None:
+        # Content types the student has done best with come next
+        for pt in sorted(type_accuracy, key=type_accuracy.get, reverse=True):
+            if pt not in preferred_types_ordered_list:
+                preferred_types_ordered_list.append(pt)
+    for pt in ALL_CONTENT_TYPES:
+        if pt not in preferred_types_ordered_list:
+            preferred_types_ordered_list.append(pt)
+    return preferred_types_ordered_list
+
+def select_varied_content(content_index, preferred_types, lo_id=None, hardest_first=False, max_activities_per_lo=2) -> list:
+    """Picks up to max_activities_per_lo distinct items from content_index (only lo_id's content, if given).
+
+    One item of each preferred type in order, then missing types for variety, then any remaining
+    items, each pick the easiest (or, with hardest_first, the hardest) still unused.
+    """
+    selected_activities = []
+    used_content_ids = set()
+
+    def take(**filters):
+        item = content_index.first(lo_id=lo_id, hardest_first=hardest_first, exclude=used_content_ids, **filters)
+        if item is not None:
+            selected_activities.append(item)
+            used_content_ids.add(item["content_id"])
+        return item
+
+    # 1. Preference-Driven Selection (Primary Choice): one item of each preferred type, in order
+    for pref_type in preferred_types:
+        if len(selected_activities) >= max_activities_per_lo:
+            break
+        take(content_type=pref_type)
+
+    # 2. Variety-Driven Selection (Fill remaining slots if any)
+    # Ensure we try to get different types if possible
+    current_selected_types = {act["type"] for act in selected_activities}
+    for activity_type in VARIETY_TYPE_PRIORITY:
+        if len(selected_activities) >= max_activities_per_lo:
+            break
+        if activity_type not in current_selected_types and take(content_type=activity_type) is not None:
+            current_selected_types.add(activity_type)
+
+    # 3. Fallback: If still not enough activities, fill with any easiest available unique content
+    while len(selected_activities) < max_activities_per_lo and take() is not None:
+        pass
+
+    return selected_activities[:max_activities_per_lo]
 
 class PathwayGenerator:
     """Generates a learning pathway for a student, considering prerequisites, difficulty, and activity variety."""
-    def __init__(self, learner_profile: LearnerProfile, content_store: CurriculumContentStore):
+    def __init__(self, learner_profile: LearnerProfile, content_store: CurriculumContentStore, performance_tracker=None, pathway_cache=None):
         self.learner_profile = learner_profile
         self.content_store = content_store
+        self.performance_tracker = performance_tracker
+        self.pathway_cache = pathway_cache
+
+    def lo_mastery_status(self, lo_id: str) -> str:
+        """The student's mastery level for an LO from the performance tracker (NOT_STARTED without one)."""
+        if self.performance_tracker is None:
+            return NOT_STARTED
+        return self.performance_tracker.lo_mastery_status(self.learner_profile.student_id, lo_id)
 
     def _is_lo_eligible(self, lo_id: str) -> bool:
         """Checks if a Learning Objective is eligible based on completed prerequisites."""
-        lo_details = self.content_store.get_lo_by_id(lo_id)
-        
-        if not lo_details:
-            print(f"Warning: LO details not found for ID: {lo_id}. Assuming not eligible.")
+        graph = self.content_store.snapshot().prerequisite_graph
+        if lo_id not in graph:
+            sink = events_module.event_sink
+            if sink.enabled:
+                sink.emit(UnknownLearningObjectiveEvent(self.learner_profile.student_id, lo_id))
             return False
-            
-        prerequisites = lo_details.get("prerequisites", [])
-        if not prerequisites:
-            return True
-        
-        for prereq_id in prerequisites:
-            if not self.learner_profile.has_completed_lo(prereq_id):
-                return False
-        return True
-
-    def _select_varied_content_for_lo(self, lo_id: str, available_content_for_lo: list, max_activities_per_lo=2) -> list:
-        """Selects a variety of appropriate content items for an LO."""
-        if not available_content_for_lo:
+        return graph.is_eligible(lo_id, graph.completed_mask(self.learner_profile))
+
+    def _preferred_content_types(self) -> list:
+        """Content types in the order this student should be offered them."""
+        type_accuracy = None
+        if self.performance_tracker is not None:
+            type_accuracy = self.performance_tracker.content_type_accuracy(self.learner_profile.student_id, ALL_CONTENT_TYPES)
+        return preferred_content_types(self.learner_profile.learning_preferences, type_accuracy)
+
+    def _select_varied_content_for_lo(self, lo_id: str, available_content_for_lo: list = None, max_activities_per_lo=2, content_store=None) -> list:
+        """Selects a variety of appropriate content items for an LO.
+
+        Content comes from the ContentIndex of content_store (default: the current snapshot of
+        self.content_store) unless available_content_for_lo is given, so each pick is an indexed
+        lookup instead of a scan of the LO's content.
+        """
+        if available_content_for_lo is None:
+            if content_store is None:
+                content_store = self.content_store.snapshot()
+            content_index, lo_filter = content_store.content_index, lo_id
+        elif not available_content_for_lo:
             return []
+        else:
+            content_index, lo_filter = ContentIndex(available_content_for_lo), None
+        # Mastered LOs being revisited get enrichment (hardest first) instead of the easiest content
+        hardest_first = self.lo_mastery_status(lo_id) == MASTERED
+        return select_varied_content(content_index, self._preferred_content_types(), lo_filter, hardest_first, max_activities_per_lo)
 
-        sorted_content_all = sorted(
-            available_content_for_lo,
-            key=lambda c: DIFFICULTY_ORDER.get(c.get("difficulty", "default").lower(), DIFFICULTY_ORDER["default"])
-        )
-
-        selected_activities = []
-        used_content_ids = set()
-
-        # Determine preferred content types based on learner profile
-        preferred_types_ordered_list = []
-        if self.learner_profile.learning_preferences.get("visual_task_1") == "visual":
-            preferred_types_ordered_list.extend(["video", "interactive_quiz", "game"])
-        if self.learner_profile.learning_preferences.get("textual_task_1") == "detailed_text":
-            preferred_types_ordered_list.extend(["text_explanation", "worksheet_pdf"])
-        # Add other types to ensure all are considered, with less preference
-        all_possible_types = ["video", "interactive_quiz", "game", "text_explanation", "worksheet_pdf"]
-        for pt in all_possible_types:
-            if pt not in preferred_types_ordered_list:
-                preferred_types_ordered_list.append(pt)
-        
-        # 1. Preference-Driven Selection (Primary Choice)
-        for pref_type in preferred_types_ordered_list:
-            if len(selected_activities) >= max_activities_per_lo:
-                break
-            for item in sorted_content_all:
-                if item["type"] == pref_type and item["content_id"] not in used_content_ids:
-                    selected_activities.append(item)
-                    used_content_ids.add(item["content_id"])
-                    break # Found one of this preferred type, move to next preferred type or variety selection
-            if len(selected_activities) > 0 and selected_activities[-1]["type"] == pref_type: # if we just added one of this type
-                continue # try to get a *different* preferred type next if possible
-        
-        # 2. Variety-Driven Selection (Fill remaining slots if any)
-        # Ensure we try to get different types if possible
-        current_selected_types = {act["type"] for act in selected_activities}
-        general_type_priority_for_variety = ["game", "interactive_quiz", "video", "worksheet_pdf", "text_explanation"]
-
-        if len(selected_activities) < max_activities_per_lo:
-            for activity_type in general_type_priority_for_variety:
-                if len(selected_activities) >= max_activities_per_lo:
-                    break
-                if activity_type not in current_selected_types: # Only add if it's a new type
-                    for item in sorted_content_all:
-                        if item["type"] == activity_type and item["content_id"] not in used_content_ids:
-                            selected_activities.append(item)
-                            used_content_ids.add(item["content_id"])
-                            current_selected_types.add(activity_type)
-                            break # Found one of this type for variety
-
-        # 3. Fallback: If still not enough activities, fill with any easiest available unique content
-        if len(selected_activities) < max_activities_per_lo:
-            for item in sorted_content_all:
-                if len(selected_activities) >= max_activities_per_lo:
-                    break
-                if item["content_id"] not in used_content_ids:
-                    selected_activities.append(item)
-                    used_content_ids.add(item["content_id"])
-                    # No need to update current_selected_types here as we are just filling up
-
-        # If nothing selected despite content (should be rare with fallbacks), pick the absolute easiest one.
-        if not selected_activities and sorted_content_all:
-            selected_activities.append(sorted_content_all[0])
-
-        return selected_activities[:max_activities_per_lo]
-
-    def generate_pathway_with_prerequisites(self, max_los=3, max_activities_per_lo=2):
+    def generate_pathway_with_prerequisites(self, max_los=3, max_activities_per_lo=2, rng=None, content_store=None):
         """
         Generates a learning pathway by selecting eligible LOs based on prerequisites
         and then selecting a variety of content for these LOs, considering difficulty.
         Returns a list of tuples: (lo_data_dict, list_of_content_item_dicts)
+        Eligible LOs are shuffled with rng (default: the random module); content_store pins a
+        snapshot (default: the current one).
         """
-        print(f"\n--- Generating Pathway (Prerequisites, Difficulty, Variety) for {self.learner_profile.student_id} ---")
-        all_learning_objectives = self.content_store.get_learning_objectives()
+        sink = events_module.event_sink
+        student_id = self.learner_profile.student_id
+        if content_store is None:
+            content_store = self.content_store.snapshot()  # One version for the whole pathway
+        all_learning_objectives = content_store.get_learning_objectives()
         generated_pathway_tuples = [] # Stores (lo_dict, content_list) tuples
 
         if not all_learning_objectives:
-            print("No learning objectives found in the curriculum store.")
+            if sink.enabled:
+                sink.emit(PathwayGeneratedEvent(student_id, ()))
             return generated_pathway_tuples
 
-        candidate_los = [lo for lo in all_learning_objectives if not self.learner_profile.has_completed_lo(lo['id'])]
-        
-        potential_next_los = []
-        for lo_data in candidate_los:
-            if self._is_lo_eligible(lo_data['id']):
-                potential_next_los.append(lo_data)
-        
-        random.shuffle(potential_next_los)
+        # Not yet completed and every prerequisite completed, via the store's compiled prerequisite graph
+        graph = content_store.prerequisite_graph
+        completed_mask = graph.completed_mask(self.learner_profile)
+        potential_next_los = [lo for lo in all_learning_objectives if graph.is_available(lo['id'], completed_mask)]
+
+        (random if rng is None else rng).shuffle(potential_next_los)
+        if self.performance_tracker is not None:
+            potential_next_los.sort(key=lambda lo: MASTERY_PRIORITY[self.lo_mastery_status(lo['id'])])
         selected_los_for_this_pathway = potential_next_los[:min(len(potential_next_los), max_los)]
 
         for lo_data in selected_los_for_this_pathway:
-            print(f"Processing LO: {lo_data['id']} - {lo_data['description']}")
-            available_content = self.content_store.get_content_for_lo(lo_data['id'])
-            
-            selected_activity_list = self._select_varied_content_for_lo(lo_data['id'], available_content, max_activities_per_lo)
-            
-            if selected_activity_list:
-                print(f"  Selected activities for LO {lo_data['id']}:")
-                for act_item in selected_activity_list:
-                    print(f"    - {act_item['title']} (Type: {act_item['type']}, Difficulty: {act_item['difficulty']})")
-                generated_pathway_tuples.append((lo_data, selected_activity_list))
-            else:
-                print(f"  No suitable content found for LO: {lo_data['id']}")
-                generated_pathway_tuples.append((lo_data, []))
+            selected_activity_list = self._select_varied_content_for_lo(lo_data['id'], max_activities_per_lo=max_activities_per_lo, content_store=content_store)
+            generated_pathway_tuples.append((lo_data, selected_activity_list))
+            if sink.enabled:
+                sink.emit(LOProcessedEvent(student_id, lo_data['id'], tuple(item['content_id'] for item in selected_activity_list)))
         
-        if not generated_pathway_tuples:
-            print("No eligible Learning Objectives could be added to the pathway at this time.")
-        print("--- Pathway Generation Complete ---")
+        if sink.enabled:
+            sink.emit(PathwayGeneratedEvent(student_id, tuple(lo_data['id'] for lo_data, _ in generated_pathway_tuples)))
         return generated_pathway_tuples
 
+    def plan_topic_pathway(self, tie_break=TIE_BREAK_CURRICULUM, max_activities_per_lo=2, target_lo_ids=None, rng=None, content_store=None):
+        """
+        Plans every remaining LO of the topic in one call: each uncompleted LO whose prerequisites are
+        completed or planned earlier, in prerequisite order, with content selected for each.
+        Returns a list of (lo_data_dict, list_of_content_item_dicts) tuples, like
+        generate_pathway_with_prerequisites().
+        tie_break orders LOs that are ready at the same time: one of the TIE_BREAK_* names, or a
+        function lo_data -> sort key (ties in curriculum order). TIE_BREAK_RANDOM draws from rng
+        (default: the random module). With target_lo_ids, only those LOs and the prerequisites
+        still needed to reach them are planned; an unknown target raises PrerequisiteGraphError.
+        max_activities_per_lo=0 plans the LO order alone.
+        """
+        sink = events_module.event_sink
+        student_id = self.learner_profile.student_id
+        if content_store is None:
+            content_store = self.content_store.snapshot()  # One version for the whole plan
+        graph = content_store.prerequisite_graph
+        if tie_break == TIE_BREAK_CURRICULUM:
+            priority = None
+        elif tie_break == TIE_BREAK_MASTERY:
+            priority = lambda lo_id: MASTERY_PRIORITY[self.lo_mastery_status(lo_id)]
+        elif tie_break == TIE_BREAK_RANDOM:
+            priority = lambda lo_id, draw=(random if rng is None else rng).random: draw()
+        elif tie_break == TIE_BREAK_UNLOCKS:
+            priority = lambda lo_id: -len(graph.dependents(lo_id))
+        elif callable(tie_break):
+            priority = lambda lo_id: tie_break(content_store.get_lo_by_id(lo_id))
+        else:
+            raise ValueError(f"Unknown tie_break {tie_break!r} (expected one of "
+                             f"{TIE_BREAK_CURRICULUM!r}, {TIE_BREAK_MASTERY!r}, {TIE_BREAK_RANDOM!r}, {TIE_BREAK_UNLOCKS!r} or a function)")
+
+        planned_pathway_tuples = []
+        for lo_id in graph.plan_order(graph.completed_mask(self.learner_profile), priority, target_lo_ids):
+            lo_data = content_store.get_lo_by_id(lo_id)
+            if max_activities_per_lo:
+                selected_activity_list = self._select_varied_content_for_lo(lo_id, max_activities_per_lo=max_activities_per_lo, content_store=content_store)
+            else:
+                selected_activity_list = []
+            planned_pathway_tuples.append((lo_data, selected_activity_list))
+            if sink.enabled:
+                sink.emit(LOProcessedEvent(student_id, lo_id, tuple(item['content_id'] for item in selected_activity_list)))
+
+        if sink.enabled:
+            sink.emit(PathwayGeneratedEvent(student_id, tuple(lo_data['id'] for lo_data, _ in planned_pathway_tuples)))
+        return planned_pathway_tuples
+
     def generate_initial_pathway(self, target_lo_count=3, max_activities_per_lo=2):
         """
         Generates an initial learning pathway, typically for when a student starts or needs a new set of LOs.
         This is essentially a wrapper for generate_pathway_with_prerequisites with specific defaults.
         Returns a list of LearningObjective-like objects (dictionaries) with their content items for the interface.
         """
-        print(f"\n--- Generating Initial Pathway (target_lo_count={target_lo_count}) for {self.learner_profile.student_id} ---")
-        pathway_tuples = self.generate_pathway_with_prerequisites(max_los=target_lo_count, max_activities_per_lo=max_activities_per_lo)
+        if self.pathway_cache is None:
+            pathway_tuples = self.generate_pathway_with_prerequisites(max_los=target_lo_count, max_activities_per_lo=max_activities_per_lo)
+        else:
+            pathway_tuples = self._cached_pathway(target_lo_count, max_activities_per_lo)
         
         # Transform the (lo_dict, content_list) tuples into the structure expected by the interface
         # (list of LO-like dicts, where each LO-like dict has a 'content_items' key)
@@ -170,11 +271,23 @@ class PathwayGenerator:
         for lo_data, content_list in pathway_tuples:
             # Create a new dictionary to avoid modifying the original lo_data if it's shared
             lo_for_interface = lo_data.copy()
-            lo_for_interface['content_items'] = content_list
+            lo_for_interface['content_items'] = list(content_list)  # The tuples may be shared via the pathway cache
             interface_pathway.append(lo_for_interface)
             
         return interface_pathway
 
+    def _cached_pathway(self, max_los, max_activities_per_lo):
+        """generate_pathway_with_prerequisites() through the pathway cache (seeded shuffle; no events on a hit)."""
+        content_store = self.content_store.snapshot()
+        key = pathway_key(self.learner_profile, content_store.version, self.performance_tracker, max_los, max_activities_per_lo)
+        pathway_tuples = self.pathway_cache.get(key)
+        if pathway_tuples is None:
+            pathway_tuples = self.generate_pathway_with_prerequisites(
+                max_los, max_activities_per_lo, rng=pathway_rng(key.student_id, key.catalog_version), content_store=content_store
+            )
+            self.pathway_cache.put(key, pathway_tuples)
+        return pathway_tuples
+
     def display_pathway(self, pathway_to_display, student_id):
         print(f"\n--- Learning Pathway for {student_id} ---")
         if not pathway_to_display:
@@ -204,6 +317,7 @@ class PathwayGenerator:
         print("--------------------------------------")
 
 if __name__ == "__main__":
+    events_module.enable_console_events()
     print("--- Initializing DALA DCW-APG Module Prototype (with Varied Activities) ---")
     
     content_store_instance = CurriculumContentStore(curriculum_data=CURRICULUM_SLICE, content_data=LEARNING_CONTENT_SET)
@@ -250,5 +364,12 @@ if __name__ == "__main__":
     pathway_gen4.display_pathway(generated_pathway4, student4_profile.student_id)
 
 
+    # Test Case 5: Whole-topic plan (Y4MD_LO4 is planned once Y4MD_LO2 and Y4MD_LO3 are)
+    student5_profile = LearnerProfile(student_id="student_variety_005")
+    student5_profile.mark_lo_completed("Y4MD_LO1")
+    print("\nSimulated Learner Profile (Student 5 - Y4MD_LO1 completed, whole-topic plan):")
+    pathway_gen5 = PathwayGenerator(learner_profile=student5_profile, content_store=content_store_instance)
+    pathway_gen5.display_pathway(pathway_gen5.plan_topic_pathway(tie_break=TIE_BREAK_UNLOCKS, max_activities_per_lo=1), student5_profile.student_id)
+
     print("\n--- DCW-APG Module Varied Activities Test Complete ---")
 
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Events Module
+
+This module contains the logic for:
+1.  Structured events raised by the HLP and DCW-APG hot paths (profile changes, badge awards and
+    badge problems, diagnostic tasks, processed LOs and generated pathways) and by curriculum content reloads.
+2.  Pluggable event sinks: a null sink (the default), a buffered batching sink, a logging sink and
+    a fan-out sink that delivers each event to several sinks (e.g. logging plus cache invalidation).
+
+Hot paths check `event_sink.enabled` before building an event, so with the default NullEventSink
+no event objects are created and no I/O happens. Subscribe with set_event_sink().
+"""
+
+import logging
+import sys
+import threading
+from collections import namedtuple
+
+# --- Event Types ---
+class ProfileChangedEvent(namedtuple("ProfileChangedEvent", ["student_id", "field", "key", "value", "timestamp"], defaults=(None,))):
+    """A LearnerProfile field changed.
+
+    key is the preference name for learning_preferences and a (task_name, metric_name) tuple for
+    cognitive_metrics; it is None when value was added to a collection. timestamp is set for numeric
+    cognitive metrics to the time recorded in the metric's history, and is None otherwise.
+    """
+    __slots__ = ()
+
+    def describe(self):
+        if self.key is None:
+            return f"Profile for {self.student_id}: {self.value!r} added to {self.field}"
+        key = ".".join(self.key) if type(self.key) is tuple else self.key
+        return f"Profile for {self.student_id}: {self.field} '{key}' set to {self.value!r}"
+
+class BadgeAwardedEvent(namedtuple("BadgeAwardedEvent", ["student_id", "badge_id", "badge_name", "date_earned"])):
+    __slots__ = ()
+
+    def describe(self):
+        return f"Profile for {self.student_id}: Badge '{self.badge_name}' earned!"
+
+class BadgeProblemEvent(namedtuple("BadgeProblemEvent", ["student_id", "badge_id", "message"])):
+    """A badge could not be checked or awarded (unknown badge ID, unresolvable criteria)."""
+    __slots__ = ()
+
+    def describe(self):
+        return f"Warning: {self.message}"
+
+class DiagnosticTaskEvent(namedtuple("DiagnosticTaskEvent", ["student_id", "task_name"])):
+    """An HLP diagnostic task or capture step started for a student."""
+    __slots__ = ()
+
+    def describe(self):
+        return f"Running '{self.task_name}' for {self.student_id}..."
+
+class LOProcessedEvent(namedtuple("LOProcessedEvent", ["student_id", "lo_id", "content_ids"])):
+    """Pathway generation selected content for an LO (content_ids is empty if none was suitable)."""
+    __slots__ = ()
+
+    def describe(self):
+        if not self.content_ids:
+            return f"Processed LO {self.lo_id} for {self.student_id}: no suitable content found"
+        return f"Processed LO {self.lo_id} for {self.student_id}: selected {', '.join(self.content_ids)}"
+
+class UnknownLearningObjectiveEvent(namedtuple("UnknownLearningObjectiveEvent", ["student_id", "lo_id"])):
+    """Pathway generation was asked about an LO the curriculum does not define; it is treated as not eligible."""
+    __slots__ = ()
+
+    def describe(self):
+        return f"Warning: LO details not found for ID: {self.lo_id}. Assuming not eligible."
+
+class PathwayGeneratedEvent(namedtuple("PathwayGeneratedEvent", ["student_id", "lo_ids"])):
+    __slots__ = ()
+
+    def describe(self):
+        if not self.lo_ids:
+            return f"Pathway for {self.student_id}: no eligible Learning Objectives at this time"
+        return f"Pathway for {self.student_id}: {', '.join(self.lo_ids)}"
+
+class CatalogVersionChangedEvent(namedtuple("CatalogVersionChangedEvent", ["old_version", "new_version"])):
+    """A VersionedContentStore published a new curriculum/content snapshot."""
+    __slots__ = ()
+
+    def describe(self):
+        return f"Curriculum content updated: version {self.old_version} -> {self.new_version}"
+
+# --- Event Sinks ---
+class NullEventSink:
+    """Discards everything. Hot paths skip event construction entirely when this sink is installed."""
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class BufferedEventSink:
+    """Collects events and hands them to flush_callback in batches of up to max_batch_size.
+
+    Call flush() (or close()) to deliver a partial batch, e.g. at the end of a request.
+    """
+    enabled = True
+
+    def __init__(self, flush_callback, max_batch_size=1000):
+        self.flush_callback = flush_callback
+        self.max_batch_size = max_batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) < self.max_batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self.flush_callback(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self.flush_callback(batch)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class LoggingEventSink:
+    """Writes each event's description to a logger (default: the "dala.events" logger)."""
+    enabled = True
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("dala.events")
+        self.level = level
+
+    def emit(self, event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, event.describe())
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class FanOutEventSink:
+    """Delivers each event to every enabled sink given, in order; disabled when none is enabled."""
+    def __init__(self, *sinks):
+        self.sinks = tuple(sink for sink in sinks if sink is not None and sink.enabled)
+        self.enabled = bool(self.sinks)
+
+    def emit(self, event):
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+# --- Current Sink ---
+event_sink = NullEventSink()
+
+def set_event_sink(sink):
+    """Installs the sink that receives all events and returns the previously installed one."""
+    global event_sink
+    previous_sink = event_sink
+    event_sink = sink if sink is not None else NullEventSink()
+    return previous_sink
+
+def get_event_sink():
+    return event_sink
+
+def enable_console_events(level=logging.INFO):
+    """Routes events to stdout through a LoggingEventSink; used by the modules' demo entry points."""
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+    return set_event_sink(LoggingEventSink(level=level))
@@ -10,6 +10,18 @@ This module contains the logic for:
 5.  New sophisticated diagnostic mini-tasks (Stage 2).
 6.  Tracking completed Learning Objectives (LOs) for prerequisite logic.
 7.  Badge and achievement system (Stage 2).
+8.  Badges with declarative criteria, compiled via badge_rules_module.
+9.  A memory-compact profile (CompactLearnerProfile) for holding large cohorts.
+10. Bounded per-metric history (cognitive_metric_history) alongside the latest values.
+
+Profile changes, badge awards and diagnostic task starts are reported as structured events
+(see events_module) rather than printed; nothing is emitted unless a sink is installed.
+
+Profiles store earned badges as {badge_id: date_earned}; badge details are resolved from
+BADGE_DEFINITIONS on read (earned_badges_data) rather than copied into every profile.
+
+cognitive_metrics always holds each metric's latest value; numeric metrics are also appended to a
+MetricSeries ring buffer in cognitive_metric_history for trend summaries (see metric_series_module).
 """
 
 import random
@@ -17,9 +29,18 @@ import time
 import sys
 import inspect
 import datetime # Added for timestamping earned badges
+from collections.abc import Set as AbstractSet
+from types import MappingProxyType
+from curriculum_content_module import DEFAULT_LO_INDEX
+from metric_series_module import MetricSeries, DEFAULT_METRIC_HISTORY_CAPACITY, is_numeric_metric
+from badge_rules_module import compile_rule, validate_badge_definition, BadgeRuleError
+import events_module
+from events_module import ProfileChangedEvent, BadgeAwardedEvent, BadgeProblemEvent, DiagnosticTaskEvent
 
 # --- Badge Definitions ---
 # Defines all available badges, their properties, and how to check their criteria.
+# A badge names a hand-written "criteria_check_function" in this module, or carries a declarative
+# "criteria" rule (see badge_rules_module) that is compiled once when the badge engine is built.
 BADGE_DEFINITIONS = {
     "trailblazer": {
         "id": "trailblazer",
@@ -58,19 +79,250 @@ BADGE_DEFINITIONS = {
     }
 }
 
-class LearnerProfile:
-    """Represents a basic learner profile."""
-    def __init__(self, student_id):
-        self.student_id = student_id
-        self.learning_preferences = {} # Stores preferences like {"visual_task_1": "visual"}
-        self.interests = []
-        self.struggle_areas = []
-        self.cognitive_metrics = {} # For new diagnostic tasks e.g. {"story_weaver": {"accuracy": 0.8}}
-        self.completed_los = set()  # For tracking completed Learning Objectives
-        self.current_learning_objective_id = None # Added for pathway tracking
-        # Stores detailed data for earned badges, keyed by badge_id
-        # Example: {"trailblazer": {"id": "trailblazer", "name": "Trailblazer", ..., "date_earned": "..."}}
-        self.earned_badges_data = {} 
+def utc_timestamp():
+    """Returns the current UTC time as an ISO 8601 string with a trailing "Z"."""
+    return datetime.datetime.utcnow().isoformat() + "Z"
+
+# Supplies date_earned for newly awarded badges; see set_badge_clock
+_badge_clock = utc_timestamp
+
+def set_badge_clock(clock):
+    """Installs the zero-argument function that timestamps badge awards and returns the previous one.
+
+    None restores the wall clock. Cohort runs install a fixed timestamp so results are reproducible.
+    """
+    global _badge_clock
+    previous_clock = _badge_clock
+    _badge_clock = clock if clock is not None else utc_timestamp
+    return previous_clock
+
+# Supplies the timestamp (seconds since the epoch) for cognitive metric history; see set_metric_clock
+_metric_clock = time.time
+
+def set_metric_clock(clock):
+    """Installs the zero-argument function that timestamps metric history entries and returns the previous one.
+
+    None restores time.time. Cohort runs install a fixed timestamp so results are reproducible.
+    """
+    global _metric_clock
+    previous_clock = _metric_clock
+    _metric_clock = clock if clock is not None else time.time
+    return previous_clock
+
+# Version of the dictionaries produced by to_dict(); see migrate_profile_dict for older versions
+PROFILE_SCHEMA_VERSION = 3
+
+def resolve_earned_badges(earned_badges, badge_definitions=None):
+    """Expands {badge_id: date_earned} into full badge details using the shared badge definitions."""
+    if badge_definitions is None:
+        badge_definitions = BADGE_DEFINITIONS
+    resolved = {}
+    for badge_id, date_earned in earned_badges.items():
+        badge_info = dict(badge_definitions.get(badge_id) or {"id": badge_id, "name": badge_id})
+        badge_info["date_earned"] = date_earned
+        resolved[badge_id] = badge_info
+    return resolved
+
+def migrate_profile_dict(profile_dict):
+    """Upgrades a serialized profile dictionary to PROFILE_SCHEMA_VERSION. Returns a new dictionary.
+
+    Version 1 (no "schema_version") stored a full copy of each earned badge's definition under
+    "earned_badges_data"; version 2 keeps only {badge_id: date_earned} under "earned_badges".
+    Version 3 adds "cognitive_metric_history": {task: {metric: [[timestamp, value], ...]}}.
+    """
+    version = profile_dict.get("schema_version", 1)
+    if version > PROFILE_SCHEMA_VERSION:
+        raise ValueError(f"Profile schema version {version} is newer than supported version {PROFILE_SCHEMA_VERSION}")
+    migrated = dict(profile_dict)
+    if version < 2:
+        earned_badges_data = migrated.pop("earned_badges_data", None) or {}
+        migrated["earned_badges"] = {
+            badge_id: badge_info.get("date_earned") if isinstance(badge_info, dict) else badge_info
+            for badge_id, badge_info in earned_badges_data.items()
+        }
+    if version < 3:
+        migrated["cognitive_metric_history"] = {}
+    migrated["schema_version"] = PROFILE_SCHEMA_VERSION
+    return migrated
+
+# Profile fields that only ever grow; patches list the items added since the last checkpoint
+_APPENDED_FIELDS = ("interests", "struggle_areas", "completed_los")
+_MERGED_FIELDS = ("learning_preferences", "earned_badges")
+
+def apply_profile_patch(profile_dict, patch):
+    """Applies a patch from BaseLearnerProfile.checkpoint() to a to_dict() dictionary. Returns a new dictionary.
+
+    Patches hold only what changed: items appended to list fields, keys set in dictionary fields
+    (cognitive_metrics is merged per task) and replaced scalar fields.
+    """
+    if patch.get("schema_version", PROFILE_SCHEMA_VERSION) > PROFILE_SCHEMA_VERSION:
+        raise ValueError(f"Patch schema version {patch['schema_version']} is newer than supported version {PROFILE_SCHEMA_VERSION}")
+    patched = migrate_profile_dict(profile_dict)
+    for field_name, change in patch.items():
+        if field_name in ("student_id", "schema_version"):
+            continue
+        if field_name in _APPENDED_FIELDS:
+            items = list(patched.get(field_name) or ())
+            existing = set(items)
+            items += [item for item in change if item not in existing]
+            patched[field_name] = items
+        elif field_name in _MERGED_FIELDS:
+            patched[field_name] = {**(patched.get(field_name) or {}), **change}
+        elif field_name == "cognitive_metrics":
+            metrics = dict(patched.get(field_name) or {})
+            for task_name, task_metrics in change.items():
+                metrics[task_name] = {**metrics.get(task_name, {}), **task_metrics}
+            patched[field_name] = metrics
+        elif field_name == "cognitive_metric_history":
+            # Samples are appended; from_dict keeps only each series' newest `capacity` samples
+            history = {task_name: dict(series) for task_name, series in (patched.get(field_name) or {}).items()}
+            for task_name, task_samples in change.items():
+                task_history = history.setdefault(task_name, {})
+                for metric_name, samples in task_samples.items():
+                    task_history[metric_name] = list(task_history.get(metric_name, ())) + [list(sample) for sample in samples]
+            patched[field_name] = history
+        else:
+            patched[field_name] = change
+    return patched
+
+# Marker for "no fields changed since the last badge check"; replaced by a real set on first change
+_NO_CHANGED_FIELDS = frozenset()
+# Marker for "no changes since the last checkpoint"; replaced by a real dict on first change
+_NO_PENDING_CHANGES = MappingProxyType({})
+
+class BaseLearnerProfile:
+    """Behaviour shared by LearnerProfile and CompactLearnerProfile.
+
+    Subclasses provide the storage: the profile attributes plus _add_completed_lo / has_completed_lo.
+    """
+    __slots__ = ()
+
+    # Samples kept per numeric metric in cognitive_metric_history; override per class if needed
+    metric_history_capacity = DEFAULT_METRIC_HISTORY_CAPACITY
+
+    def _mark_changed(self, field_name, key=None, value=None, emit_event=True, timestamp=None):
+        """Records that a profile field changed so dependent badges are re-checked, and emits an event."""
+        changed_fields = self._changed_badge_fields
+        if changed_fields is _NO_CHANGED_FIELDS:
+            self._changed_badge_fields = {field_name}
+        elif changed_fields is not None:
+            changed_fields.add(field_name)
+        if not emit_event:
+            return
+        sink = events_module.event_sink
+        if sink.enabled:
+            sink.emit(ProfileChangedEvent(self.student_id, field_name, key, value, timestamp))
+
+    def consume_changed_badge_fields(self):
+        """Returns the fields changed since the last badge check (None if unknown) and resets tracking."""
+        changed_fields = self._changed_badge_fields
+        self._changed_badge_fields = _NO_CHANGED_FIELDS
+        return changed_fields
+
+    def _record_change(self, field_name, key=None, value=None):
+        """Adds a change to the pending patch (see checkpoint). No-op until the profile has a checkpoint."""
+        pending = self._pending_changes
+        if pending is None:
+            return  # Never checkpointed: the next save writes the whole profile anyway
+        if pending is _NO_PENDING_CHANGES:
+            pending = self._pending_changes = {}
+        if field_name in _APPENDED_FIELDS:
+            pending.setdefault(field_name, []).append(value)
+        elif field_name in _MERGED_FIELDS:
+            pending.setdefault(field_name, {})[key] = value
+        elif field_name == "cognitive_metrics":
+            task_name, metric_name = key
+            pending.setdefault(field_name, {}).setdefault(task_name, {})[metric_name] = value
+        elif field_name == "cognitive_metric_history":
+            task_name, metric_name = key
+            pending.setdefault(field_name, {}).setdefault(task_name, {}).setdefault(metric_name, []).append(value)
+        else:
+            pending[field_name] = value
+
+    @property
+    def dirty_fields(self):
+        """Fields changed since the last checkpoint, or None if the profile has never been checkpointed."""
+        pending = self._pending_changes
+        return None if pending is None else frozenset(pending)
+
+    def pending_patch(self):
+        """Returns the changes since the last checkpoint as a patch, or None if there is no checkpoint.
+
+        A patch is a partial to_dict(): e.g. {"student_id": "s1", "schema_version": 2,
+        "completed_los": ["MA4_N1b"], "cognitive_metrics": {"story_weaver": {"attempts": 2}}}.
+        Apply it with apply_profile_patch.
+        """
+        pending = self._pending_changes
+        if pending is None:
+            return None
+        patch = {"student_id": self.student_id, "schema_version": PROFILE_SCHEMA_VERSION}
+        for field_name, change in pending.items():
+            if field_name == "cognitive_metrics":
+                patch[field_name] = {task_name: dict(task_metrics) for task_name, task_metrics in change.items()}
+            elif field_name == "cognitive_metric_history":
+                patch[field_name] = {
+                    task_name: {metric_name: [list(sample) for sample in samples] for metric_name, samples in task_samples.items()}
+                    for task_name, task_samples in change.items()
+                }
+            elif isinstance(change, (list, dict)):
+                patch[field_name] = change.copy()
+            else:
+                patch[field_name] = change
+        return patch
+
+    def checkpoint(self):
+        """Returns pending_patch() and starts tracking changes afresh from the current state.
+
+        Call after persisting the profile (in full, or by storing the returned patch).
+        """
+        patch = self.pending_patch()
+        self.clear_pending_changes()
+        return patch
+
+    def clear_pending_changes(self):
+        """Starts tracking changes afresh from the current state, e.g. once a pending_patch() is stored."""
+        self._pending_changes = _NO_PENDING_CHANGES
+
+    def restore_pending_changes(self, patch):
+        """Puts a patch returned by checkpoint() back ahead of the changes made since, e.g. when storing it failed.
+
+        A None patch (the profile had no checkpoint) drops the checkpoint again, so the next save is a full one.
+        """
+        newer = self._pending_changes
+        if patch is None or newer is None:
+            self._pending_changes = None
+            return
+        restored = {}
+        for changes in (patch, newer):
+            for field_name, change in changes.items():
+                if field_name in ("student_id", "schema_version"):
+                    continue
+                if field_name in _APPENDED_FIELDS:
+                    restored.setdefault(field_name, []).extend(change)
+                elif field_name in _MERGED_FIELDS:
+                    restored.setdefault(field_name, {}).update(change)
+                elif field_name == "cognitive_metrics":
+                    for task_name, task_metrics in change.items():
+                        restored.setdefault(field_name, {}).setdefault(task_name, {}).update(task_metrics)
+                elif field_name == "cognitive_metric_history":
+                    for task_name, task_samples in change.items():
+                        for metric_name, samples in task_samples.items():
+                            restored.setdefault(field_name, {}).setdefault(task_name, {}).setdefault(metric_name, []).extend(
+                                tuple(sample) for sample in samples)
+                else:
+                    restored[field_name] = change
+        self._pending_changes = restored or _NO_PENDING_CHANGES
+
+    @property
+    def current_learning_objective_id(self):
+        return self._current_learning_objective_id
+
+    @current_learning_objective_id.setter
+    def current_learning_objective_id(self, lo_id):
+        if lo_id != self._current_learning_objective_id:
+            self._current_learning_objective_id = lo_id
+            self._mark_changed("current_learning_objective_id", None, lo_id)
+            self._record_change("current_learning_objective_id", None, lo_id)
 
     def to_dict(self):
         """Returns a dictionary representation of the learner profile for serialization."""
@@ -80,105 +332,494 @@ class LearnerProfile:
             "interests": self.interests,
             "struggle_areas": self.struggle_areas,
             "cognitive_metrics": self.cognitive_metrics,
-            "completed_los": list(self.completed_los),  # Convert set to list for JSON
+            "cognitive_metric_history": {
+                task_name: {metric_name: series.to_list() for metric_name, series in task_history.items()}
+                for task_name, task_history in self.cognitive_metric_history.items()
+            },
+            "completed_los": sorted(self.completed_los),  # Sorted list: set order varies between processes
             "current_learning_objective_id": self.current_learning_objective_id,
-            "earned_badges_data": self.earned_badges_data
+            "earned_badges": dict(self.earned_badges),
+            "schema_version": PROFILE_SCHEMA_VERSION
         }
 
+    @classmethod
+    def from_dict(cls, profile_dict, **kwargs):
+        """Rebuilds a profile from to_dict() output (any schema version); kwargs go to the constructor.
+
+        No events are emitted and no badges are checked while loading. The loaded state is the
+        profile's checkpoint, so pending_patch() afterwards holds only later changes.
+        """
+        profile_dict = migrate_profile_dict(profile_dict)
+        profile = cls(profile_dict["student_id"], **kwargs)
+        profile._load_state(profile_dict)
+        profile._pending_changes = _NO_PENDING_CHANGES
+        return profile
+
     def update_preference(self, task_name, preference):
         """Updates a learning preference based on a diagnostic task."""
         self.learning_preferences[task_name] = preference
-        print(f"Profile for {self.student_id}: Preference for {task_name} updated to {preference}")
+        self._mark_changed("learning_preferences", task_name, preference)
+        self._record_change("learning_preferences", task_name, preference)
 
     def add_interest(self, interest):
         """Adds an interest to the profile."""
         if interest not in self.interests:
             self.interests.append(interest)
-            print(f"Profile for {self.student_id}: Interest '{interest}' added.")
+            self._mark_changed("interests", None, interest)
+            self._record_change("interests", None, interest)
 
     def add_struggle_area(self, area):
         """Adds a struggle area to the profile."""
         if area not in self.struggle_areas:
             self.struggle_areas.append(area)
-            print(f"Profile for {self.student_id}: Struggle area '{area}' added.")
+            self._mark_changed("struggle_areas", None, area)
+            self._record_change("struggle_areas", None, area)
+
+    def add_cognitive_metric(self, task_name, metric_name, value, timestamp=None):
+        """Adds a metric from a sophisticated diagnostic task or simple preference tasks.
 
-    def add_cognitive_metric(self, task_name, metric_name, value):
-        """Adds a metric from a sophisticated diagnostic task or simple preference tasks."""
+        cognitive_metrics keeps the latest value; numeric values are also appended, with timestamp
+        (default: the metric clock, normally now), to the metric's history.
+        """
         if task_name not in self.cognitive_metrics:
             self.cognitive_metrics[task_name] = {}
         self.cognitive_metrics[task_name][metric_name] = value
-        print(f"Profile for {self.student_id}: Cognitive metric for {task_name} - {metric_name} updated to {value}")
+        numeric = is_numeric_metric(value)
+        if numeric and timestamp is None:
+            timestamp = _metric_clock()
+        self._mark_changed("cognitive_metrics", (task_name, metric_name), value, timestamp=timestamp if numeric else None)
+        self._record_change("cognitive_metrics", (task_name, metric_name), value)
+        if numeric:
+            self._metric_series_for_update(task_name, metric_name).append(timestamp, value)
+            self._record_change("cognitive_metric_history", (task_name, metric_name), (timestamp, value))
+
+    def _metric_series_for_update(self, task_name, metric_name):
+        task_history = self.cognitive_metric_history.get(task_name)
+        if task_history is None:
+            task_history = self.cognitive_metric_history[task_name] = {}
+        series = task_history.get(metric_name)
+        if series is None:
+            series = task_history[metric_name] = MetricSeries(self.metric_history_capacity)
+        return series
+
+    def metric_series(self, task_name, metric_name):
+        """The MetricSeries for a numeric metric (summaries: last, mean, slope, percentile), or None."""
+        return self.cognitive_metric_history.get(task_name, {}).get(metric_name)
+
+    def _load_metric_history(self, profile_dict, intern=None):
+        history = profile_dict.get("cognitive_metric_history")
+        if not history:
+            return
+        capacity = self.metric_history_capacity
+        intern = intern or (lambda text: text)
+        self.cognitive_metric_history = {
+            intern(task_name): {intern(metric_name): MetricSeries.from_list(samples, capacity) for metric_name, samples in task_samples.items()}
+            for task_name, task_samples in history.items()
+        }
 
     def mark_lo_completed(self, lo_id):
         """Marks a Learning Objective as completed."""
-        if lo_id not in self.completed_los:
-            self.completed_los.add(lo_id)
-            print(f"Profile for {self.student_id}: Learning Objective '{lo_id}' marked as completed.")
+        if self._add_completed_lo(lo_id):
+            self._mark_changed("completed_los", None, lo_id)
+            self._record_change("completed_los", None, lo_id)
             # Potentially trigger badge check here
             check_and_award_all_relevant_badges(self) # Assuming curriculum_store might be needed later
 
-    def has_completed_lo(self, lo_id):
-        """Checks if a Learning Objective has been completed."""
-        return lo_id in self.completed_los
-
     def add_badge(self, badge_id):
-        """Adds a badge to the profile if not already earned, storing its details."""
-        if badge_id not in self.earned_badges_data:
+        """Adds a badge to the profile if not already earned, recording when it was earned."""
+        if badge_id not in self.earned_badges:
             badge_definition = BADGE_DEFINITIONS.get(badge_id)
             if not badge_definition:
-                print(f"Error: Badge definition for '{badge_id}' not found.")
+                _badge_problem(self.student_id, badge_id, f"Badge definition for '{badge_id}' not found.")
                 return False
             
-            earned_badge_info = badge_definition.copy() # Start with all definition info
-            earned_badge_info["date_earned"] = datetime.datetime.utcnow().isoformat() + "Z"
-            
-            self.earned_badges_data[badge_id] = earned_badge_info
-            print(f"Profile for {self.student_id}: Badge '{earned_badge_info['name']}' earned!")
+            date_earned = _badge_clock()
+            self.earned_badges[badge_id] = date_earned
+            self._mark_changed("earned_badges", emit_event=False)
+            self._record_change("earned_badges", badge_id, date_earned)
+            sink = events_module.event_sink
+            if sink.enabled:
+                sink.emit(BadgeAwardedEvent(self.student_id, badge_id, badge_definition["name"], date_earned))
             return True
         return False
 
     def has_badge(self, badge_id):
         """Checks if a specific badge has been earned."""
-        return badge_id in self.earned_badges_data
+        return badge_id in self.earned_badges
+
+    @property
+    def earned_badges_data(self):
+        """Earned badges with their details resolved from BADGE_DEFINITIONS, keyed by badge_id.
+
+        Built on each read; e.g. {"trailblazer": {"id": "trailblazer", "name": "Trailblazer", ..., "date_earned": "..."}}
+        """
+        return resolve_earned_badges(self.earned_badges)
 
     def __str__(self):
         earned_badges_summary = {bid: data.get('name', bid) for bid, data in self.earned_badges_data.items()}
         return (
-            f"LearnerProfile(student_id='{self.student_id}', "
+            f"{type(self).__name__}(student_id='{self.student_id}', "
             f"preferences={self.learning_preferences}, "
             f"interests={self.interests}, "
             f"struggle_areas={self.struggle_areas}, "
             f"cognitive_metrics={self.cognitive_metrics}, "
-            f"completed_los={self.completed_los}, "
+            f"completed_los={set(self.completed_los)}, "
             f"earned_badges_data={earned_badges_summary}"
             f")"
         )
 
+class LearnerProfile(BaseLearnerProfile):
+    """Represents a basic learner profile."""
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.learning_preferences = {} # Stores preferences like {"visual_task_1": "visual"}
+        self.interests = []
+        self.struggle_areas = []
+        self.cognitive_metrics = {} # For new diagnostic tasks e.g. {"story_weaver": {"accuracy": 0.8}}
+        # Recent numeric metric values over time, e.g. {"story_weaver": {"accuracy": MetricSeries}}
+        self.cognitive_metric_history = {}
+        self.completed_los = set()  # For tracking completed Learning Objectives
+        self._current_learning_objective_id = None # Added for pathway tracking
+        # Earned badges as {badge_id: date_earned}; details come from BADGE_DEFINITIONS (see earned_badges_data)
+        self.earned_badges = {}
+        # Profile fields changed since the last badge check; None means every badge must be checked
+        self._changed_badge_fields = None
+        # Changes since the last checkpoint; None until the profile is first checkpointed or loaded
+        self._pending_changes = None
+
+    def _load_state(self, profile_dict):
+        self.learning_preferences = dict(profile_dict.get("learning_preferences") or {})
+        self.interests = list(profile_dict.get("interests") or [])
+        self.struggle_areas = list(profile_dict.get("struggle_areas") or [])
+        self.cognitive_metrics = {task: dict(metrics) for task, metrics in (profile_dict.get("cognitive_metrics") or {}).items()}
+        self._load_metric_history(profile_dict)
+        self.completed_los = set(profile_dict.get("completed_los") or [])
+        self._current_learning_objective_id = profile_dict.get("current_learning_objective_id")
+        self.earned_badges = dict(profile_dict.get("earned_badges") or {})
+
+    def _add_completed_lo(self, lo_id):
+        if lo_id in self.completed_los:
+            return False
+        self.completed_los.add(lo_id)
+        return True
+
+    def has_completed_lo(self, lo_id):
+        """Checks if a Learning Objective has been completed."""
+        return lo_id in self.completed_los
+
+class CompletedLOSet(AbstractSet):
+    """Read-only set view over a CompactLearnerProfile's completed-LO bitset."""
+    __slots__ = ("_profile",)
+
+    def __init__(self, profile):
+        self._profile = profile
+
+    def __contains__(self, lo_id):
+        return self._profile.has_completed_lo(lo_id)
+
+    def __len__(self):
+        return self._profile.completed_lo_mask.bit_count()
+
+    def __iter__(self):
+        return self._profile.lo_index.ids_in(self._profile.completed_lo_mask)
+
+    def __repr__(self):
+        return f"CompletedLOSet({set(self)!r})"
+
+# Shared read-only placeholder for a compact profile's dictionaries until they are first written
+_EMPTY_MAPPING = MappingProxyType({})
+
+class CompactLearnerProfile(BaseLearnerProfile):
+    """Memory-compact learner profile for holding large cohorts in memory.
+
+    Same API as LearnerProfile, but uses __slots__, interns its strings, keeps interests/struggle areas
+    as tuples, shares one empty placeholder for dictionaries that have not been written yet, and stores
+    completed LOs as a bitset (an int) indexed through a LearningObjectiveIndex - normally a
+    CurriculumContentStore's lo_index. completed_los is a read-only set view; use mark_lo_completed.
+    """
+    __slots__ = (
+        "student_id", "learning_preferences", "interests", "struggle_areas", "cognitive_metrics",
+        "cognitive_metric_history", "completed_lo_mask", "lo_index", "_current_learning_objective_id", "earned_badges",
+        "_changed_badge_fields", "_pending_changes",
+    )
+
+    def __init__(self, student_id, lo_index=None):
+        self.student_id = sys.intern(student_id)
+        self.learning_preferences = _EMPTY_MAPPING
+        self.interests = ()
+        self.struggle_areas = ()
+        self.cognitive_metrics = _EMPTY_MAPPING
+        self.cognitive_metric_history = _EMPTY_MAPPING
+        self.completed_lo_mask = 0
+        self.lo_index = lo_index if lo_index is not None else DEFAULT_LO_INDEX
+        self._current_learning_objective_id = None
+        self.earned_badges = _EMPTY_MAPPING
+        self._changed_badge_fields = None
+        self._pending_changes = None
+
+    @classmethod
+    def for_store(cls, student_id, curriculum_store):
+        """Creates a compact profile whose LO bitset is indexed by the store's LO index."""
+        return cls(student_id, lo_index=curriculum_store.lo_index)
+
+    @property
+    def completed_los(self):
+        return CompletedLOSet(self)
+
+    def _load_state(self, profile_dict):
+        intern = sys.intern
+        preferences = profile_dict.get("learning_preferences")
+        if preferences:
+            self.learning_preferences = {
+                intern(task): intern(value) if isinstance(value, str) else value for task, value in preferences.items()
+            }
+        self.interests = tuple(intern(interest) for interest in profile_dict.get("interests") or ())
+        self.struggle_areas = tuple(intern(area) for area in profile_dict.get("struggle_areas") or ())
+        metrics = profile_dict.get("cognitive_metrics")
+        if metrics:
+            self.cognitive_metrics = {
+                intern(task): {intern(name): value for name, value in task_metrics.items()} for task, task_metrics in metrics.items()
+            }
+        self._load_metric_history(profile_dict, intern)
+        self.completed_lo_mask = self.lo_index.mask_for(profile_dict.get("completed_los") or ())
+        self._current_learning_objective_id = profile_dict.get("current_learning_objective_id")
+        earned_badges = profile_dict.get("earned_badges")
+        if earned_badges:
+            self.earned_badges = {intern(badge_id): date_earned for badge_id, date_earned in earned_badges.items()}
+
+    def _add_completed_lo(self, lo_id):
+        bit = 1 << self.lo_index.index_of(lo_id)
+        if self.completed_lo_mask & bit:
+            return False
+        self.completed_lo_mask |= bit
+        return True
+
+    def has_completed_lo(self, lo_id):
+        """Checks if a Learning Objective has been completed."""
+        index = self.lo_index.get(lo_id)
+        return index is not None and (self.completed_lo_mask >> index) & 1 == 1
+
+    def update_preference(self, task_name, preference):
+        if self.learning_preferences is _EMPTY_MAPPING:
+            self.learning_preferences = {}
+        super().update_preference(sys.intern(task_name), sys.intern(preference) if isinstance(preference, str) else preference)
+
+    def add_interest(self, interest):
+        if interest not in self.interests:
+            self.interests += (sys.intern(interest),)
+            self._mark_changed("interests", None, interest)
+            self._record_change("interests", None, interest)
+
+    def add_struggle_area(self, area):
+        if area not in self.struggle_areas:
+            self.struggle_areas += (sys.intern(area),)
+            self._mark_changed("struggle_areas", None, area)
+            self._record_change("struggle_areas", None, area)
+
+    def add_cognitive_metric(self, task_name, metric_name, value, timestamp=None):
+        if self.cognitive_metrics is _EMPTY_MAPPING:
+            self.cognitive_metrics = {}
+        if self.cognitive_metric_history is _EMPTY_MAPPING and is_numeric_metric(value):
+            self.cognitive_metric_history = {}
+        super().add_cognitive_metric(sys.intern(task_name), sys.intern(metric_name), value, timestamp)
+
+    def add_badge(self, badge_id):
+        if self.earned_badges is _EMPTY_MAPPING and badge_id in BADGE_DEFINITIONS:
+            self.earned_badges = {}
+        return super().add_badge(badge_id)
+
+    def to_dict(self):
+        profile_dict = super().to_dict()
+        profile_dict["learning_preferences"] = dict(self.learning_preferences)
+        profile_dict["interests"] = list(self.interests)
+        profile_dict["struggle_areas"] = list(self.struggle_areas)
+        profile_dict["cognitive_metrics"] = dict(self.cognitive_metrics)
+        return profile_dict
+
 # --- Badge Criteria Checking Functions ---
+def reads_profile_fields(*field_names):
+    """Decorator recording which LearnerProfile fields a badge criteria function reads.
+
+    The BadgeEvaluationEngine only re-checks a badge when one of these fields has changed.
+    Criteria functions without this declaration are re-checked on every badge check.
+    """
+    def decorator(check_function):
+        check_function.reads_profile_fields = frozenset(field_names)
+        return check_function
+    return decorator
+
+@reads_profile_fields("learning_preferences", "interests")
 def check_trailblazer_badge(learner_profile, curriculum_store=None):
     """Criteria: Completed initial HLP tasks (simulated by having preferences and interests)."""
     return bool(learner_profile.learning_preferences.get("visual_preference_task_1") and 
                 learner_profile.learning_preferences.get("textual_preference_task_1") and 
                 learner_profile.interests)
 
+@reads_profile_fields("completed_los")
 def check_topic_tackler_numeria_novice_badge(learner_profile, curriculum_store=None):
     """Criteria: Completed first two math LOs (simulated)."""
     numeria_novice_los = ["MA4_N1a", "MA4_N1b"] # Example LO IDs
     return all(learner_profile.has_completed_lo(lo_id) for lo_id in numeria_novice_los)
 
+@reads_profile_fields("completed_los")
 def check_quest_completer_intro_badge(learner_profile, curriculum_store=None):
     """Criteria: Completed a certain number of LOs (e.g., 3 LOs for an intro quest)."""
     return len(learner_profile.completed_los) >= 3
 
+@reads_profile_fields("cognitive_metrics")
 def check_curiosity_spark_badge(learner_profile, curriculum_store=None):
     """Criteria: Student explored optional content (e.g., re-tried a task)."""
     return learner_profile.cognitive_metrics.get("story_weaver", {}).get("attempts", 0) > 1
 
+@reads_profile_fields("struggle_areas")
 def check_helping_hand_badge(learner_profile, curriculum_store=None):
     """Criteria: Student identified struggle areas."""
     return bool(learner_profile.struggle_areas)
 
+# --- Badge Evaluation Engine ---
+class BadgeEvaluationEngine:
+    """Evaluates badge criteria incrementally.
+
+    Criteria functions are resolved once, when the engine is built, instead of by name on every check.
+    Badges are indexed by the profile fields their criteria read, so a check after a profile mutation
+    only evaluates the badges whose inputs changed. Call rebuild() after changing the badge definitions.
+    """
+    def __init__(self, badge_definitions, namespace=None):
+        self.badge_definitions = badge_definitions
+        self.namespace = namespace if namespace is not None else sys.modules[__name__]
+        self.reset_stats()
+        self.rebuild()
+
+    def rebuild(self):
+        """Resolves every badge's criteria function and rebuilds the field -> badges index."""
+        self._badge_order = {badge_id: i for i, badge_id in enumerate(self.badge_definitions)}
+        self._checks = {}  # badge_id -> (check_function, accepts_curriculum_store)
+        self._resolution_errors = {}
+        self._badges_by_field = {}
+        self._always_checked_badges = set()
+
+        for badge_id, badge_info in self.badge_definitions.items():
+            if "criteria" in badge_info:
+                try:
+                    check_function = compile_rule(badge_info["criteria"])
+                except BadgeRuleError as e:
+                    self._resolution_errors[badge_id] = f"Invalid criteria rule for badge '{badge_id}': {e}"
+                    continue
+                self._index_check(badge_id, check_function)
+                continue
+
+            check_function_name = badge_info.get("criteria_check_function")
+            if not check_function_name:
+                self._resolution_errors[badge_id] = f"No criteria_check_function defined for badge '{badge_id}'."
+                continue
+            check_function = getattr(self.namespace, check_function_name, None)
+            if check_function is None:
+                self._resolution_errors[badge_id] = f"Criteria check function '{check_function_name}' not found in module."
+                continue
+            self._index_check(badge_id, check_function)
+
+    def _index_check(self, badge_id, check_function):
+        accepts_curriculum_store = "curriculum_store" in inspect.signature(check_function).parameters
+        self._checks[badge_id] = (check_function, accepts_curriculum_store)
+
+        fields_read = getattr(check_function, "reads_profile_fields", None)
+        if fields_read is None:
+            self._always_checked_badges.add(badge_id)
+            return
+        for field_name in fields_read:
+            self._badges_by_field.setdefault(field_name, set()).add(badge_id)
+
+    def resolution_error(self, badge_id):
+        """Returns why a badge's criteria function could not be resolved, or None if it was."""
+        return self._resolution_errors.get(badge_id)
+
+    def badges_affected_by(self, changed_fields):
+        """Returns the badge IDs to re-check for the given changed fields, in definition order.
+
+        changed_fields=None means the changes are unknown, so every badge is returned.
+        """
+        if changed_fields is None:
+            return list(self._checks)
+        affected = set(self._always_checked_badges)
+        for field_name in changed_fields:
+            affected.update(self._badges_by_field.get(field_name, ()))
+        return sorted(affected, key=self._badge_order.__getitem__)
+
+    def check_function(self, badge_id):
+        """Returns a badge's resolved criteria function (called with the profile), or None if it has none.
+
+        Calling it directly runs the check without counting it in this engine's stats.
+        """
+        check = self._checks.get(badge_id)
+        return None if check is None else check[0]
+
+    def evaluate(self, learner_profile, badge_id, curriculum_store=None):
+        """Runs a badge's criteria function against the profile. Returns None for unknown badges."""
+        check = self._checks.get(badge_id)
+        if check is None:
+            return None
+        check_function, accepts_curriculum_store = check
+        self.evaluations_run += 1
+        if accepts_curriculum_store and curriculum_store is not None:
+            return check_function(learner_profile, curriculum_store=curriculum_store)
+        return check_function(learner_profile)
+
+    def check_profile(self, learner_profile, curriculum_store=None):
+        """Awards every not-yet-earned badge whose inputs changed and whose criteria are now met.
+
+        Returns the definitions of the newly awarded badges.
+        """
+        changed_fields = learner_profile.consume_changed_badge_fields()
+        awarded_badges = []
+        affected = self.badges_affected_by(changed_fields)
+        for badge_id in affected:
+            if learner_profile.has_badge(badge_id):
+                self.evaluations_already_awarded += 1
+                continue
+            if self.evaluate(learner_profile, badge_id, curriculum_store) and learner_profile.add_badge(badge_id):
+                awarded_badges.append(self.badge_definitions[badge_id])
+        # Only badges the index ruled out count as skipped; earned ones would not be evaluated anyway
+        unaffected = len(self._checks) - len(affected)
+        if unaffected:
+            affected = set(affected)
+            earned_unaffected = sum(1 for badge_id in learner_profile.earned_badges if badge_id in self._checks and badge_id not in affected)
+            self.evaluations_skipped += unaffected - earned_unaffected
+        return awarded_badges
+
+    def stats(self):
+        """Returns evaluation counters, e.g. for monitoring how much work the index saves.
+
+        evaluations_skipped counts not-yet-earned badges the field index ruled out because none of
+        the fields they read changed; evaluations_already_awarded counts affected badges passed over
+        because the student had already earned them.
+        """
+        return {
+            "evaluations_run": self.evaluations_run,
+            "evaluations_skipped": self.evaluations_skipped,
+            "evaluations_already_awarded": self.evaluations_already_awarded,
+        }
+
+    def reset_stats(self):
+        self.evaluations_run = 0
+        self.evaluations_skipped = 0
+        self.evaluations_already_awarded = 0
+
+BADGE_ENGINE = BadgeEvaluationEngine(BADGE_DEFINITIONS)
+
+def register_badge_definitions(definitions):
+    """Adds badge definitions (e.g. from badge_rules_module.load_badge_definitions) and rebuilds the engine."""
+    for badge_id, definition in definitions.items():
+        if "criteria" in definition:
+            validate_badge_definition(definition)
+        BADGE_DEFINITIONS[badge_id] = definition
+    BADGE_ENGINE.rebuild()
+
 # --- Badge Awarding Logic ---
+def _badge_problem(student_id, badge_id, message):
+    sink = events_module.event_sink
+    if sink.enabled:
+        sink.emit(BadgeProblemEvent(student_id, badge_id, message))
+
 def award_badge_if_criteria_met(learner_profile, badge_id, curriculum_store=None):
     """Awards a specific badge if criteria are met and it hasn't been earned yet."""
     if learner_profile.has_badge(badge_id):
@@ -186,86 +827,85 @@ def award_badge_if_criteria_met(learner_profile, badge_id, curriculum_store=None
 
     badge_info = BADGE_DEFINITIONS.get(badge_id)
     if not badge_info:
-        print(f"Warning: Badge ID '{badge_id}' not found in BADGE_DEFINITIONS.")
+        _badge_problem(learner_profile.student_id, badge_id, f"Badge ID '{badge_id}' not found in BADGE_DEFINITIONS.")
         return None
 
-    criteria_met = False
-    check_function_name = badge_info.get("criteria_check_function")
-    
-    if not check_function_name:
-        print(f"Warning: No criteria_check_function defined for badge '{badge_id}'.")
+    resolution_error = BADGE_ENGINE.resolution_error(badge_id)
+    if resolution_error:
+        _badge_problem(learner_profile.student_id, badge_id, resolution_error)
         return None
 
-    if hasattr(sys.modules[__name__], check_function_name):
-        check_function = getattr(sys.modules[__name__], check_function_name)
-        sig = inspect.signature(check_function)
-        if "curriculum_store" in sig.parameters and curriculum_store is not None:
-            criteria_met = check_function(learner_profile, curriculum_store=curriculum_store)
-        else:
-            criteria_met = check_function(learner_profile)
-    else:
-        print(f"Warning: Criteria check function '{check_function_name}' not found in module.")
-        return None
-            
+    criteria_met = BADGE_ENGINE.evaluate(learner_profile, badge_id, curriculum_store)
     if criteria_met:
         if learner_profile.add_badge(badge_id):
             return badge_info # Return definition of newly awarded badge
     return None
 
 def check_and_award_all_relevant_badges(learner_profile, curriculum_store=None):
-    """Checks all defined badges and awards them if criteria are met."""
-    print(f"\nChecking all relevant badges for {learner_profile.student_id}...")
-    awarded_badges_in_this_check = []
-    for badge_id in BADGE_DEFINITIONS.keys():
-        awarded_badge_info = award_badge_if_criteria_met(learner_profile, badge_id, curriculum_store)
-        if awarded_badge_info:
-            awarded_badges_in_this_check.append(awarded_badge_info['name'])
-    if awarded_badges_in_this_check:
-        print(f"Newly awarded badges in this check: {', '.join(awarded_badges_in_this_check)}")
-    else:
-        print("No new badges awarded in this check.")
-    return awarded_badges_in_this_check
+    """Checks the badges whose inputs changed since the last check and awards them if criteria are met.
+
+    Each award is reported as a BadgeAwardedEvent; returns the names of the newly awarded badges.
+    """
+    return [badge_info['name'] for badge_info in BADGE_ENGINE.check_profile(learner_profile, curriculum_store)]
 
 # --- Diagnostic Mini-Tasks (Simplified Simulations) ---
 
-def run_visual_preference_task(profile: LearnerProfile):
+def _task_started(profile, task_name):
+    sink = events_module.event_sink
+    if sink.enabled:
+        sink.emit(DiagnosticTaskEvent(profile.student_id, task_name))
+
+# Each task takes an rng (a random.Random, or the random module itself by default) so callers can
+# seed assessments per student; see cohort_assessment_module. The record_* functions apply a task's
+# response to the profile and are shared with the async task flow in async_hlp_module.
+def record_visual_preference(profile: LearnerProfile, simulated_choice):
     task_id = "visual_preference_task_1"
-    print(f"\nRunning Visual Preference Task for {profile.student_id}...")
-    simulated_choice = random.choice(["visual", "textual/auditory"])
     preference_value = "visual" if simulated_choice == "visual" else "non-visual"
     profile.update_preference(task_id, preference_value)
     # Trigger badge check after HLP tasks
     check_and_award_all_relevant_badges(profile)
     return {"score": 10 if preference_value == "visual" else 5, "preference": preference_value}
 
-def run_textual_preference_task(profile: LearnerProfile):
+def run_visual_preference_task(profile: LearnerProfile, rng=random):
+    _task_started(profile, "visual_preference_task_1")
+    return record_visual_preference(profile, rng.choice(["visual", "textual/auditory"]))
+
+def record_textual_preference(profile: LearnerProfile, simulated_choice):
     task_id = "textual_preference_task_1"
-    print(f"\nRunning Textual Preference Task for {profile.student_id}...")
-    simulated_choice = random.choice(["detailed_text", "summary_bullets"])
     preference_value = "detailed_text" if simulated_choice == "detailed_text" else "concise_text"
     profile.update_preference(task_id, preference_value)
     # Trigger badge check after HLP tasks
     check_and_award_all_relevant_badges(profile)
     return {"score": 10 if preference_value == "detailed_text" else 5, "preference": preference_value}
 
-def capture_student_interests(profile: LearnerProfile, num_interests_to_select=3):
-    print(f"\nCapturing Interests for {profile.student_id}...")
-    selected_interests = random.sample(PREDEFINED_INTERESTS, k=min(num_interests_to_select, len(PREDEFINED_INTERESTS)))
+def run_textual_preference_task(profile: LearnerProfile, rng=random):
+    _task_started(profile, "textual_preference_task_1")
+    return record_textual_preference(profile, rng.choice(["detailed_text", "summary_bullets"]))
+
+def record_student_interests(profile: LearnerProfile, selected_interests):
     for interest in selected_interests:
         profile.add_interest(interest)
     # Trigger badge check after HLP tasks
     check_and_award_all_relevant_badges(profile)
     return selected_interests
 
-def capture_student_struggles(profile: LearnerProfile, num_struggles_to_select=2):
-    print(f"\nCapturing Struggle Areas for {profile.student_id}...")
-    selected_struggles = random.sample(PREDEFINED_STRUGGLE_AREAS, k=min(num_struggles_to_select, len(PREDEFINED_STRUGGLE_AREAS)))
+def capture_student_interests(profile: LearnerProfile, num_interests_to_select=3, rng=random):
+    _task_started(profile, "capture_interests")
+    selected_interests = rng.sample(PREDEFINED_INTERESTS, k=min(num_interests_to_select, len(PREDEFINED_INTERESTS)))
+    return record_student_interests(profile, selected_interests)
+
+def record_student_struggles(profile: LearnerProfile, selected_struggles):
     for area in selected_struggles:
         profile.add_struggle_area(area)
     # Trigger badge check for 'Helping Hand'
     check_and_award_all_relevant_badges(profile)
     return selected_struggles
 
+def capture_student_struggles(profile: LearnerProfile, num_struggles_to_select=2, rng=random):
+    _task_started(profile, "capture_struggles")
+    selected_struggles = rng.sample(PREDEFINED_STRUGGLE_AREAS, k=min(num_struggles_to_select, len(PREDEFINED_STRUGGLE_AREAS)))
+    return record_student_struggles(profile, selected_struggles)
+
 PREDEFINED_INTERESTS = [
     "Space Exploration", "Dinosaurs", "Ancient Civilizations", 
     "Robotics", "Marine Biology", "Creative Writing", 
@@ -277,12 +917,8 @@ PREDEFINED_STRUGGLE_AREAS = [
     "Learning new vocabulary", "Organizing my study time"
 ]
 
-def run_story_weaver_task(profile: LearnerProfile):
+def record_story_weaver_result(profile: LearnerProfile, num_panels, simulated_accuracy, simulated_attempts):
     task_name = "story_weaver"
-    print(f"\nRunning '{task_name}' Task for {profile.student_id}...")
-    num_panels = random.choice([3, 4, 5])
-    simulated_accuracy = random.choice([0.6, 0.8, 1.0])
-    simulated_attempts = random.randint(1, 3) if simulated_accuracy < 1.0 else 1
     profile.add_cognitive_metric(task_name, "num_panels", num_panels)
     profile.add_cognitive_metric(task_name, "accuracy", simulated_accuracy)
     profile.add_cognitive_metric(task_name, "attempts", simulated_attempts)
@@ -290,30 +926,42 @@ def run_story_weaver_task(profile: LearnerProfile):
     check_and_award_all_relevant_badges(profile)
     return {"task_name": task_name, "accuracy": simulated_accuracy, "attempts": simulated_attempts}
 
-def run_mind_mapper_task(profile: LearnerProfile):
+def run_story_weaver_task(profile: LearnerProfile, rng=random):
+    _task_started(profile, "story_weaver")
+    num_panels = rng.choice([3, 4, 5])
+    simulated_accuracy = rng.choice([0.6, 0.8, 1.0])
+    simulated_attempts = rng.randint(1, 3) if simulated_accuracy < 1.0 else 1
+    return record_story_weaver_result(profile, num_panels, simulated_accuracy, simulated_attempts)
+
+def record_mind_mapper_result(profile: LearnerProfile, ideas_generated):
     task_name = "mind_mapper"
-    print(f"\nRunning '{task_name}' Task for {profile.student_id}...")
     # ... (rest of the function as before, simplified for brevity) ...
-    profile.add_cognitive_metric(task_name, "ideas_generated", random.randint(3,8))
+    profile.add_cognitive_metric(task_name, "ideas_generated", ideas_generated)
     # Trigger badge check
     check_and_award_all_relevant_badges(profile)
     return {"task_name": task_name}
 
+def run_mind_mapper_task(profile: LearnerProfile, rng=random):
+    _task_started(profile, "mind_mapper")
+    return record_mind_mapper_result(profile, rng.randint(3,8))
+
 # --- Main HLP Process Simulation (Example Usage) ---
-def run_full_hlp_assessment(student_id):
-    """Simulates a full HLP assessment process for a student."""
-    print(f"--- Starting Full HLP Assessment for Student: {student_id} ---")
+def run_full_hlp_assessment(student_id, rng=random):
+    """Simulates a full HLP assessment process for a student. Progress is reported through events_module.
+
+    Pass rng=random.Random(seed) for a reproducible assessment.
+    """
     profile = LearnerProfile(student_id)
 
     # Initial HLP tasks (can trigger Trailblazer)
-    run_visual_preference_task(profile)
-    run_textual_preference_task(profile)
-    capture_student_interests(profile)
-    capture_student_struggles(profile) # Can trigger Helping Hand
+    run_visual_preference_task(profile, rng=rng)
+    run_textual_preference_task(profile, rng=rng)
+    capture_student_interests(profile, rng=rng)
+    capture_student_struggles(profile, rng=rng) # Can trigger Helping Hand
 
     # Sophisticated diagnostic tasks (can trigger Curiosity Spark)
-    run_story_weaver_task(profile)
-    run_mind_mapper_task(profile)
+    run_story_weaver_task(profile, rng=rng)
+    run_mind_mapper_task(profile, rng=rng)
 
     # Simulate completing some Learning Objectives (can trigger Topic Tackler, Quest Completer)
     # These LO IDs should align with curriculum_content_module.py if using real curriculum data
@@ -321,18 +969,19 @@ def run_full_hlp_assessment(student_id):
     profile.mark_lo_completed("MA4_N1b") # Triggers Numeria Novice Tackler
     profile.mark_lo_completed("EN4_C1a") # Triggers Intro Quest Completer (if 3 LOs is the threshold)
 
-    print(f"\n--- HLP Assessment Complete for Student: {student_id} ---")
-    print("Final Learner Profile:")
-    print(profile)
-    
-    print("\nFinal check for any missed badges (should be redundant if called within tasks):")
+    # Final check for any missed badges (should be redundant if called within tasks)
     check_and_award_all_relevant_badges(profile)
     
     return profile
 
 if __name__ == '__main__':
+    events_module.enable_console_events()
     # Example of how to run the HLP assessment and see badge awarding in action
+    print("--- Starting Full HLP Assessment for Student: student_007 ---")
     test_student_profile = run_full_hlp_assessment("student_007")
+    print("\n--- HLP Assessment Complete for Student: student_007 ---")
+    print("Final Learner Profile:")
+    print(test_student_profile)
 
     print("\n--- Earned Badges Summary ---")
     if test_student_profile.earned_badges_data:
@@ -340,6 +989,7 @@ if __name__ == '__main__':
             print(f"- {data['name']}: {data['description']} (Earned on: {data['date_earned']})")
     else:
         print("No badges earned yet.")
+    print(f"Badge engine stats: {BADGE_ENGINE.stats()}")
 
     # Example of checking a specific badge
     # award_badge_if_criteria_met(test_student_profile, "trailblazer")
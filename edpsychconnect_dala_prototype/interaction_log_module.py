@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Interaction Log Module
+
+This module contains the logic for:
+1.  An append-only log of learner interactions (preference updates, interests, struggle areas,
+    task results, LO completions, badge awards and current-LO changes), optionally persisted as JSONL.
+2.  Capturing interactions from the HLP hot paths through an event sink (InteractionLogSink).
+3.  Periodic per-student snapshots, so a profile is rebuilt from its latest snapshot plus the tail
+    of the log instead of a full replay.
+4.  Replaying a student's (or the whole cohort's) history through a custom reducer, e.g. to rebuild
+    derived profiles after the update algorithm changes, and reading per-metric trends.
+
+Profiles keep only the latest values; the log keeps everything, which the trend-aware HLP updates in
+dynamic_hlp_update_concepts.md need. Replay folds interactions into a to_dict()-shaped state and
+builds the profile object once at the end.
+"""
+
+import json
+import time
+from collections import namedtuple
+from functools import partial
+
+import events_module
+from events_module import ProfileChangedEvent, BadgeAwardedEvent
+from hlp_module import LearnerProfile, PROFILE_SCHEMA_VERSION, migrate_profile_dict
+from metric_series_module import DEFAULT_METRIC_HISTORY_CAPACITY, is_numeric_metric
+
+# Interaction kinds
+PREFERENCE_UPDATED = "preference_updated"      # key=task_name, value=preference
+INTEREST_ADDED = "interest_added"              # value=interest
+STRUGGLE_AREA_ADDED = "struggle_area_added"    # value=area
+TASK_RESULT = "task_result"                    # key=(task_name, metric_name), value=metric value, timestamp=history time
+LO_COMPLETED = "lo_completed"                  # value=lo_id
+BADGE_AWARDED = "badge_awarded"                # key=badge_id, value=date_earned
+CURRENT_LO_SET = "current_lo_set"              # value=lo_id or None
+
+# ProfileChangedEvent.field -> interaction kind
+_KIND_BY_PROFILE_FIELD = {
+    "learning_preferences": PREFERENCE_UPDATED,
+    "interests": INTEREST_ADDED,
+    "struggle_areas": STRUGGLE_AREA_ADDED,
+    "cognitive_metrics": TASK_RESULT,
+    "completed_los": LO_COMPLETED,
+    "current_learning_objective_id": CURRENT_LO_SET,
+}
+
+class Interaction(namedtuple("Interaction", ["sequence", "student_id", "kind", "key", "value", "timestamp"])):
+    """One logged learner interaction. sequence is global and increases with every append."""
+    __slots__ = ()
+
+# --- Replay ---
+def new_profile_state(student_id):
+    """Returns an empty to_dict()-shaped profile state to fold interactions into."""
+    return {
+        "student_id": student_id,
+        "learning_preferences": {},
+        "interests": [],
+        "struggle_areas": [],
+        "cognitive_metrics": {},
+        "cognitive_metric_history": {},
+        "completed_los": [],
+        "current_learning_objective_id": None,
+        "earned_badges": {},
+        "schema_version": PROFILE_SCHEMA_VERSION,
+    }
+
+def copy_profile_state(state):
+    """Copies a profile state deeply enough that folding more interactions into it leaves the original intact."""
+    copied = dict(state)
+    for field_name in ("learning_preferences", "earned_badges"):
+        copied[field_name] = dict(state[field_name])
+    for field_name in ("interests", "struggle_areas", "completed_los"):
+        copied[field_name] = list(state[field_name])
+    copied["cognitive_metrics"] = {task_name: dict(metrics) for task_name, metrics in state["cognitive_metrics"].items()}
+    copied["cognitive_metric_history"] = {
+        task_name: {metric_name: list(samples) for metric_name, samples in task_samples.items()}
+        for task_name, task_samples in state.get("cognitive_metric_history", {}).items()
+    }
+    return copied
+
+def _append_unique(items, item):
+    if item not in items:
+        items.append(item)
+
+def _set_metric(state, key, value, timestamp, capacity):
+    task_name, metric_name = key
+    metrics = state["cognitive_metrics"]
+    task_metrics = metrics.get(task_name)
+    if task_metrics is None:
+        task_metrics = metrics[task_name] = {}
+    task_metrics[metric_name] = value
+    if is_numeric_metric(value):
+        samples = state["cognitive_metric_history"].setdefault(task_name, {}).setdefault(metric_name, [])
+        samples.append([timestamp, float(value)])
+        if len(samples) > capacity:
+            del samples[0]
+
+def apply_interaction(state, interaction, metric_history_capacity=DEFAULT_METRIC_HISTORY_CAPACITY):
+    """The default reducer: applies one interaction to a profile state the way LearnerProfile's mutators do.
+
+    Each metric's history keeps its newest metric_history_capacity samples; pass the target profile
+    class's metric_history_capacity (e.g. with functools.partial) when it differs from the default.
+    """
+    kind = interaction.kind
+    if kind == TASK_RESULT:
+        _set_metric(state, interaction.key, interaction.value, interaction.timestamp, metric_history_capacity)
+    elif kind == LO_COMPLETED:
+        _append_unique(state["completed_los"], interaction.value)
+    elif kind == PREFERENCE_UPDATED:
+        state["learning_preferences"][interaction.key] = interaction.value
+    elif kind == BADGE_AWARDED:
+        state["earned_badges"].setdefault(interaction.key, interaction.value)
+    elif kind == INTEREST_ADDED:
+        _append_unique(state["interests"], interaction.value)
+    elif kind == STRUGGLE_AREA_ADDED:
+        _append_unique(state["struggle_areas"], interaction.value)
+    elif kind == CURRENT_LO_SET:
+        state["current_learning_objective_id"] = interaction.value
+    return state
+
+# --- Log ---
+class InteractionLog:
+    """Append-only interaction log with periodic per-student snapshots.
+
+    With path set, every interaction and snapshot is also appended to that JSONL file, and
+    InteractionLog.open(path) restores the log from it. A snapshot is taken for a student after every
+    snapshot_interval interactions (0 disables snapshots); snapshots keep metric_history_capacity samples
+    per metric, so profile classes with a larger capacity are rebuilt by full replay.
+    """
+    def __init__(self, path=None, snapshot_interval=100, metric_history_capacity=DEFAULT_METRIC_HISTORY_CAPACITY):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.metric_history_capacity = metric_history_capacity
+        self._interactions = {}   # student_id -> [Interaction] in sequence order
+        self._snapshots = {}      # student_id -> (sequence, index into _interactions[student_id], state)
+        self._next_sequence = 1
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    @classmethod
+    def open(cls, path, snapshot_interval=100, metric_history_capacity=DEFAULT_METRIC_HISTORY_CAPACITY):
+        """Loads a log previously written to path and keeps appending to it."""
+        log = cls(snapshot_interval=snapshot_interval, metric_history_capacity=metric_history_capacity)
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        log._restore_line(json.loads(line))
+        except FileNotFoundError:
+            pass
+        log.path = path
+        log._file = open(path, "a", encoding="utf-8")
+        return log
+
+    def _restore_line(self, record):
+        student_id = record["student_id"]
+        interactions = self._interactions.setdefault(student_id, [])
+        if record["type"] == "snapshot":
+            state = migrate_profile_dict(record["profile"])
+            self._snapshots[student_id] = (record["sequence"], len(interactions), state)
+            return
+        key = record.get("key")
+        if record["kind"] == TASK_RESULT:
+            key = tuple(key)
+        interactions.append(Interaction(record["sequence"], student_id, record["kind"], key, record.get("value"), record["timestamp"]))
+        self._next_sequence = max(self._next_sequence, record["sequence"] + 1)
+
+    def append(self, student_id, kind, key=None, value=None, timestamp=None):
+        """Appends one interaction and returns it; may take a snapshot for the student."""
+        interaction = Interaction(self._next_sequence, student_id, kind, key, value,
+                                  time.time() if timestamp is None else timestamp)
+        self._next_sequence += 1
+        interactions = self._interactions.get(student_id)
+        if interactions is None:
+            interactions = self._interactions[student_id] = []
+        interactions.append(interaction)
+        if self._file is not None:
+            self._file.write(json.dumps({
+                "type": "interaction", "sequence": interaction.sequence, "student_id": student_id, "kind": kind,
+                "key": key, "value": value, "timestamp": interaction.timestamp,
+            }, separators=(",", ":")) + "\n")
+        if self.snapshot_interval:
+            snapshot = self._snapshots.get(student_id)
+            tail_length = len(interactions) - (snapshot[1] if snapshot else 0)
+            if tail_length >= self.snapshot_interval:
+                self.snapshot(student_id)
+        return interaction
+
+    def snapshot(self, student_id):
+        """Folds the student's tail into their latest snapshot and stores the result as the new snapshot."""
+        interactions = self._interactions.get(student_id)
+        if not interactions:
+            return None
+        reducer = partial(apply_interaction, metric_history_capacity=self.metric_history_capacity)
+        state = self._replay_state(student_id, use_snapshot=True, reducer=reducer)
+        sequence = interactions[-1].sequence
+        self._snapshots[student_id] = (sequence, len(interactions), state)
+        if self._file is not None:
+            self._file.write(json.dumps({
+                "type": "snapshot", "sequence": sequence, "student_id": student_id, "profile": state,
+            }, separators=(",", ":")) + "\n")
+        return sequence
+
+    def _replay_state(self, student_id, use_snapshot=True, reducer=apply_interaction, initial_state=None):
+        interactions = self._interactions.get(student_id, ())
+        snapshot = self._snapshots.get(student_id) if use_snapshot and initial_state is None else None
+        if snapshot is not None:
+            state = copy_profile_state(snapshot[2])
+            tail = interactions[snapshot[1]:]
+        else:
+            state = initial_state if initial_state is not None else new_profile_state(student_id)
+            tail = interactions
+        for interaction in tail:
+            state = reducer(state, interaction)
+        return state
+
+    def replay(self, student_id, reducer=apply_interaction, initial_state=None, use_snapshot=False):
+        """Folds the student's interactions through reducer(state, interaction) and returns the final state.
+
+        By default this is a full replay from an empty profile state, as needed when the reducer
+        (the profile update algorithm) has changed and existing snapshots no longer apply.
+        """
+        return self._replay_state(student_id, use_snapshot, reducer, initial_state)
+
+    def _profile_state(self, student_id, profile_class, use_snapshot):
+        capacity = profile_class.metric_history_capacity
+        reducer = partial(apply_interaction, metric_history_capacity=capacity)
+        # A snapshot trimmed to fewer samples than the class keeps cannot supply its history
+        return self._replay_state(student_id, use_snapshot and capacity <= self.metric_history_capacity, reducer)
+
+    def rebuild_profile(self, student_id, profile_class=LearnerProfile, use_snapshot=True, **kwargs):
+        """Rebuilds the student's profile from their latest snapshot plus later interactions."""
+        if student_id not in self._interactions:
+            return None
+        return profile_class.from_dict(self._profile_state(student_id, profile_class, use_snapshot), **kwargs)
+
+    def rebuild_all(self, profile_class=LearnerProfile, use_snapshot=True, **kwargs):
+        """Yields a rebuilt profile for every student in the log."""
+        for student_id in self._interactions:
+            yield profile_class.from_dict(self._profile_state(student_id, profile_class, use_snapshot), **kwargs)
+
+    def interactions(self, student_id, kind=None, since_sequence=0):
+        """Returns the student's logged interactions, optionally of one kind and after a sequence number."""
+        return [
+            interaction for interaction in self._interactions.get(student_id, ())
+            if interaction.sequence > since_sequence and (kind is None or interaction.kind == kind)
+        ]
+
+    def metric_history(self, student_id, task_name, metric_name):
+        """Returns [(timestamp, value)] for one cognitive metric, oldest first, for trend analysis."""
+        key = (task_name, metric_name)
+        return [
+            (interaction.timestamp, interaction.value) for interaction in self._interactions.get(student_id, ())
+            if interaction.kind == TASK_RESULT and interaction.key == key
+        ]
+
+    def student_ids(self):
+        return list(self._interactions)
+
+    def __len__(self):
+        return self._next_sequence - 1
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class InteractionLogSink:
+    """Event sink that appends ProfileChangedEvent and BadgeAwardedEvent to an InteractionLog.
+
+    Install with events_module.set_event_sink(InteractionLogSink(log)); other events are ignored.
+    """
+    enabled = True
+
+    def __init__(self, interaction_log):
+        self.interaction_log = interaction_log
+
+    def emit(self, event):
+        if type(event) is ProfileChangedEvent:
+            kind = _KIND_BY_PROFILE_FIELD.get(event.field)
+            if kind is None:
+                return
+            # Task results are keyed by the event's (task_name, metric_name) tuple, so names may contain ".",
+            # and carry the timestamp the profile recorded in the metric's history
+            self.interaction_log.append(event.student_id, kind, event.key, event.value, event.timestamp)
+        elif type(event) is BadgeAwardedEvent:
+            self.interaction_log.append(event.student_id, BADGE_AWARDED, event.badge_id, event.date_earned)
+
+    def flush(self):
+        self.interaction_log.flush()
+
+    def close(self):
+        self.interaction_log.flush()
+
+if __name__ == "__main__":
+    from hlp_module import run_full_hlp_assessment
+
+    print("--- DALA Interaction Log Demo ---")
+    with InteractionLog(snapshot_interval=5) as interaction_log:
+        previous_sink = events_module.set_event_sink(InteractionLogSink(interaction_log))
+        try:
+            profile = run_full_hlp_assessment("student_log_demo")
+            profile.add_cognitive_metric("story_weaver", "accuracy", 0.9)
+        finally:
+            events_module.set_event_sink(previous_sink)
+
+        print(f"Logged interactions: {len(interaction_log)}")
+        print(f"story_weaver accuracy history: {[value for _, value in interaction_log.metric_history('student_log_demo', 'story_weaver', 'accuracy')]}")
+        rebuilt = interaction_log.rebuild_profile("student_log_demo")
+        replayed = interaction_log.rebuild_profile("student_log_demo", use_snapshot=False)
+        print(f"Snapshot + tail matches full replay: {rebuilt.to_dict() == replayed.to_dict()}")
+        print(f"Rebuilt profile matches live profile: {rebuilt.to_dict() == profile.to_dict()}")
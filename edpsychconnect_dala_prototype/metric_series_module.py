@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Metric Series Module
+
+This module contains the logic for:
+1.  A bounded, array-backed ring buffer of (timestamp, value) samples for one cognitive metric.
+2.  Cheap summaries over the buffered window: last, mean, slope (trend per second) and percentile.
+
+LearnerProfile keeps one MetricSeries per numeric cognitive metric (cognitive_metric_history), so
+repeated task attempts build a trend instead of overwriting each other. Samples live interleaved
+in a single array('d') that grows up to capacity and then wraps, so memory per metric is fixed no
+matter how many attempts a student makes.
+"""
+
+import math
+from array import array
+
+DEFAULT_METRIC_HISTORY_CAPACITY = 32
+
+class MetricSeries:
+    """Ring buffer of the most recent `capacity` (timestamp, value) samples of a metric."""
+    __slots__ = ("_capacity", "_samples", "_next")
+
+    def __init__(self, capacity=DEFAULT_METRIC_HISTORY_CAPACITY, samples=()):
+        if capacity < 1:
+            raise ValueError("MetricSeries capacity must be at least 1")
+        self._capacity = capacity
+        self._samples = array("d")  # t0, v0, t1, v1, ... in insertion order until full, then a ring
+        self._next = 0              # Slot the next sample overwrites once the buffer is full
+        for timestamp, value in samples:
+            self.append(timestamp, value)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def append(self, timestamp, value):
+        samples = self._samples
+        if len(samples) < 2 * self._capacity:
+            samples.append(timestamp)
+            samples.append(value)
+            return
+        position = 2 * self._next
+        samples[position] = timestamp
+        samples[position + 1] = value
+        self._next = (self._next + 1) % self._capacity
+
+    def __len__(self):
+        return len(self._samples) // 2
+
+    def _ordered(self):
+        samples = self._samples
+        if not self._next:
+            return samples
+        split = 2 * self._next
+        return samples[split:] + samples[:split]
+
+    def samples(self):
+        """Returns [(timestamp, value)] oldest first."""
+        ordered = self._ordered()
+        return list(zip(ordered[0::2], ordered[1::2]))
+
+    def values(self):
+        """Returns the buffered values oldest first."""
+        return self._ordered()[1::2].tolist()
+
+    def last(self):
+        """The most recent value, or None if the series is empty."""
+        samples = self._samples
+        if not samples:
+            return None
+        if not self._next:
+            return samples[-1]
+        return samples[2 * self._next - 1]
+
+    def mean(self):
+        if not self._samples:
+            return None
+        return math.fsum(self._samples[1::2]) / len(self)
+
+    def slope(self):
+        """Least-squares trend of value against timestamp (value units per second).
+
+        None with fewer than two samples or when every sample has the same timestamp.
+        """
+        count = len(self)
+        if count < 2:
+            return None
+        timestamps = self._samples[0::2]
+        values = self._samples[1::2]
+        mean_timestamp = math.fsum(timestamps) / count
+        mean_value = math.fsum(values) / count
+        covariance = variance = 0.0
+        for timestamp, value in zip(timestamps, values):
+            offset = timestamp - mean_timestamp
+            covariance += offset * (value - mean_value)
+            variance += offset * offset
+        return covariance / variance if variance else None
+
+    def percentile(self, percent):
+        """The value at `percent` (0-100) of the window, linearly interpolated. None if empty."""
+        if not self._samples:
+            return None
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        ordered = sorted(self._samples[1::2])
+        rank = (len(ordered) - 1) * percent / 100
+        lower = math.floor(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def to_list(self):
+        """[[timestamp, value], ...] oldest first, for to_dict() serialization."""
+        return [list(sample) for sample in self.samples()]
+
+    @classmethod
+    def from_list(cls, samples, capacity=DEFAULT_METRIC_HISTORY_CAPACITY):
+        """Rebuilds a series from to_list() output, keeping the newest `capacity` samples."""
+        samples = list(samples)
+        return cls(capacity, samples[-capacity:])
+
+    def __repr__(self):
+        return f"MetricSeries(capacity={self._capacity}, samples={self.samples()!r})"
+
+def is_numeric_metric(value):
+    """Whether a metric value is tracked in a MetricSeries (ints and floats, but not bools)."""
+    return type(value) in (int, float)
+
+if __name__ == "__main__":
+    print("--- DALA Metric Series Demo ---")
+    accuracy = MetricSeries(capacity=4)
+    for attempt, value in enumerate([0.4, 0.6, 0.6, 0.8, 0.9, 1.0]):
+        accuracy.append(1_700_000_000 + attempt * 86400, value)
+    print(f"Window: {accuracy.values()}")
+    print(f"last={accuracy.last()} mean={accuracy.mean():.3f} slope/day={accuracy.slope() * 86400:.3f} "
+          f"median={accuracy.percentile(50):.2f}")
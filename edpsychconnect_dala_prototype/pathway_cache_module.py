@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Pathway Cache Module
+
+This module contains the logic for:
+1.  Keying a generated pathway on everything it depends on: the student, the catalog version, a
+    fingerprint of the profile fields pathway generation reads (completed LOs and learning
+    preferences), the performance tracker's revision for the student, and the call parameters.
+2.  A bounded LRU cache of pathways with a time-to-live, with hit-rate statistics.
+3.  Invalidation from events: installed as (part of) the event sink, the cache drops a student's
+    entries when their completed LOs or preferences change, and a catalog version's entries when
+    a VersionedContentStore publishes a new version.
+
+Give a PathwayGenerator a pathway_cache to use it. Because the key covers every input, a stale entry
+can never be served even without event invalidation; the events just free stale entries early.
+Cached pathways are generated with a shuffle seeded per student and catalog version (see
+dcw_apg_module.pathway_rng), so a cached result is exactly what generation would return again.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from events_module import ProfileChangedEvent, CatalogVersionChangedEvent
+
+# Profile fields whose changes can change a generated pathway
+PATHWAY_PROFILE_FIELDS = frozenset({"completed_los", "learning_preferences"})
+
+class PathwayKey(namedtuple("PathwayKey", [
+    "student_id", "catalog_version", "profile_fingerprint", "performance_revision", "max_los", "max_activities_per_lo",
+])):
+    """Everything a generated pathway depends on."""
+    __slots__ = ()
+
+def profile_fingerprint(learner_profile):
+    """A hashable, exact summary of the profile fields pathway generation reads.
+
+    Completed LOs are the bitset itself for a CompactLearnerProfile (an int) and a frozenset
+    otherwise; preferences are a sorted tuple of items.
+    """
+    completed = getattr(learner_profile, "completed_lo_mask", None)
+    if completed is None:
+        completed = frozenset(learner_profile.completed_los)
+    preferences = learner_profile.learning_preferences
+    return completed, tuple(sorted(preferences.items())) if preferences else ()
+
+def pathway_key(learner_profile, catalog_version, performance_tracker=None, max_los=3, max_activities_per_lo=2):
+    student_id = learner_profile.student_id
+    performance_revision = None if performance_tracker is None else performance_tracker.student_revision(student_id)
+    return PathwayKey(student_id, catalog_version, profile_fingerprint(learner_profile), performance_revision, max_los, max_activities_per_lo)
+
+class PathwayCache:
+    """Bounded LRU + TTL cache of generated pathways, keyed by PathwayKey.
+
+    Holds at most max_entries pathways; an entry older than ttl_seconds is treated as missing. The
+    cache is also an event sink: install it alongside any other sink with
+    set_event_sink(FanOutEventSink(get_event_sink(), cache)) to drop entries as soon as they go stale.
+    Thread-safe; pathways are generated outside the lock.
+    """
+    enabled = True
+
+    def __init__(self, max_entries=10_000, ttl_seconds=300.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # PathwayKey -> (expires_at, pathway), least recently used first
+        self._keys_by_student = {}
+        self._keys_by_version = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """The cached pathway for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, pathway):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + self.ttl_seconds, pathway)
+            self._keys_by_student.setdefault(key.student_id, set()).add(key)
+            self._keys_by_version.setdefault(key.catalog_version, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        del self._entries[key]
+        for index, index_key in ((self._keys_by_student, key.student_id), (self._keys_by_version, key.catalog_version)):
+            keys = index[index_key]
+            keys.discard(key)
+            if not keys:
+                del index[index_key]
+
+    def _remove_all(self, keys):
+        for key in list(keys):
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_student(self, student_id):
+        """Drops every cached pathway for a student."""
+        with self._lock:
+            self._remove_all(self._keys_by_student.get(student_id, ()))
+
+    def invalidate_version(self, catalog_version):
+        """Drops every cached pathway generated from a catalog version."""
+        with self._lock:
+            self._remove_all(self._keys_by_version.get(catalog_version, ()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_student.clear()
+            self._keys_by_version.clear()
+
+    # --- Event sink protocol ---
+    def emit(self, event):
+        if type(event) is ProfileChangedEvent:
+            if event.field in PATHWAY_PROFILE_FIELDS:
+                self.invalidate_student(event.student_id)
+        elif type(event) is CatalogVersionChangedEvent:
+            self.invalidate_version(event.old_version)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    # --- Statistics ---
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+if __name__ == "__main__":
+    import events_module
+    from events_module import FanOutEventSink
+    from curriculum_content_module import CurriculumContentStore, CURRICULUM_SLICE, LEARNING_CONTENT_SET
+    from dcw_apg_module import PathwayGenerator
+    from hlp_module import LearnerProfile
+
+    print("--- DALA Pathway Cache Demo ---")
+    cache = PathwayCache(max_entries=1_000, ttl_seconds=60)
+    previous_sink = events_module.set_event_sink(FanOutEventSink(events_module.get_event_sink(), cache))
+    store = CurriculumContentStore(CURRICULUM_SLICE, LEARNING_CONTENT_SET)
+    profile = LearnerProfile("student_cache_001")
+    profile.update_preference("visual_task_1", "visual")
+    generator = PathwayGenerator(profile, store, pathway_cache=cache)
+    for render in range(3):
+        pathway = generator.generate_initial_pathway(target_lo_count=2)
+        print(f"Render {render + 1}: {[lo['id'] for lo in pathway]}  {cache.stats()}")
+    profile.mark_lo_completed("Y4MD_LO1")  # Invalidates the student's entries
+    pathway = generator.generate_initial_pathway(target_lo_count=2)
+    print(f"After completing Y4MD_LO1: {[lo['id'] for lo in pathway]}  {cache.stats()}")
+    events_module.set_event_sink(previous_sink)
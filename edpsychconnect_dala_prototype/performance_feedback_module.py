@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Performance Feedback Module
+
+This module contains the logic for:
+1.  Ingesting a stream of activity results (quiz scores, time-on-task, attempts) as described in
+    performance_feedback_adaptive_pathway_design.md and dynamic_hlp_update_concepts.md.
+2.  Exponentially decayed accuracy, time-on-task and attempt aggregates per (student, LO) and per
+    (student, content type), in constant memory per key.
+3.  Classifying LO mastery ("not_started", "struggling", "partial_understanding", "mastered") for the
+    PathwayGenerator.
+
+Each aggregate keeps decayed sums rather than a history: an observation's weight halves every
+half_life_seconds, so recent results count most (trend-aware) without overreacting to a single one.
+"""
+
+import math
+import time
+from collections import namedtuple
+
+# Mastery levels (see performance_feedback_adaptive_pathway_design.md, section 4)
+NOT_STARTED = "not_started"
+STRUGGLING = "struggling"
+PARTIAL_UNDERSTANDING = "partial_understanding"
+MASTERED = "mastered"
+
+class ActivityResult(namedtuple("ActivityResult", ["student_id", "lo_id", "content_type", "score", "time_on_task", "attempts", "timestamp"])):
+    """One finished activity: score in [0, 1], time_on_task in seconds, timestamp in epoch seconds."""
+    __slots__ = ()
+
+class DecayedAggregate:
+    """Exponentially decayed means of accuracy, time-on-task and attempts for one key."""
+    __slots__ = ("weight", "accuracy_sum", "time_sum", "attempts_sum", "last_timestamp", "event_count")
+
+    def __init__(self, timestamp):
+        self.weight = 0.0
+        self.accuracy_sum = 0.0
+        self.time_sum = 0.0
+        self.attempts_sum = 0.0
+        self.last_timestamp = timestamp
+        self.event_count = 0
+
+    @property
+    def accuracy(self):
+        return self.accuracy_sum / self.weight if self.weight else None
+
+    @property
+    def mean_time_on_task(self):
+        return self.time_sum / self.weight if self.weight else None
+
+    @property
+    def mean_attempts(self):
+        return self.attempts_sum / self.weight if self.weight else None
+
+    def effective_weight(self, decay_rate, now):
+        """The evidence behind the means as of `now` (in units of fresh observations)."""
+        return self.weight * math.exp(-decay_rate * max(0.0, now - self.last_timestamp))
+
+    def __repr__(self):
+        return (f"DecayedAggregate(accuracy={self.accuracy!r}, mean_time_on_task={self.mean_time_on_task!r}, "
+                f"mean_attempts={self.mean_attempts!r}, weight={self.weight:.3f}, events={self.event_count})")
+
+class PerformanceTracker:
+    """Maintains decayed performance aggregates from a stream of activity results.
+
+    half_life_seconds controls how fast old results fade. An LO is "mastered" when its decayed
+    accuracy is at least mastery_threshold and "struggling" below struggle_threshold, once at least
+    min_weight worth of evidence has accumulated.
+    """
+    def __init__(self, half_life_seconds=7 * 24 * 3600, mastery_threshold=0.85, struggle_threshold=0.5, min_weight=1.0):
+        self.half_life_seconds = half_life_seconds
+        self.decay_rate = math.log(2) / half_life_seconds
+        self.mastery_threshold = mastery_threshold
+        self.struggle_threshold = struggle_threshold
+        self.min_weight = min_weight
+        self._by_lo = {}            # (student_id, lo_id) -> DecayedAggregate
+        self._by_content_type = {}  # (student_id, content_type) -> DecayedAggregate
+        self._revisions = {}        # student_id -> results ingested for the student
+        self.events_ingested = 0
+
+    def ingest(self, student_id, lo_id, content_type, score, time_on_task, attempts=1, timestamp=None):
+        """Folds one activity result into the (student, LO) and (student, content type) aggregates."""
+        self.ingest_many(((student_id, lo_id, content_type, score, time_on_task, attempts,
+                           time.time() if timestamp is None else timestamp),))
+
+    def ingest_many(self, results):
+        """Ingests an iterable of ActivityResult (or equivalent 7-tuples). Returns the number ingested.
+
+        Results may arrive slightly out of order; a late result is down-weighted by its age instead of
+        rewinding the aggregate.
+        """
+        exp = math.exp
+        decay_rate = self.decay_rate
+        by_lo = self._by_lo
+        by_content_type = self._by_content_type
+        revisions = self._revisions
+        count = 0
+        for student_id, lo_id, content_type, score, time_on_task, attempts, timestamp in results:
+            revisions[student_id] = revisions.get(student_id, 0) + 1
+            for aggregates, key in ((by_lo, (student_id, lo_id)), (by_content_type, (student_id, content_type))):
+                aggregate = aggregates.get(key)
+                if aggregate is None:
+                    aggregate = aggregates[key] = DecayedAggregate(timestamp)
+                elapsed = timestamp - aggregate.last_timestamp
+                if elapsed > 0:
+                    decay = exp(-decay_rate * elapsed)
+                    aggregate.weight *= decay
+                    aggregate.accuracy_sum *= decay
+                    aggregate.time_sum *= decay
+                    aggregate.attempts_sum *= decay
+                    aggregate.last_timestamp = timestamp
+                    observation_weight = 1.0
+                else:
+                    observation_weight = exp(decay_rate * elapsed) if elapsed else 1.0
+                aggregate.weight += observation_weight
+                aggregate.accuracy_sum += observation_weight * score
+                aggregate.time_sum += observation_weight * time_on_task
+                aggregate.attempts_sum += observation_weight * attempts
+                aggregate.event_count += 1
+            count += 1
+        self.events_ingested += count
+        return count
+
+    def student_revision(self, student_id):
+        """Changes whenever a result for the student is ingested (for caches of derived results, e.g. pathways)."""
+        return self._revisions.get(student_id, 0)
+
+    def lo_aggregate(self, student_id, lo_id):
+        return self._by_lo.get((student_id, lo_id))
+
+    def content_type_aggregate(self, student_id, content_type):
+        return self._by_content_type.get((student_id, content_type))
+
+    def lo_mastery_status(self, student_id, lo_id):
+        """Classifies the student's mastery of an LO from its decayed accuracy."""
+        aggregate = self._by_lo.get((student_id, lo_id))
+        if aggregate is None or aggregate.weight < self.min_weight:
+            return NOT_STARTED
+        accuracy = aggregate.accuracy
+        if accuracy >= self.mastery_threshold:
+            return MASTERED
+        if accuracy < self.struggle_threshold:
+            return STRUGGLING
+        return PARTIAL_UNDERSTANDING
+
+    def content_type_accuracy(self, student_id, content_types):
+        """Returns {content_type: decayed accuracy} for the given types the student has results for."""
+        accuracies = {}
+        for content_type in content_types:
+            aggregate = self._by_content_type.get((student_id, content_type))
+            if aggregate is not None and aggregate.weight:
+                accuracies[content_type] = aggregate.accuracy
+        return accuracies
+
+    def __len__(self):
+        return len(self._by_lo)
+
+if __name__ == "__main__":
+    print("--- DALA Performance Feedback Demo ---")
+    tracker = PerformanceTracker(half_life_seconds=3600)
+    start = 1_700_000_000
+    tracker.ingest_many([
+        ActivityResult("student_001", "Y4MD_LO1", "game", 0.95, 120, 1, start),
+        ActivityResult("student_001", "Y4MD_LO2", "interactive_quiz", 0.30, 300, 3, start + 60),
+        ActivityResult("student_001", "Y4MD_LO2", "video", 0.55, 240, 2, start + 7200),
+        ActivityResult("student_001", "Y4MD_LO3", "worksheet_pdf", 0.70, 200, 1, start + 7260),
+    ])
+    for lo_id in ("Y4MD_LO1", "Y4MD_LO2", "Y4MD_LO3", "Y4MD_LO4"):
+        print(f"{lo_id}: {tracker.lo_mastery_status('student_001', lo_id)} {tracker.lo_aggregate('student_001', lo_id)}")
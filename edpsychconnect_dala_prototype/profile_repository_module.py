@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Profile Repository Module
+
+This module contains the logic for:
+1.  Persisting learner profiles durably in a local SQLite database.
+2.  Loading profiles back by student ID, by list of IDs, or by class.
+3.  Batched, transactional upserts (save_many) for bulk writes.
+4.  Delta writes (save_changes): small patches appended to a log table and folded in on load.
+5.  A small connection pool so threaded servers can share one repository.
+
+Each profile is stored as its compact to_dict() JSON alongside its schema version, so rows written
+by older versions are upgraded on load (see hlp_module.migrate_profile_dict). Statements use fixed
+SQL text with parameters, so sqlite3's per-connection statement cache keeps them prepared.
+
+Most writes are tiny (one new metric, LO or badge), so save_changes stores each profile's
+pending_patch() instead of rewriting its whole row. Patches are appended in insertion order, so a
+batch of them fills a few contiguous pages rather than dirtying one page per profile. compact()
+folds accumulated patches back into the profile rows.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from hlp_module import LearnerProfile, apply_profile_patch
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS learner_profiles (
+        student_id TEXT PRIMARY KEY,
+        class_id TEXT,
+        schema_version INTEGER NOT NULL,
+        profile_json TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_learner_profiles_class_id ON learner_profiles (class_id)",
+    """CREATE TABLE IF NOT EXISTS learner_profile_patches (
+        patch_id INTEGER PRIMARY KEY,
+        student_id TEXT NOT NULL,
+        patch_json TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_learner_profile_patches_student_id ON learner_profile_patches (student_id)",
+)
+
+# class_id is only overwritten when a new one is given, so re-saving a profile keeps its class
+_UPSERT_SQL = """
+    INSERT INTO learner_profiles (student_id, class_id, schema_version, profile_json, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (student_id) DO UPDATE SET
+        class_id = COALESCE(excluded.class_id, learner_profiles.class_id),
+        schema_version = excluded.schema_version,
+        profile_json = excluded.profile_json,
+        updated_at = excluded.updated_at
+"""
+_INSERT_PATCH_SQL = "INSERT INTO learner_profile_patches (student_id, patch_json) VALUES (?, ?)"
+_DELETE_PATCHES_SQL = "DELETE FROM learner_profile_patches WHERE student_id = ?"
+_SELECT_ONE_SQL = "SELECT profile_json FROM learner_profiles WHERE student_id = ?"
+_SELECT_PATCHES_SQL = "SELECT student_id, patch_json FROM learner_profile_patches WHERE student_id = ? ORDER BY patch_id"
+_SELECT_CLASS_SQL = "SELECT profile_json FROM learner_profiles WHERE class_id = ? ORDER BY student_id"
+_SELECT_CLASS_PATCHES_SQL = """
+    SELECT student_id, patch_json FROM learner_profile_patches
+    WHERE student_id IN (SELECT student_id FROM learner_profiles WHERE class_id = ?)
+    ORDER BY patch_id
+"""
+_SELECT_PATCHED_IDS_SQL = "SELECT DISTINCT student_id FROM learner_profile_patches"
+_COUNT_PATCHES_SQL = "SELECT COUNT(*) FROM learner_profile_patches"
+_DELETE_SQL = "DELETE FROM learner_profiles WHERE student_id = ?"
+_COUNT_SQL = "SELECT COUNT(*) FROM learner_profiles"
+
+# SQLite's default limit on bound parameters per statement is 999 on older builds
+_MAX_IDS_PER_QUERY = 900
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections shared between threads."""
+    def __init__(self, database_path, pool_size=4):
+        self.database_path = database_path
+        # Every ":memory:" connection is a separate database, so an in-memory pool holds just one
+        self.pool_size = 1 if database_path == ":memory:" else pool_size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all_connections = []
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database_path, check_same_thread=False, timeout=30.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.pool_size:
+                self._created += 1
+                connection = self._connect()
+                self._all_connections.append(connection)
+                return connection
+        return self._idle.get()  # Pool exhausted: wait for another thread to release one
+
+    def release(self, connection):
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        with self._lock:
+            for connection in self._all_connections:
+                connection.close()
+            self._all_connections = []
+            self._created = 0
+            self._idle = queue.LifoQueue()
+
+class ProfileRepository:
+    """Loads and saves learner profiles in a SQLite database.
+
+    profile_class (and profile_kwargs, e.g. {"lo_index": store.lo_index}) control what load() builds,
+    so a repository can hand back CompactLearnerProfile objects for large cohorts.
+    """
+    def __init__(self, database_path, pool_size=4, profile_class=LearnerProfile, profile_kwargs=None):
+        self.pool = ConnectionPool(database_path, pool_size)
+        self.profile_class = profile_class
+        self.profile_kwargs = profile_kwargs or {}
+        with self.pool.connection() as connection, connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @staticmethod
+    def _encode(profile):
+        profile_dict = profile.to_dict()
+        return profile_dict["schema_version"], json.dumps(profile_dict, separators=(",", ":"))
+
+    def _decode(self, profile_json, patches_by_student=None):
+        profile_dict = json.loads(profile_json)
+        if patches_by_student:
+            for patch_json in patches_by_student.get(profile_dict["student_id"], ()):
+                profile_dict = apply_profile_patch(profile_dict, json.loads(patch_json))
+        return self.profile_class.from_dict(profile_dict, **self.profile_kwargs)
+
+    @staticmethod
+    def _group_patches(rows):
+        patches_by_student = {}
+        for student_id, patch_json in rows:
+            patches_by_student.setdefault(student_id, []).append(patch_json)
+        return patches_by_student
+
+    def save(self, profile, class_id=None):
+        """Inserts or replaces one profile."""
+        self.save_many([profile], class_id=class_id)
+
+    @staticmethod
+    def _write_rows(connection, rows, patches=()):
+        with connection:
+            if rows:
+                connection.executemany(_UPSERT_SQL, rows)
+                # A full row supersedes any patches logged for the same profile
+                connection.executemany(_DELETE_PATCHES_SQL, [(row[0],) for row in rows])
+            if patches:
+                connection.executemany(_INSERT_PATCH_SQL, patches)
+
+    @staticmethod
+    def _restore_checkpoints(checkpoints):
+        # The batch never committed: put each profile's changes back so the next save writes them
+        for profile, patch in checkpoints:
+            profile.restore_pending_changes(patch)
+
+    def save_many(self, profiles, class_id=None, batch_size=1000):
+        """Upserts whole profiles in transactions of up to batch_size rows and checkpoints them.
+
+        Each profile is checkpointed as it is encoded, so changes made while its batch is written stay
+        pending for the next save; if the batch fails, its checkpoints are undone. Returns the number saved.
+        """
+        saved_count = 0
+        batch, checkpoints = [], []
+        try:
+            with self.pool.connection() as connection:
+                for profile in profiles:
+                    schema_version, profile_json = self._encode(profile)
+                    checkpoints.append((profile, profile.checkpoint()))
+                    batch.append((profile.student_id, class_id, schema_version, profile_json, time.time()))
+                    if len(batch) >= batch_size:
+                        self._write_rows(connection, batch)
+                        saved_count += len(batch)
+                        batch, checkpoints = [], []
+                if batch:
+                    self._write_rows(connection, batch)
+                    saved_count += len(batch)
+                    batch, checkpoints = [], []
+        except BaseException:
+            self._restore_checkpoints(checkpoints)
+            raise
+        return saved_count
+
+    def save_changes(self, profiles, class_id=None, batch_size=1000):
+        """Persists only what changed in each profile since its last checkpoint, then checkpoints it.
+
+        Profiles with a checkpoint (loaded from this repository or saved before) get their
+        pending_patch() appended to the patch log; profiles that were never checkpointed are saved in
+        full (with class_id). Unchanged profiles are skipped. Each profile is checkpointed as its patch or
+        row is taken and the checkpoint is undone if the batch fails, so a failed write leaves it dirty
+        and changes made during the write are kept for the next save. Returns (patches_written, full_saves).
+        """
+        rows, patches, checkpoints = [], [], []
+        patch_count = full_count = 0
+        try:
+            with self.pool.connection() as connection:
+                for profile in profiles:
+                    dirty_fields = profile.dirty_fields
+                    if dirty_fields is None:
+                        schema_version, profile_json = self._encode(profile)
+                        checkpoints.append((profile, profile.checkpoint()))
+                        rows.append((profile.student_id, class_id, schema_version, profile_json, time.time()))
+                    elif dirty_fields:
+                        patch = profile.checkpoint()
+                        checkpoints.append((profile, patch))
+                        patches.append((profile.student_id, json.dumps(patch, separators=(",", ":"))))
+                    else:
+                        continue
+                    if len(rows) + len(patches) >= batch_size:
+                        self._write_rows(connection, rows, patches)
+                        full_count += len(rows)
+                        patch_count += len(patches)
+                        rows, patches, checkpoints = [], [], []
+                if rows or patches:
+                    self._write_rows(connection, rows, patches)
+                    full_count += len(rows)
+                    patch_count += len(patches)
+                    rows, patches, checkpoints = [], [], []
+        except BaseException:
+            self._restore_checkpoints(checkpoints)
+            raise
+        return patch_count, full_count
+
+    def pending_patch_count(self):
+        """Number of logged patches not yet folded into profile rows by compact()."""
+        with self.pool.connection() as connection:
+            return connection.execute(_COUNT_PATCHES_SQL).fetchone()[0]
+
+    def compact(self, batch_size=1000):
+        """Folds every logged patch into its profile row and clears the log. Returns the profiles rewritten.
+
+        Each batch is read, folded, rewritten and its patches deleted in one BEGIN IMMEDIATE transaction,
+        so patches appended by other connections meanwhile are neither deleted unfolded nor folded twice.
+        """
+        rewritten_count = 0
+        with self.pool.connection() as connection:
+            student_ids = [student_id for (student_id,) in connection.execute(_SELECT_PATCHED_IDS_SQL).fetchall()]
+            for start in range(0, len(student_ids), batch_size):
+                rewritten_count += self._compact_batch(connection, student_ids[start:start + batch_size])
+        return rewritten_count
+
+    def _compact_batch(self, connection, student_ids):
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            profiles = self._load_many(connection, student_ids).values()
+            # class_id=None keeps each row's class (see _UPSERT_SQL)
+            rows = [(profile.student_id, None, *self._encode(profile), time.time()) for profile in profiles]
+            connection.executemany(_UPSERT_SQL, rows)
+            connection.executemany(_DELETE_PATCHES_SQL, [(student_id,) for student_id in student_ids])
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+        return len(rows)
+
+    def load(self, student_id):
+        """Returns the stored profile for student_id, or None if there is none."""
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_ONE_SQL, (student_id,)).fetchone()
+            patch_rows = connection.execute(_SELECT_PATCHES_SQL, (student_id,)).fetchall() if row else ()
+        return self._decode(row[0], self._group_patches(patch_rows)) if row else None
+
+    def load_many(self, student_ids):
+        """Returns {student_id: profile} for the requested IDs that exist."""
+        with self.pool.connection() as connection:
+            return self._load_many(connection, list(student_ids))
+
+    def _load_many(self, connection, student_ids):
+        profiles = {}
+        for start in range(0, len(student_ids), _MAX_IDS_PER_QUERY):
+            chunk = student_ids[start:start + _MAX_IDS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT profile_json FROM learner_profiles WHERE student_id IN ({placeholders})", chunk
+            ).fetchall()
+            patches_by_student = self._group_patches(connection.execute(
+                f"SELECT student_id, patch_json FROM learner_profile_patches WHERE student_id IN ({placeholders}) ORDER BY patch_id", chunk
+            ).fetchall())
+            for (profile_json,) in rows:
+                profile = self._decode(profile_json, patches_by_student)
+                profiles[profile.student_id] = profile
+        return profiles
+
+    def load_class(self, class_id):
+        """Returns every profile saved with class_id, ordered by student ID."""
+        with self.pool.connection() as connection:
+            rows = connection.execute(_SELECT_CLASS_SQL, (class_id,)).fetchall()
+            patches_by_student = self._group_patches(connection.execute(_SELECT_CLASS_PATCHES_SQL, (class_id,)).fetchall())
+        return [self._decode(profile_json, patches_by_student) for (profile_json,) in rows]
+
+    def delete(self, student_id):
+        with self.pool.connection() as connection, connection:
+            connection.execute(_DELETE_SQL, (student_id,))
+            connection.execute(_DELETE_PATCHES_SQL, (student_id,))
+
+    def count(self):
+        with self.pool.connection() as connection:
+            return connection.execute(_COUNT_SQL).fetchone()[0]
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+if __name__ == "__main__":
+    from hlp_module import run_full_hlp_assessment
+
+    print("--- DALA Profile Repository Demo (in-memory SQLite) ---")
+    with ProfileRepository(":memory:") as repository:
+        profiles = [run_full_hlp_assessment(f"student_{i:03d}") for i in range(3)]
+        repository.save_many(profiles, class_id="4B")
+        print(f"Stored profiles: {repository.count()}")
+        for loaded in repository.load_class("4B"):
+            print(f"  {loaded.student_id}: {len(loaded.completed_los)} LOs, badges {sorted(loaded.earned_badges)}")
+
+        profiles[0].add_cognitive_metric("story_weaver", "attempts", 2)
+        print(f"Pending patch: {profiles[0].pending_patch()}")
+        patch_count, full_count = repository.save_changes(profiles)
+        print(f"save_changes wrote {patch_count} patch(es) and {full_count} full profile(s)")
+        print(f"Reloaded metrics: {repository.load(profiles[0].student_id).cognitive_metrics}")
+        print(f"compact() rewrote {repository.compact()} profile(s); {repository.pending_patch_count()} patches left")
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Profile Serialization Module
+
+This module contains the logic for:
+1.  Rebuilding learner profiles from to_dict() dictionaries of any schema version (profile_from_dict).
+2.  A compact, versioned binary encoding of learner profiles (encode_profile / decode_profile).
+
+Binary layout (format version 2), after the 3-byte magic b"DLP", a version byte and a flags byte:
+    strings     varint byte length + UTF-8 blob of every distinct string, NUL-separated
+    structure   varint byte length + varint stream of counts, string references and value tags
+    floats      varint count + little-endian float64 array
+    int64s      varint count + little-endian int64 array (ints too large for the structure stream,
+                and badge earned timestamps as microseconds since the epoch)
+
+Format 2 adds cognitive_metric_history (schema version 3) after the earned badges: per task and
+metric a sample count in the structure stream, with the samples' timestamps and values in floats.
+
+Strings are stored once and referenced by index, so repeated task names, interests and badge IDs
+cost one byte each. When encoded against a LearningObjectiveIndex (FLAG_LO_INDEX), completed LOs
+are delta-encoded index varints; decoding must then use the same index. Readers keep a decoder per
+format version, so data written by older versions stays readable.
+"""
+
+import datetime
+import json
+import struct
+
+from hlp_module import LearnerProfile, PROFILE_SCHEMA_VERSION, migrate_profile_dict
+
+MAGIC = b"DLP"
+FORMAT_VERSION = 2
+
+FLAG_LO_INDEX = 0x01     # Completed LOs are LearningObjectiveIndex indices, not string references
+FLAG_LONG_STRINGS = 0x02  # Strings contain NUL, so the blob is length-prefixed instead of NUL-separated
+
+# Value tags in the structure stream
+_TAG_NONE, _TAG_FALSE, _TAG_TRUE, _TAG_SMALL_INT, _TAG_INT64, _TAG_FLOAT, _TAG_STRING, _TAG_JSON, _TAG_TIMESTAMP = range(9)
+
+_SMALL_INT_LIMIT = 1 << 20
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+class SerializationError(ValueError):
+    """Raised when encoded profile data is malformed or uses an unknown format version."""
+
+# --- Dictionaries ---
+def profile_from_dict(profile_dict, profile_class=LearnerProfile, **kwargs):
+    """Rebuilds a profile from a to_dict() dictionary, upgrading older schema versions first."""
+    return profile_class.from_dict(profile_dict, **kwargs)
+
+# --- Varints ---
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _encode_varints(values):
+    if not values or max(values) < 0x80:
+        return bytes(values)
+    out = bytearray()
+    for value in values:
+        _write_varint(out, value)
+    return bytes(out)
+
+def _decode_varints(data):
+    if data.isascii():  # Every value fit in one byte
+        return list(data)
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+def _read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+# --- Timestamps ---
+def _timestamp_to_micros(date_earned):
+    """Returns microseconds since the epoch if date_earned round-trips exactly, else None."""
+    if not isinstance(date_earned, str) or not date_earned.endswith("Z"):
+        return None
+    try:
+        moment = datetime.datetime.fromisoformat(date_earned[:-1])
+    except ValueError:
+        return None
+    if moment.tzinfo is not None or moment.isoformat() + "Z" != date_earned:
+        return None
+    return (moment - _EPOCH) // _MICROSECOND
+
+def _micros_to_timestamp(micros):
+    return (_EPOCH + datetime.timedelta(microseconds=micros)).isoformat() + "Z"
+
+# --- Encoding ---
+class _Encoder:
+    __slots__ = ("strings", "structure", "floats", "int64s")
+
+    def __init__(self):
+        self.strings = {}
+        self.structure = []
+        self.floats = []
+        self.int64s = []
+
+    def ref(self, text):
+        strings = self.strings
+        return strings.setdefault(text, len(strings))
+
+    def value(self, value):
+        structure = self.structure
+        if value is None:
+            structure.append(_TAG_NONE)
+        elif value is True:
+            structure.append(_TAG_TRUE)
+        elif value is False:
+            structure.append(_TAG_FALSE)
+        elif type(value) is int:
+            if -_SMALL_INT_LIMIT < value < _SMALL_INT_LIMIT:
+                structure.append(_TAG_SMALL_INT)
+                structure.append(_zigzag(value))
+            elif _INT64_MIN <= value <= _INT64_MAX:
+                structure.append(_TAG_INT64)
+                self.int64s.append(value)
+            else:
+                structure.append(_TAG_JSON)
+                structure.append(self.ref(json.dumps(value)))
+        elif type(value) is float:
+            structure.append(_TAG_FLOAT)
+            self.floats.append(value)
+        elif type(value) is str:
+            structure.append(_TAG_STRING)
+            structure.append(self.ref(value))
+        else:
+            structure.append(_TAG_JSON)
+            structure.append(self.ref(json.dumps(value, separators=(",", ":"))))
+
+def encode_profile(profile, lo_index=None):
+    """Encodes a learner profile (LearnerProfile or CompactLearnerProfile) as compact binary data.
+
+    Pass lo_index (e.g. store.lo_index) to store completed LOs as index varints; the same index must
+    then be given to decode_profile.
+    """
+    encoder = _Encoder()
+    strings = encoder.strings
+    ref = encoder.ref
+    intern = strings.setdefault  # intern(text, len(strings)) is ref(text) without the method call
+    structure = encoder.structure
+    append = structure.append
+    flags = 0
+
+    append(ref(profile.student_id))
+    current_lo = profile.current_learning_objective_id
+    append(0 if current_lo is None else ref(current_lo) + 1)
+
+    preferences = profile.learning_preferences
+    append(len(preferences))
+    for task_name, preference in preferences.items():
+        append(intern(task_name, len(strings)))
+        encoder.value(preference)
+
+    for values in (profile.interests, profile.struggle_areas):
+        append(len(values))
+        structure += [intern(text, len(strings)) for text in values]
+
+    metrics = profile.cognitive_metrics
+    append(len(metrics))
+    for task_name, task_metrics in metrics.items():
+        append(intern(task_name, len(strings)))
+        append(len(task_metrics))
+        for metric_name, value in task_metrics.items():
+            append(intern(metric_name, len(strings)))
+            encoder.value(value)
+
+    if lo_index is not None:
+        flags |= FLAG_LO_INDEX
+        if getattr(profile, "lo_index", None) is lo_index:
+            mask = profile.completed_lo_mask
+        else:
+            mask = lo_index.mask_for(profile.completed_los)
+        indices = []
+        while mask:
+            lowest_bit = mask & -mask
+            indices.append(lowest_bit.bit_length() - 1)
+            mask ^= lowest_bit
+        append(len(indices))
+        previous = 0
+        for index in indices:
+            append(index - previous)
+            previous = index
+    else:
+        completed_los = profile.completed_los
+        append(len(completed_los))
+        structure += [intern(lo_id, len(strings)) for lo_id in completed_los]
+
+    earned_badges = profile.earned_badges
+    append(len(earned_badges))
+    for badge_id, date_earned in earned_badges.items():
+        append(intern(badge_id, len(strings)))
+        micros = _timestamp_to_micros(date_earned)
+        if micros is not None:
+            append(_TAG_TIMESTAMP)
+            encoder.int64s.append(micros)
+        else:
+            encoder.value(date_earned)
+
+    history = profile.cognitive_metric_history
+    floats = encoder.floats
+    append(len(history))
+    for task_name, task_history in history.items():
+        append(intern(task_name, len(strings)))
+        append(len(task_history))
+        for metric_name, series in task_history.items():
+            append(intern(metric_name, len(strings)))
+            samples = series.samples()
+            append(len(samples))
+            for sample in samples:
+                floats += sample
+
+    strings = list(strings)
+    joined = "\0".join(strings)
+    if joined.count("\0") != max(len(strings) - 1, 0):
+        flags |= FLAG_LONG_STRINGS
+        blob = bytearray()
+        for text in strings:
+            encoded = text.encode("utf-8")
+            _write_varint(blob, len(encoded))
+            blob += encoded
+        string_blob = bytes(blob)
+    else:
+        string_blob = joined.encode("utf-8")
+
+    structure_bytes = _encode_varints(structure)
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    out.append(flags)
+    _write_varint(out, len(strings))
+    _write_varint(out, len(string_blob))
+    out += string_blob
+    _write_varint(out, len(structure_bytes))
+    out += structure_bytes
+    _write_varint(out, len(encoder.floats))
+    if encoder.floats:
+        out += struct.pack(f"<{len(encoder.floats)}d", *encoder.floats)
+    _write_varint(out, len(encoder.int64s))
+    if encoder.int64s:
+        out += struct.pack(f"<{len(encoder.int64s)}q", *encoder.int64s)
+    return bytes(out)
+
+# --- Decoding ---
+def _decode_v1(data, flags, position, lo_index):
+    return _decode_body(data, flags, position, lo_index, with_history=False)
+
+def _decode_v2(data, flags, position, lo_index):
+    return _decode_body(data, flags, position, lo_index, with_history=True)
+
+def _decode_body(data, flags, position, lo_index, with_history):
+    string_count, position = _read_varint(data, position)
+    blob_length, position = _read_varint(data, position)
+    blob = data[position:position + blob_length]
+    position += blob_length
+    if flags & FLAG_LONG_STRINGS:
+        strings = []
+        offset = 0
+        while offset < len(blob):
+            length, offset = _read_varint(blob, offset)
+            strings.append(bytes(blob[offset:offset + length]).decode("utf-8"))
+            offset += length
+    else:
+        strings = bytes(blob).decode("utf-8").split("\0") if string_count else []
+    if len(strings) != string_count:
+        raise SerializationError("String table length does not match its header")
+
+    structure_length, position = _read_varint(data, position)
+    structure = _decode_varints(bytes(data[position:position + structure_length]))
+    position += structure_length
+    float_count, position = _read_varint(data, position)
+    floats = struct.unpack_from(f"<{float_count}d", data, position)
+    position += 8 * float_count
+    int64_count, position = _read_varint(data, position)
+    int64s = struct.unpack_from(f"<{int64_count}q", data, position)
+
+    cursor = iter(structure)
+    next_item = cursor.__next__
+    float_cursor = iter(floats).__next__
+    int64_cursor = iter(int64s).__next__
+
+    def read_value(tag):
+        if tag == _TAG_STRING:
+            return strings[next_item()]
+        if tag == _TAG_SMALL_INT:
+            return _unzigzag(next_item())
+        if tag == _TAG_FLOAT:
+            return float_cursor()
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_INT64:
+            return int64_cursor()
+        if tag == _TAG_TIMESTAMP:
+            return _micros_to_timestamp(int64_cursor())
+        if tag == _TAG_JSON:
+            return json.loads(strings[next_item()])
+        raise SerializationError(f"Unknown value tag {tag}")
+
+    student_id = strings[next_item()]
+    current_lo_ref = next_item()
+    preferences = {}
+    for _ in range(next_item()):
+        task_name = strings[next_item()]
+        preferences[task_name] = read_value(next_item())
+    interests = [strings[next_item()] for _ in range(next_item())]
+    struggle_areas = [strings[next_item()] for _ in range(next_item())]
+    metrics = {}
+    for _ in range(next_item()):
+        task_name = strings[next_item()]
+        task_metrics = metrics[task_name] = {}
+        for _ in range(next_item()):
+            metric_name = strings[next_item()]
+            task_metrics[metric_name] = read_value(next_item())
+
+    lo_count = next_item()
+    if flags & FLAG_LO_INDEX:
+        if lo_index is None:
+            raise SerializationError("Profile was encoded against a LearningObjectiveIndex; pass lo_index to decode it")
+        completed_los = []
+        index = 0
+        for _ in range(lo_count):
+            index += next_item()
+            completed_los.append(lo_index.lo_id_at(index))
+    else:
+        completed_los = [strings[next_item()] for _ in range(lo_count)]
+
+    earned_badges = {}
+    for _ in range(next_item()):
+        badge_id = strings[next_item()]
+        earned_badges[badge_id] = read_value(next_item())
+
+    profile_dict = {
+        "student_id": student_id,
+        "learning_preferences": preferences,
+        "interests": interests,
+        "struggle_areas": struggle_areas,
+        "cognitive_metrics": metrics,
+        "completed_los": completed_los,
+        "current_learning_objective_id": None if current_lo_ref == 0 else strings[current_lo_ref - 1],
+        "earned_badges": earned_badges,
+        "schema_version": 2,
+    }
+    if with_history:
+        history = {}
+        for _ in range(next_item()):
+            task_history = history[strings[next_item()]] = {}
+            for _ in range(next_item()):
+                metric_name = strings[next_item()]
+                task_history[metric_name] = [[float_cursor(), float_cursor()] for _ in range(next_item())]
+        profile_dict["cognitive_metric_history"] = history
+        profile_dict["schema_version"] = 3
+    return profile_dict
+
+# Decoders for every binary format version ever written; never remove old entries
+_DECODERS = {1: _decode_v1, 2: _decode_v2}
+
+def decode_profile_dict(data, lo_index=None):
+    """Decodes binary profile data into a to_dict()-shaped dictionary at the current schema version."""
+    data = memoryview(data)
+    if bytes(data[:3]) != MAGIC or len(data) < 5:
+        raise SerializationError("Not an encoded DALA learner profile")
+    version, flags = data[3], data[4]
+    decoder = _DECODERS.get(version)
+    if decoder is None:
+        raise SerializationError(f"Unsupported profile format version {version} (newest known: {FORMAT_VERSION})")
+    try:
+        profile_dict = decoder(data, flags, 5, lo_index)
+    except (IndexError, StopIteration, struct.error, UnicodeDecodeError) as e:
+        raise SerializationError(f"Truncated or corrupt profile data: {e}") from e
+    if profile_dict.get("schema_version") != PROFILE_SCHEMA_VERSION:
+        profile_dict = migrate_profile_dict(profile_dict)
+    return profile_dict
+
+def decode_profile(data, profile_class=LearnerProfile, lo_index=None, **kwargs):
+    """Decodes binary profile data into a profile object of profile_class."""
+    profile_dict = decode_profile_dict(data, lo_index=lo_index)
+    if lo_index is not None and "lo_index" not in kwargs and profile_class is not LearnerProfile:
+        kwargs["lo_index"] = lo_index
+    return profile_class.from_dict(profile_dict, **kwargs)
@@ -0,0 +1,33 @@
+import os
+import sys
+
+# The prototype modules are flat top-level modules imported by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import events_module
+
+
+class RecordingEventSink:
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def recorded_events():
+    sink = RecordingEventSink()
+    previous_sink = events_module.set_event_sink(sink)
+    yield sink.events
+    events_module.set_event_sink(previous_sink)
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from badge_backfill_module import backfill_badges
+from badge_rules_module import compile_rule
+from curriculum_content_module import LearningObjectiveIndex
+from hlp_module import BADGE_ENGINE, CompactLearnerProfile, LearnerProfile
+
+RULES = {
+    "prefers_visual": {"field": "learning_preferences", "path": "visual_preference_task_1", "op": "eq", "value": "visual"},
+    "numeria_pair": {"field": "completed_los", "op": "contains_all", "value": ["MA4_N1a", "MA4_N1b"]},
+    "never_indexed_lo": {"field": "completed_los", "op": "contains", "value": "XX_UNKNOWN"},
+    "three_los": {"field": "completed_los", "op": "count_gte", "value": 3},
+    "repeat_attempts": {"field": "cognitive_metrics", "path": ["story_weaver", "attempts"], "op": "gt", "value": 1, "default": 0},
+    "no_struggles": {"not": {"field": "struggle_areas", "op": "exists"}},
+    "text_metric": {"field": "cognitive_metrics", "path": ["story_weaver", "mood"], "op": "gte", "value": "calm"},
+}
+
+
+def _profiles(profile_class, count=300, **kwargs):
+    rng = random.Random(7)
+    profiles = []
+    for i in range(count):
+        profile = profile_class(f"student_backfill_{i:04d}", **kwargs)
+        if rng.random() < 0.5:
+            profile.update_preference("visual_preference_task_1", rng.choice(["visual", "non-visual"]))
+        if rng.random() < 0.3:
+            profile.add_struggle_area("Fractions")
+        if rng.random() < 0.7:
+            profile.add_cognitive_metric("story_weaver", "attempts", rng.randint(1, 3), timestamp=0.0)
+        if rng.random() < 0.3:
+            profile.add_cognitive_metric("story_weaver", "mood", rng.choice(["anxious", "calm", "excited"]), timestamp=0.0)
+        for lo_id in rng.sample(["MA4_N1a", "MA4_N1b", "EN4_C1a", "Y4MD_LO1"], k=rng.randint(0, 4)):
+            profile.mark_lo_completed(lo_id)
+        if rng.random() < 0.2:
+            profile.add_badge("three_los")
+        profiles.append(profile)
+    return profiles
+
+
+@pytest.mark.parametrize("profile_class, kwargs", [
+    (LearnerProfile, {}),
+    (CompactLearnerProfile, {"lo_index": LearningObjectiveIndex()}),
+])
+def test_columnar_backfill_matches_the_compiled_rules(profile_class, kwargs):
+    profiles = _profiles(profile_class, **kwargs)
+    expected = sorted((profile.student_id, badge_id) for badge_id, rule in RULES.items() for profile in profiles
+                      if not profile.has_badge(badge_id) and compile_rule(rule)(profile))
+    found = sorted((profile.student_id, badge_id) for profile, badge_id in backfill_badges(profiles, list(RULES), rules=RULES, chunk_size=64))
+    assert found == expected
+
+
+def test_hand_written_badges_do_not_count_in_the_engine_stats():
+    profiles = _profiles(LearnerProfile, count=20)
+    BADGE_ENGINE.reset_stats()
+    found = list(backfill_badges(profiles, ["helping_hand"]))
+    assert {profile.student_id for profile, _ in found} == {
+        profile.student_id for profile in profiles if profile.struggle_areas and not profile.has_badge("helping_hand")}
+    assert BADGE_ENGINE.stats()["evaluations_run"] == 0
@@ -0,0 +1,36 @@
+from events_module import BadgeAwardedEvent, BadgeProblemEvent
+from hlp_module import BadgeEvaluationEngine, LearnerProfile, BADGE_DEFINITIONS, award_badge_if_criteria_met
+
+
+def test_skipped_counts_only_badges_ruled_out_by_the_index():
+    engine = BadgeEvaluationEngine(BADGE_DEFINITIONS)
+    profile = LearnerProfile("student_engine_001")
+    profile.add_struggle_area("fractions")
+    engine.check_profile(profile)
+    assert profile.has_badge("helping_hand")
+    engine.reset_stats()
+
+    profile.add_struggle_area("decimals")
+    engine.check_profile(profile)
+    # helping_hand is the only badge reading struggle_areas, and it is already earned
+    assert engine.stats() == {
+        "evaluations_run": 0,
+        "evaluations_skipped": len(BADGE_DEFINITIONS) - len(profile.earned_badges),
+        "evaluations_already_awarded": 1,
+    }
+
+
+def test_badge_problems_are_events_not_prints(recorded_events, capsys):
+    profile = LearnerProfile("student_engine_002")
+    assert award_badge_if_criteria_met(profile, "no_such_badge") is None
+    assert not profile.add_badge("no_such_badge")
+    assert capsys.readouterr().out == ""
+    problems = [event for event in recorded_events if isinstance(event, BadgeProblemEvent)]
+    assert [event.badge_id for event in problems] == ["no_such_badge", "no_such_badge"]
+
+
+def test_badge_awards_are_reported_as_events(recorded_events):
+    profile = LearnerProfile("student_engine_003")
+    profile.add_struggle_area("fractions")
+    assert award_badge_if_criteria_met(profile, "helping_hand") is not None
+    assert any(isinstance(event, BadgeAwardedEvent) and event.badge_id == "helping_hand" for event in recorded_events)
@@ -0,0 +1,55 @@
+import pytest
+
+import hlp_module
+from badge_rules_module import BadgeRuleError, compile_rule, validate_badge_definition
+
+
+def _definition(criteria):
+    return {"id": "test_badge", "name": "Test Badge", "description": "", "criteria": criteria}
+
+
+@pytest.mark.parametrize("rule", [
+    {"field": "completed_lo", "op": "count_gte", "value": 1},
+    {"field": "cognitive_metrics", "path": ["story_weaver", 1], "op": "gt", "value": 1},
+    {"field": "cognitive_metrics", "path": {"task": "story_weaver"}, "op": "exists"},
+    {"field": "completed_los", "op": "count_gte", "value": "3"},
+    {"field": "completed_los", "op": "count_eq", "value": True},
+    {"field": "cognitive_metrics", "path": ["story_weaver", "attempts"], "op": "gt", "value": [1]},
+    {"field": "cognitive_metrics", "path": ["story_weaver", "attempts"], "op": "lte", "value": None},
+])
+def test_malformed_leaves_are_rejected_at_compile_time(rule):
+    with pytest.raises(BadgeRuleError):
+        compile_rule(rule)
+    with pytest.raises(BadgeRuleError):
+        validate_badge_definition(_definition({"all": [{"field": "interests", "op": "exists"}, rule]}))
+
+
+def test_unknown_field_is_rejected_by_register_badge_definitions():
+    with pytest.raises(BadgeRuleError, match="completed_lo"):
+        hlp_module.register_badge_definitions({"test_badge": _definition({"field": "completed_lo", "op": "count_gte", "value": 1})})
+    assert "test_badge" not in hlp_module.BADGE_DEFINITIONS
+
+
+def test_valid_leaves_still_compile():
+    check = compile_rule({"all": [
+        {"field": "completed_los", "op": "count_gte", "value": 1},
+        {"field": "cognitive_metrics", "path": "story_weaver", "op": "exists"},
+        {"field": "current_learning_objective_id", "op": "gte", "value": "Y4MD_LO2"},
+    ]})
+    assert check.reads_profile_fields == {"completed_los", "cognitive_metrics", "current_learning_objective_id"}
+
+
+def test_path_on_a_non_dictionary_field_is_rejected():
+    rule = {"field": "completed_los", "path": ["MA4_N1a"], "op": "exists"}
+    with pytest.raises(BadgeRuleError, match="not a dictionary"):
+        validate_badge_definition(_definition(rule))
+
+
+@pytest.mark.parametrize("path", [["visual_preference_task_1", "x"], ["visual_preference_task_1", "x", "y"]])
+def test_path_through_a_non_dictionary_value_gives_the_default(path):
+    profile = hlp_module.LearnerProfile("student_rules_001")
+    profile.update_preference("visual_preference_task_1", "visual")
+    validate_badge_definition(_definition({"field": "learning_preferences", "path": path, "op": "exists"}))
+    assert compile_rule({"field": "learning_preferences", "path": path, "op": "exists"})(profile) is False
+    assert compile_rule({"field": "learning_preferences", "path": path, "op": "eq", "value": 1, "default": 1})(profile) is True
+
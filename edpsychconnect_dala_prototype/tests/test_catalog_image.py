@@ -0,0 +1,59 @@
+import gzip
+import json
+
+import pytest
+
+from catalog_image_module import ImageBackedContentStore, compile_catalog_image, compile_catalog_image_from_files
+from content_export_module import JSONL_FORMAT
+from content_loader_module import ContentValidationError
+from curriculum_content_module import CURRICULUM_SLICE, LEARNING_CONTENT_SET, CurriculumContentStore, LearningObjectiveIndex
+
+
+def _json_store():
+    return CurriculumContentStore(CURRICULUM_SLICE, LEARNING_CONTENT_SET, lo_index=LearningObjectiveIndex())
+
+
+def _assert_same_catalog(image_store, json_store):
+    assert list(image_store.content_library) == list(json_store.content_library)
+    assert image_store.get_learning_objectives() == json_store.get_learning_objectives()
+    for lo in json_store.get_learning_objectives():
+        assert image_store.get_content_for_lo(lo["id"]) == json_store.get_content_for_lo(lo["id"])
+
+
+def test_image_store_matches_the_json_store_and_closes_cleanly(tmp_path):
+    image_path = str(tmp_path / "year4_maths_multi_div.dalacat")
+    compile_catalog_image(CURRICULUM_SLICE, LEARNING_CONTENT_SET, image_path)
+    image_store = ImageBackedContentStore.open(image_path, lo_index=LearningObjectiveIndex())
+    _assert_same_catalog(image_store, _json_store())
+    assert "CONT_MISSING" not in image_store.content_library
+    image_store.close()  # Raises BufferError if a lookup left a view of the mapping exported
+
+
+@pytest.mark.parametrize("content_name, content_format", [("content.json.gz", "json"), ("content.jsonl.xz", JSONL_FORMAT)])
+def test_compiles_compressed_checksummed_exports(tmp_path, content_name, content_format):
+    json_store = _json_store()
+    curriculum_path, content_path = str(tmp_path / "curriculum.json"), str(tmp_path / content_name)
+    json_store.export(curriculum_path, content_path, content_format=content_format)
+    image_path = str(tmp_path / "catalog.dalacat")
+    compile_catalog_image_from_files(curriculum_path, content_path, image_path, content_format=content_format)
+    image_store = ImageBackedContentStore.open(image_path, lo_index=LearningObjectiveIndex())
+    _assert_same_catalog(image_store, json_store)
+    assert "content_checksum" not in image_store.curriculum
+    image_store.close()
+
+
+def test_rejects_what_the_json_loader_rejects(tmp_path):
+    curriculum_path, content_path = str(tmp_path / "curriculum.json"), str(tmp_path / "content.json.gz")
+    _json_store().export(curriculum_path, content_path)
+    with gzip.open(content_path, "rt", encoding="utf-8") as f:
+        content = json.load(f)
+    content[0]["difficulty"] = None
+    with gzip.open(content_path, "wt", encoding="utf-8") as f:
+        json.dump(content, f)
+    image_path = tmp_path / "catalog.dalacat"
+    with pytest.raises(ContentValidationError) as excinfo:
+        compile_catalog_image_from_files(curriculum_path, content_path, str(image_path))
+    messages = [problem.message for problem in excinfo.value.problems]
+    assert any("found null" in message for message in messages)
+    assert any("checksum does not match" in message for message in messages)
+    assert not image_path.exists()
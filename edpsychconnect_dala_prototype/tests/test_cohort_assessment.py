@@ -0,0 +1,40 @@
+import events_module
+import hlp_module
+from cohort_assessment_module import iter_cohort_assessment
+
+ASSESSED_AT = "2025-09-01T09:00:00Z"
+
+def _serialized_profiles(student_ids, workers):
+    return [profile.to_dict()
+            for batch in iter_cohort_assessment(student_ids, workers=workers, cohort_seed=2025, assessed_at=ASSESSED_AT, batch_size=16)
+            for profile in batch]
+
+def test_profiles_do_not_depend_on_worker_count():
+    student_ids = [f"school_a_{i:05d}" for i in range(64)]
+    single_worker = _serialized_profiles(student_ids, workers=1)
+    assert [profile["student_id"] for profile in single_worker] == student_ids
+    assert single_worker == _serialized_profiles(student_ids, workers=3)
+
+def test_single_worker_run_restores_clocks():
+    badge_clock = hlp_module.set_badge_clock(None)
+    metric_clock = hlp_module.set_metric_clock(None)
+    try:
+        _serialized_profiles(["school_a_00000"], workers=1)
+        assert hlp_module.set_badge_clock(badge_clock) is hlp_module.utc_timestamp
+        assert hlp_module.set_metric_clock(metric_clock) is hlp_module.time.time
+    finally:
+        hlp_module.set_badge_clock(badge_clock)
+        hlp_module.set_metric_clock(metric_clock)
+
+def test_single_worker_run_pins_clocks_and_sink_only_while_assessing(recorded_events):
+    student_ids = [f"school_a_{i:05d}" for i in range(4)]
+    batches = iter_cohort_assessment(student_ids, workers=1, cohort_seed=2025, assessed_at=ASSESSED_AT, batch_size=2)
+    first_batch = next(batches)
+    # Between batches the consumer sees its own clocks and sink
+    assert hlp_module.set_badge_clock(hlp_module.utc_timestamp) is hlp_module.utc_timestamp
+    assert hlp_module.set_metric_clock(hlp_module.time.time) is hlp_module.time.time
+    assert events_module.get_event_sink().events is recorded_events
+    batches.close()
+    assert [profile.student_id for profile in first_batch] == student_ids[:2]
+    assert first_batch[0].earned_badges and set(first_batch[0].earned_badges.values()) == {ASSESSED_AT}
+    assert recorded_events == []
@@ -0,0 +1,54 @@
+import gzip
+import os
+import threading
+
+import pytest
+
+from content_export_module import AtomicWriter
+
+
+def test_threads_writing_the_same_path_do_not_share_a_temporary_file(tmp_path):
+    path = str(tmp_path / "content.json")
+    payloads = [bytes([65 + writer]) * 200_000 for writer in range(8)]
+    barrier = threading.Barrier(len(payloads))
+    errors = []
+
+    def write(payload):
+        try:
+            with AtomicWriter(path) as f:
+                barrier.wait()
+                for start in range(0, len(payload), 4096):
+                    f.write(payload[start:start + 4096])
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with open(path, "rb") as f:
+        assert f.read() in payloads  # One whole export, never an interleaving
+    assert os.listdir(tmp_path) == ["content.json"]
+
+
+def test_failed_write_removes_the_temporary_file_and_keeps_the_target(tmp_path):
+    path = str(tmp_path / "content.json.gz")
+    with AtomicWriter(path) as f:
+        f.write(b"previous")
+    with pytest.raises(RuntimeError):
+        with AtomicWriter(path) as f:
+            f.write(b"partial")
+            raise RuntimeError("export interrupted")
+    with gzip.open(path, "rb") as f:
+        assert f.read() == b"previous"
+    assert os.listdir(tmp_path) == ["content.json.gz"]
+
+
+def test_uncompressed_writer_ignores_the_suffix(tmp_path):
+    path = str(tmp_path / "catalog.gz")
+    with AtomicWriter(path, compress=False) as f:
+        f.write(b"raw bytes")
+    with open(path, "rb") as f:
+        assert f.read() == b"raw bytes"
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from content_loader_module import ContentValidationError
+from curriculum_content_module import CurriculumContentStore, LearningObjectiveIndex
+
+CURRICULUM = {"subject": "Maths", "learning_objectives": [{"id": "LO1", "description": "Recall facts"}]}
+VALID_ITEM = {"content_id": "C1", "title": "Times Tables Game", "type": "game", "learning_objectives_covered": ["LO1"],
+              "difficulty": "easy", "url_path": "/c1"}
+
+
+def _load(tmp_path, content, curriculum=CURRICULUM):
+    curriculum_path = tmp_path / "maths_curriculum.json"
+    content_path = tmp_path / "maths_content.json"
+    curriculum_path.write_text(json.dumps(curriculum, indent=1))
+    content_path.write_text(json.dumps(content, indent=1))
+    return CurriculumContentStore.from_json_files(str(curriculum_path), str(content_path), lo_index=LearningObjectiveIndex())
+
+
+@pytest.mark.parametrize("field, expected_type", [
+    ("learning_objectives_covered", "list"), ("difficulty", "str"), ("content_id", "str"), ("title", "str"),
+])
+def test_null_required_content_field_is_reported(tmp_path, field, expected_type):
+    with pytest.raises(ContentValidationError) as excinfo:
+        _load(tmp_path, [VALID_ITEM, dict(dict(VALID_ITEM, content_id="C2"), **{field: None})])
+    assert [problem.message.split(": ")[-1] for problem in excinfo.value.problems] == [f"field {field!r} should be {expected_type}, found null"]
+
+
+def test_null_required_lo_field_is_reported(tmp_path):
+    curriculum = {"subject": "Maths", "learning_objectives": [{"id": None, "description": "Recall facts"}]}
+    with pytest.raises(ContentValidationError) as excinfo:
+        _load(tmp_path, [], curriculum)
+    assert [problem.message for problem in excinfo.value.problems] == ["field 'id' should be str, found null"]
+
+
+def test_non_string_lo_ids_are_reported(tmp_path):
+    with pytest.raises(ContentValidationError) as excinfo:
+        _load(tmp_path, [dict(VALID_ITEM, learning_objectives_covered=[None, {"id": "LO1"}])])
+    assert [problem.message for problem in excinfo.value.problems] == [
+        "content 'C1': learning objective IDs should be str, found null",
+        "content 'C1': learning objective IDs should be str, found dict",
+    ]
+
+
+def test_valid_content_loads(tmp_path):
+    assert list(_load(tmp_path, [VALID_ITEM]).content_library) == ["C1"]
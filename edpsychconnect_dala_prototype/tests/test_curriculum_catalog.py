@@ -0,0 +1,75 @@
+import shutil
+import threading
+
+import pytest
+
+from curriculum_catalog_module import DATA_DIR, CurriculumCatalog
+from curriculum_content_module import LearningObjectiveIndex
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    for shard_id in ("maths_a", "maths_b"):
+        for suffix in ("_curriculum.json", "_content.json"):
+            shutil.copy(f"{DATA_DIR}/year4_maths_multi_div{suffix}", tmp_path / f"{shard_id}{suffix}")
+    return CurriculumCatalog(str(tmp_path), memory_budget_bytes=None, lo_index=LearningObjectiveIndex())
+
+
+def test_concurrent_requests_load_a_shard_once_without_blocking_other_shards(catalog, monkeypatch):
+    release = threading.Event()
+    loading = threading.Event()
+    load = CurriculumCatalog._load
+
+    def slow_load(self, shard):
+        if shard.shard_id == "maths_a":
+            loading.set()
+            assert release.wait(5)
+        return load(self, shard)
+
+    monkeypatch.setattr(CurriculumCatalog, "_load", slow_load)
+    stores = []
+    threads = [threading.Thread(target=lambda: stores.append(catalog.get_store("maths_a"))) for _ in range(4)]
+    threads[0].start()
+    assert loading.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    catalog.get_store("maths_b")  # Not held up by the maths_a load
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(stores) == 4 and all(store is stores[0] for store in stores)
+    assert catalog.loads == 2
+    assert catalog.get_store("maths_a") is stores[0]
+
+
+def test_failed_load_is_retried_on_next_request(catalog, monkeypatch):
+    def failing_load(self, shard):
+        raise OSError("disk unavailable")
+
+    monkeypatch.setattr(CurriculumCatalog, "_load", failing_load)
+    with pytest.raises(OSError):
+        catalog.get_store("maths_a")
+    monkeypatch.undo()
+    assert catalog.get_store("maths_a") is catalog.get_store("maths_a")
+    assert catalog.loads == 1
+
+
+def test_concurrent_registration_gives_every_lo_its_own_index():
+    lo_index = LearningObjectiveIndex()
+    lo_ids = [f"LO_{i:05d}" for i in range(2000)]
+    start = threading.Barrier(8)
+
+    def register(offset):
+        start.wait()
+        for lo_id in lo_ids[offset:] + lo_ids[:offset]:
+            lo_index.index_of(lo_id)
+
+    threads = [threading.Thread(target=register, args=(offset,)) for offset in range(0, 2000, 250)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(lo_index) == len(lo_ids)
+    assert sorted(lo_index.index_of(lo_id) for lo_id in lo_ids) == list(range(len(lo_ids)))
+    assert all(lo_index.lo_id_at(lo_index.get(lo_id)) == lo_id for lo_id in lo_ids)
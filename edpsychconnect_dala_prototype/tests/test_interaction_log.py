@@ -0,0 +1,50 @@
+import events_module
+import hlp_module
+from hlp_module import LearnerProfile
+from interaction_log_module import InteractionLog, InteractionLogSink
+
+
+def test_task_names_containing_dots_replay_unchanged(tmp_path):
+    log_path = str(tmp_path / "interactions.jsonl")
+    with InteractionLog.open(log_path, snapshot_interval=0) as interaction_log:
+        previous_sink = events_module.set_event_sink(InteractionLogSink(interaction_log))
+        try:
+            profile = LearnerProfile("student_log_001")
+            profile.add_cognitive_metric("fractions.v2", "score", 7)
+            profile.add_cognitive_metric("fractions", "v2.score", 3)
+        finally:
+            events_module.set_event_sink(previous_sink)
+        rebuilt = interaction_log.rebuild_profile("student_log_001")
+        assert rebuilt.cognitive_metrics == {"fractions.v2": {"score": 7}, "fractions": {"v2.score": 3}}
+
+    with InteractionLog.open(log_path) as reopened:
+        assert reopened.rebuild_profile("student_log_001").cognitive_metrics == profile.cognitive_metrics
+
+
+class LongHistoryProfile(LearnerProfile):
+    metric_history_capacity = 64
+
+
+def test_rebuilt_profile_matches_live_profile_including_history(tmp_path):
+    log_path = str(tmp_path / "interactions.jsonl")
+    with InteractionLog.open(log_path, snapshot_interval=10) as interaction_log:
+        previous_sink = events_module.set_event_sink(InteractionLogSink(interaction_log))
+        previous_clock = hlp_module.set_metric_clock(lambda: 1000.0)
+        try:
+            profile = LongHistoryProfile("student_log_002")
+            profile.update_preference("visual_preference_task_1", "High")
+            for attempt in range(40):
+                profile.add_cognitive_metric("fractions", "score", attempt)
+            profile.add_cognitive_metric("fractions", "accuracy", 0.5, timestamp=12.5)
+            profile.add_cognitive_metric("fractions", "strategy", "guess")
+        finally:
+            hlp_module.set_metric_clock(previous_clock)
+            events_module.set_event_sink(previous_sink)
+        expected = profile.to_dict()
+        assert len(expected["cognitive_metric_history"]["fractions"]["score"]) == 40
+        assert interaction_log.rebuild_profile("student_log_002", LongHistoryProfile).to_dict() == expected
+
+    with InteractionLog.open(log_path) as reopened:
+        assert reopened.rebuild_profile("student_log_002", LongHistoryProfile).to_dict() == expected
+        trimmed = reopened.rebuild_profile("student_log_002").to_dict()
+        assert len(trimmed["cognitive_metric_history"]["fractions"]["score"]) == LearnerProfile.metric_history_capacity
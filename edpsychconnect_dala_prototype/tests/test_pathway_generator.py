@@ -0,0 +1,12 @@
+from curriculum_content_module import CURRICULUM_SLICE, LEARNING_CONTENT_SET, CurriculumContentStore
+from dcw_apg_module import PathwayGenerator
+from events_module import UnknownLearningObjectiveEvent
+from hlp_module import LearnerProfile
+
+
+def test_unknown_lo_is_reported_through_the_event_sink(recorded_events, capsys):
+    store = CurriculumContentStore(curriculum_data=CURRICULUM_SLICE, content_data=LEARNING_CONTENT_SET)
+    generator = PathwayGenerator(LearnerProfile("student_path_001"), store)
+    assert generator._is_lo_eligible("NO_SUCH_LO") is False
+    assert recorded_events == [UnknownLearningObjectiveEvent("student_path_001", "NO_SUCH_LO")]
+    assert capsys.readouterr().out == ""
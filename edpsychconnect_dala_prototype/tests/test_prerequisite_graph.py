@@ -0,0 +1,32 @@
+import pytest
+
+from curriculum_content_module import LearningObjectiveIndex, PrerequisiteGraph, PrerequisiteGraphError
+
+
+def _graph(strict=True):
+    return PrerequisiteGraph([
+        {"id": "LO_A", "prerequisites": ["EXTERNAL_LO"] if not strict else []},
+        {"id": "LO_B", "prerequisites": ["LO_A"]},
+        {"id": "LO_C", "prerequisites": ["LO_B"]},
+        {"id": "LO_D", "prerequisites": []},
+    ], LearningObjectiveIndex(), strict=strict)
+
+
+def test_plan_order_rejects_unknown_targets():
+    graph = _graph()
+    with pytest.raises(PrerequisiteGraphError) as excinfo:
+        graph.plan_order(target_lo_ids=["LO_C", "LO_Z"])
+    assert excinfo.value.problems == ["target LO 'LO_Z' is not in this curriculum"]
+
+
+def test_plan_order_plans_targets_and_their_outstanding_prerequisites():
+    graph = _graph()
+    completed_mask = 1 << graph.lo_index.index_of("LO_A")
+    assert graph.plan_order(target_lo_ids=["LO_C"]) == ["LO_A", "LO_B", "LO_C"]
+    assert graph.plan_order(completed_mask, target_lo_ids=["LO_C"]) == ["LO_B", "LO_C"]
+
+
+def test_plan_order_leaves_out_targets_waiting_on_external_prerequisites():
+    graph = _graph(strict=False)
+    assert graph.plan_order(target_lo_ids=["LO_C", "LO_D"]) == ["LO_D"]
+    assert graph.plan_order(1 << graph.lo_index.index_of("EXTERNAL_LO"), target_lo_ids=["LO_C"]) == ["LO_A", "LO_B", "LO_C"]
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+
+import pytest
+
+from hlp_module import LearnerProfile
+from profile_repository_module import ProfileRepository
+
+
+def _failing_write(connection, rows, patches=()):
+    raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_save_many_leaves_profiles_uncheckpointed_when_the_write_fails(monkeypatch):
+    with ProfileRepository(":memory:") as repository:
+        profile = LearnerProfile("student_repo_001")
+        profile.add_interest("Robotics")
+        monkeypatch.setattr(ProfileRepository, "_write_rows", staticmethod(_failing_write))
+        with pytest.raises(sqlite3.OperationalError):
+            repository.save_many([profile])
+        assert profile.dirty_fields is None  # Never checkpointed, so the next save is still a full save
+        monkeypatch.undo()
+        assert repository.save_many([profile]) == 1
+        assert profile.dirty_fields == frozenset()
+        assert repository.load("student_repo_001").interests == ["Robotics"]
+
+
+def test_save_changes_keeps_profiles_dirty_when_the_write_fails(monkeypatch):
+    with ProfileRepository(":memory:") as repository:
+        saved = LearnerProfile("student_repo_002")
+        repository.save(saved)
+        saved.add_interest("Space Exploration")
+        new = LearnerProfile("student_repo_003")
+
+        monkeypatch.setattr(ProfileRepository, "_write_rows", staticmethod(_failing_write))
+        with pytest.raises(sqlite3.OperationalError):
+            repository.save_changes([saved, new])
+        assert saved.dirty_fields == frozenset({"interests"})
+        assert new.dirty_fields is None
+
+        monkeypatch.undo()
+        assert repository.save_changes([saved, new]) == (1, 1)
+        assert saved.dirty_fields == frozenset() and new.dirty_fields == frozenset()
+        assert repository.load("student_repo_002").interests == ["Space Exploration"]
+        assert repository.save_changes([saved, new]) == (0, 0)
+
+
+def test_changes_made_while_a_batch_is_written_stay_pending(monkeypatch):
+    with ProfileRepository(":memory:") as repository:
+        profile = LearnerProfile("student_repo_004")
+        repository.save(profile)
+        profile.add_interest("Robotics")
+        write_rows = ProfileRepository._write_rows
+
+        def write_then_mutate(connection, rows, patches=()):
+            write_rows(connection, rows, patches)
+            profile.add_interest("Dinosaurs")  # e.g. another request handler, before save_changes returns
+
+        monkeypatch.setattr(ProfileRepository, "_write_rows", staticmethod(write_then_mutate))
+        assert repository.save_changes([profile]) == (1, 0)
+        assert profile.pending_patch()["interests"] == ["Dinosaurs"]
+        monkeypatch.undo()
+        repository.save_changes([profile])
+        assert repository.load("student_repo_004").interests == ["Robotics", "Dinosaurs"]
+
+
+def test_failed_patch_write_restores_the_patch_ahead_of_newer_changes(monkeypatch):
+    with ProfileRepository(":memory:") as repository:
+        profile = LearnerProfile("student_repo_005")
+        repository.save(profile)
+        profile.add_cognitive_metric("fractions", "score", 3, timestamp=1.0)
+
+        def mutate_then_fail(connection, rows, patches=()):
+            profile.add_cognitive_metric("fractions", "score", 4, timestamp=2.0)
+            _failing_write(connection, rows, patches)
+
+        monkeypatch.setattr(ProfileRepository, "_write_rows", staticmethod(mutate_then_fail))
+        with pytest.raises(sqlite3.OperationalError):
+            repository.save_changes([profile])
+        patch = profile.pending_patch()
+        assert patch["cognitive_metrics"] == {"fractions": {"score": 4}}
+        assert patch["cognitive_metric_history"] == {"fractions": {"score": [[1.0, 3], [2.0, 4]]}}
+        monkeypatch.undo()
+        repository.save_changes([profile])
+        assert repository.load("student_repo_005").to_dict() == profile.to_dict()
+
+
+def test_compact_keeps_patches_appended_while_it_folds(tmp_path, monkeypatch):
+    database_path = str(tmp_path / "profiles.db")
+    with ProfileRepository(database_path) as repository, ProfileRepository(database_path) as other_writer:
+        profile = LearnerProfile("student_repo_006")
+        repository.save(profile)
+        profile.add_interest("Robotics")
+        repository.save_changes([profile])
+
+        load_many = ProfileRepository._load_many
+        writer = threading.Thread(target=other_writer.save_changes, args=([profile],))
+
+        def load_then_write_concurrently(self, connection, student_ids):
+            profiles = load_many(self, connection, student_ids)
+            profile.add_interest("Dinosaurs")
+            writer.start()  # Blocks on the compaction's write lock until it commits
+            return profiles
+
+        monkeypatch.setattr(ProfileRepository, "_load_many", load_then_write_concurrently)
+        assert repository.compact() == 1
+        writer.join()
+        monkeypatch.undo()
+        assert repository.pending_patch_count() == 1
+        assert repository.load("student_repo_006").interests == ["Robotics", "Dinosaurs"]
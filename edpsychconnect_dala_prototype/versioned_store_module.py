@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EdPsych Connect - Dynamic AI Learning Architect (DALA)
+Versioned Store Module
+
+This module contains the logic for:
+1.  Holding the current curriculum/content snapshot (a frozen CurriculumContentStore) and publishing
+    new versions atomically: reloads and content edits build a new snapshot and swap it in.
+2.  Hot reload from curriculum/content JSON files when they change on disk.
+3.  Announcing each published version as a CatalogVersionChangedEvent, so caches keyed on the
+    version can drop stale entries.
+
+Readers call snapshot() once per operation and read only that store, so an operation that started
+before a reload finishes on the version it started with. Reading takes no lock: publishing is a
+single reference assignment. Writers (reload, update_content, publish) are serialized among
+themselves. Each snapshot's version ID is a digest of its content unless one is given, so the
+same data gets the same version in every process.
+"""
+
+import os
+import threading
+
+import events_module
+from events_module import CatalogVersionChangedEvent
+from curriculum_content_module import CurriculumContentStore
+
+class VersionedContentStore:
+    """The current CurriculumContentStore snapshot, replaced atomically by reloads and edits.
+
+    Pass it anywhere a store is accepted by PathwayGenerator (which pins one snapshot per call), or
+    call snapshot() and use the returned store directly. With prebuild_indexes, a new snapshot's
+    content index is built before it is published, so the first readers of a version do not pay
+    for it.
+    """
+    def __init__(self, initial_store, prebuild_indexes=True):
+        self.prebuild_indexes = prebuild_indexes
+        self._write_lock = threading.Lock()
+        self._source_paths = None
+        self._source_mtimes = None
+        self.publish_count = 0
+        self._current = self._prepare(initial_store)
+
+    @classmethod
+    def from_files(cls, curriculum_path, content_path, **store_kwargs):
+        """A versioned store loaded from (and reloadable from) a curriculum/content JSON pair.
+
+        Files are loaded with CurriculumContentStore.from_json_files(), so a reload of invalid files
+        raises ContentValidationError and leaves the current snapshot in place.
+        """
+        versioned_store = cls(CurriculumContentStore.from_json_files(curriculum_path, content_path, **store_kwargs))
+        versioned_store._source_paths = (curriculum_path, content_path)
+        versioned_store._source_mtimes = _mtimes(curriculum_path, content_path)
+        return versioned_store
+
+    # --- Reading ---
+    def snapshot(self):
+        """The current snapshot; read everything for one operation from it."""
+        return self._current
+
+    @property
+    def current(self):
+        return self._current
+
+    @property
+    def version(self):
+        return self._current.version
+
+    # --- Publishing ---
+    def _prepare(self, store):
+        store.freeze()
+        store.version  # Computed before publishing so readers never race to compute it
+        if self.prebuild_indexes:
+            store.content_index
+        return store
+
+    def publish(self, store):
+        """Makes store the current snapshot. Returns the version it replaced."""
+        with self._write_lock:
+            return self._swap(store)
+
+    def _swap(self, store):
+        store = self._prepare(store)
+        old_version = self._current.version
+        self._current = store
+        self.publish_count += 1
+        sink = events_module.event_sink
+        if sink.enabled:
+            sink.emit(CatalogVersionChangedEvent(old_version, store.version))
+        return old_version
+
+    def reload(self, curriculum_data, content_data, **store_kwargs):
+        """Builds a snapshot from new curriculum/content data and publishes it. Returns the new version.
+
+        The new store shares the current snapshot's LearningObjectiveIndex, so LO bitsets in learner
+        profiles stay valid across versions.
+        """
+        store_kwargs.setdefault("lo_index", self._current.lo_index)
+        store = CurriculumContentStore(curriculum_data, content_data, **store_kwargs)
+        with self._write_lock:
+            self._swap(store)
+        return store.version
+
+    def update_content(self, added=(), removed_content_ids=()):
+        """Publishes a copy of the current snapshot with content added/replaced and removed.
+
+        Returns the new version.
+        """
+        with self._write_lock:
+            store = self._current.with_content_changes(added, removed_content_ids)
+            self._swap(store)
+        return store.version
+
+    # --- Hot Reload ---
+    def reload_if_changed(self):
+        """Reloads from the source files if either changed since the last load. Returns True if it reloaded.
+
+        Only for stores created with from_files(); call it from a timer or a file watcher.
+        """
+        if self._source_paths is None:
+            raise ValueError("reload_if_changed() needs a store created with VersionedContentStore.from_files()")
+        mtimes = _mtimes(*self._source_paths)
+        if mtimes == self._source_mtimes:
+            return False
+        store = CurriculumContentStore.from_json_files(*self._source_paths, lo_index=self._current.lo_index)
+        with self._write_lock:
+            self._swap(store)
+            self._source_mtimes = mtimes
+        return True
+
+def _mtimes(*paths):
+    return tuple(os.stat(path).st_mtime_ns for path in paths)
+
+
+if __name__ == "__main__":
+    from curriculum_content_module import CURRICULUM_SLICE, LEARNING_CONTENT_SET
+    from dcw_apg_module import PathwayGenerator
+    from hlp_module import LearnerProfile
+
+    events_module.enable_console_events()
+    print("--- DALA Versioned Store Demo ---")
+    versioned_store = VersionedContentStore(CurriculumContentStore(CURRICULUM_SLICE, LEARNING_CONTENT_SET))
+    print(f"Initial version: {versioned_store.version}")
+    pinned = versioned_store.snapshot()
+    versioned_store.update_content(added=[{
+        "content_id": "CONT_MD_008", "title": "Game: Factor Pair Snap", "type": "game",
+        "learning_objectives_covered": ["Y4MD_LO3"], "target_preferences": ["kinesthetic"],
+        "difficulty": "easy", "url_path": "/content/games/factor_pair_snap_y4.html",
+    }])
+    print(f"Pinned snapshot still has {len(pinned.content_library)} items; current has {len(versioned_store.snapshot().content_library)}")
+    profile = LearnerProfile("student_versioned_001")
+    profile.mark_lo_completed("Y4MD_LO1")
+    generator = PathwayGenerator(profile, versioned_store)
+    generator.display_pathway(generator.generate_initial_pathway(target_lo_count=2), profile.student_id)
+    same_data_version = versioned_store.reload(CURRICULUM_SLICE, LEARNING_CONTENT_SET)
+    print(f"Reloading the original data gives the original version again: {same_data_version == pinned.version}")